@@ -0,0 +1,58 @@
+"""project search indexes
+
+Revision ID: b7e2d41c9a05
+Revises: 94adbffb3898
+Create Date: 2024-11-10 10:12:48.417356
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = 'b7e2d41c9a05'
+down_revision: Union[str, None] = '94adbffb3898'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+    # Keep the oldest row of any repo_path saved twice before the unique index existed.
+    op.execute(
+        'DELETE FROM project AS duplicate USING project AS original '
+        'WHERE duplicate.repo_path = original.repo_path AND duplicate.id > original.id'
+    )
+    op.create_index('ix_project_repo_path', 'project', ['repo_path'], unique=True)
+    op.create_index(
+        'ix_project_repo_path_trgm',
+        'project',
+        ['repo_path'],
+        postgresql_using='gin',
+        postgresql_ops={'repo_path': 'gin_trgm_ops'},
+    )
+    op.add_column('project', sa.Column(
+        'search_vector',
+        postgresql.TSVECTOR(),
+        sa.Computed(
+            "setweight(to_tsvector('english', coalesce(description, '')), 'A') || "
+            "setweight(to_tsvector('simple', coalesce(language, '')), 'B')",
+            persisted=True,
+        ),
+        nullable=True,
+    ))
+    op.create_index(
+        'ix_project_search_vector',
+        'project',
+        ['search_vector'],
+        postgresql_using='gin',
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_project_search_vector', table_name='project')
+    op.drop_column('project', 'search_vector')
+    op.drop_index('ix_project_repo_path_trgm', table_name='project')
+    op.drop_index('ix_project_repo_path', table_name='project')
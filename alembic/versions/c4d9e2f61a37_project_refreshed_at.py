@@ -0,0 +1,27 @@
+"""project refreshed_at
+
+Revision ID: c4d9e2f61a37
+Revises: b7e2d41c9a05
+Create Date: 2024-11-12 09:41:05.228914
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = 'c4d9e2f61a37'
+down_revision: Union[str, None] = 'b7e2d41c9a05'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('project', sa.Column('refreshed_at', sa.DateTime(timezone=True), nullable=True))
+    op.create_index('ix_project_refreshed_at', 'project', ['refreshed_at'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_project_refreshed_at', table_name='project')
+    op.drop_column('project', 'refreshed_at')
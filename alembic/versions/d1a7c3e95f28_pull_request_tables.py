@@ -0,0 +1,53 @@
+"""pull request tables
+
+Revision ID: d1a7c3e95f28
+Revises: c4d9e2f61a37
+Create Date: 2024-11-14 16:22:31.870412
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+# revision identifiers, used by Alembic.
+revision: str = 'd1a7c3e95f28'
+down_revision: Union[str, None] = 'c4d9e2f61a37'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('pull_request',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('timestamp', sa.DateTime(timezone=True), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=True),
+    sa.Column('repo_path', sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+    sa.Column('number', sa.Integer(), nullable=False),
+    sa.Column('title', sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+    sa.Column('state', sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+    sa.Column('author', sqlmodel.sql.sqltypes.AutoString(), nullable=True),
+    sa.Column('html_url', sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), nullable=False),
+    sa.Column('updated_at', sa.DateTime(timezone=True), nullable=False),
+    sa.Column('closed_at', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('merged_at', sa.DateTime(timezone=True), nullable=True),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('repo_path', 'number', name='uq_pull_request_repo_path_number')
+    )
+    op.create_table('pull_request_checkpoint',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('timestamp', sa.DateTime(timezone=True), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=True),
+    sa.Column('repo_path', sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('run_updated_at', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('run_offset', sa.Integer(), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_pull_request_checkpoint_repo_path', 'pull_request_checkpoint', ['repo_path'], unique=True)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_pull_request_checkpoint_repo_path', table_name='pull_request_checkpoint')
+    op.drop_table('pull_request_checkpoint')
+    op.drop_table('pull_request')
@@ -0,0 +1,57 @@
+"""project search_vector repo_path
+
+Revision ID: e5f83b1d7a94
+Revises: d1a7c3e95f28
+Create Date: 2024-11-16 14:02:37.581246
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = 'e5f83b1d7a94'
+down_revision: Union[str, None] = 'd1a7c3e95f28'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# The parser reads owner/repo as one file path token, so the slash is split
+# off first. The query is parsed with the english config, so repo_path is
+# stemmed with it too.
+SEARCH_VECTOR_WITH_REPO_PATH: str = (
+    "setweight(to_tsvector('english', translate(repo_path, '/', ' ')), 'A') || "
+    "setweight(to_tsvector('english', coalesce(description, '')), 'A') || "
+    "setweight(to_tsvector('simple', coalesce(language, '')), 'B')"
+)
+SEARCH_VECTOR: str = (
+    "setweight(to_tsvector('english', coalesce(description, '')), 'A') || "
+    "setweight(to_tsvector('simple', coalesce(language, '')), 'B')"
+)
+
+
+def _replace_search_vector(expression: str) -> None:
+    # Postgres cannot change the expression of a generated column in place.
+    op.drop_index('ix_project_search_vector', table_name='project')
+    op.drop_column('project', 'search_vector')
+    op.add_column('project', sa.Column(
+        'search_vector',
+        postgresql.TSVECTOR(),
+        sa.Computed(expression, persisted=True),
+        nullable=True,
+    ))
+    op.create_index(
+        'ix_project_search_vector',
+        'project',
+        ['search_vector'],
+        postgresql_using='gin',
+    )
+
+
+def upgrade() -> None:
+    _replace_search_vector(SEARCH_VECTOR_WITH_REPO_PATH)
+
+
+def downgrade() -> None:
+    _replace_search_vector(SEARCH_VECTOR)
@@ -1,12 +1,23 @@
 # trunk-ignore-all(ruff/ANN101,ruff/PLW0603,trunk/ignore-does-nothing)
 from __future__ import annotations
 
+import asyncio
+import contextlib
+import queue
+import threading
+from dataclasses import dataclass, field
 from enum import Enum, auto
-from typing import TYPE_CHECKING, Generator
+from typing import TYPE_CHECKING, AsyncIterator, Generator, Iterable
 
 import reflex as rx
 
-from hackathon import helper_chroma, helper_github, helper_perplexity
+from hackathon import (
+    helper_chroma,
+    helper_db,
+    helper_github,
+    helper_perplexity,
+    helper_search,
+)
 from hackathon.models.project import Project  # trunk-ignore(ruff/TCH001)
 from hackathon.otel import tracer
 from hackathon.tokens import TOKENS
@@ -14,10 +25,9 @@ from hackathon.tokens import TOKENS
 if TYPE_CHECKING:
     import chromadb.api.client
     import github
-    from sqlalchemy.orm import Session
 
 chroma_client: chromadb.api.ClientAPI | None = None
-github_client: github.Github | None = None
+github_client: github.Github | helper_github.GithubTokenPool | None = None
 perplexity_client: helper_perplexity.Client | None = None
 
 class ClientType(Enum):
@@ -26,12 +36,292 @@ class ClientType(Enum):
     PERPLEXITY = auto()
 
 
-class AppState(rx.State):
-    # trunk-ignore-begin(ruff/RUF012)
-    projects: list[Project] = []
-    projects_to_commit: list[Project] = []
-    # trunk-ignore-end(ruff/RUF012)
+@dataclass
+class ProjectRegistry:
+    """The projects loaded into the app, shared across all grid states.
+
+    Projects keep their insertion order so that display indices stay valid,
+    and a repo_path index is kept in sync with the list so that lookups are
+    constant time. A deleted project leaves a None tombstone in its slot, so
+    the indices other clients hold keep pointing at the same projects. The
+    watermark is the highest database id seen so far, so page loads only
+    need to fetch the rows inserted since. A BM25 index over repo_path,
+    language and description is kept in sync with the projects for keyword
+    search.
+    """
+
+    _projects: list[Project | None] = field(
+        default_factory=list,
+    )
+    _indices: dict[str, int] = field(
+        default_factory=dict,
+    )
+    _watermark: int | None = None
+    _search_index: helper_search.Bm25Index = field(
+        default_factory=helper_search.Bm25Index,
+        repr=False,
+    )
+    _lock: threading.RLock = field(
+        default_factory=threading.RLock,
+        repr=False,
+    )
+
+    def __len__(
+        self: ProjectRegistry,
+    ) -> int:
+        return len(self._indices)
+
+    def __getitem__(
+        self: ProjectRegistry,
+        index: int,
+    ) -> Project | None:
+        """The project at the index, None once it was deleted."""
+        return self._projects[index]
+
+    def __contains__(
+        self: ProjectRegistry,
+        repo_path: object,
+    ) -> bool:
+        return repo_path in self._indices
+
+    @property
+    def projects(
+        self: ProjectRegistry,
+    ) -> list[Project]:
+        return [project for project in self._projects if project is not None]
+
+    @property
+    def indices(
+        self: ProjectRegistry,
+    ) -> list[int]:
+        """The indices of the projects that were not deleted, in insertion order."""
+        return sorted(self._indices.values())
+
+    @property
+    def watermark(
+        self: ProjectRegistry,
+    ) -> int | None:
+        return self._watermark
+
+    def find_index(
+        self: ProjectRegistry,
+        repo_path: str | None,
+    ) -> int | None:
+        if repo_path is None:
+            return None
+
+        return self._indices.get(repo_path)
+
+    def find(
+        self: ProjectRegistry,
+        repo_path: str | None,
+    ) -> Project | None:
+        index: int | None = self.find_index(
+            repo_path=repo_path,
+        )
+        if index is None:
+            return None
+
+        return self._projects[index]
+
+    def load(
+        self: ProjectRegistry,
+        projects: Iterable[Project],
+    ) -> None:
+        with self._lock:
+            self._projects = []
+            self._indices = {}
+            self._watermark = None
+            self._search_index.clear()
+            self.extend(projects)
+
+    def extend(
+        self: ProjectRegistry,
+        projects: Iterable[Project],
+    ) -> list[int]:
+        with self._lock:
+            return [self.append(project) for project in projects]
+
+    def append(
+        self: ProjectRegistry,
+        project: Project,
+    ) -> int:
+        """Adds the project if its repo_path is not registered yet.
+
+        A project that is already registered but was never loaded from the
+        database is replaced by the saved row, so that it picks up its id.
+
+        Returns:
+            int: The index of the project with the same repo_path.
+        """
+        with self._lock:
+            if project.id is not None and (
+                self._watermark is None or project.id > self._watermark
+            ):
+                self._watermark = project.id
+
+            repo_path: str = str(project.repo_path)
+            if (index := self._indices.get(repo_path)) is not None:
+                registered: Project | None = self._projects[index]
+                if (
+                    registered is not None
+                    and registered.id is None
+                    and project.id is not None
+                ):
+                    self._projects[index] = project
+                    self.reindex(project)
+
+                return index
+
+            index = len(self._projects)
+            self._projects.append(project)
+            self._indices[repo_path] = index
+            self.reindex(project)
+            return index
+
+    def reindex(
+        self: ProjectRegistry,
+        project: Project,
+    ) -> None:
+        """Refreshes the search index entry, e.g. after the description changed."""
+        with self._lock:
+            self._search_index.add(
+                document_id=str(project.repo_path),
+                text=" ".join(
+                    [
+                        str(project.repo_path),
+                        project.language,
+                        project.description,
+                    ],
+                ),
+            )
+
+    def search(
+        self: ProjectRegistry,
+        query: str,
+        limit: int,
+    ) -> list[str]:
+        """Returns the repo paths that best match the keywords, best first."""
+        with self._lock:
+            return [
+                repo_path
+                for repo_path, _ in self._search_index.search(
+                    query=query,
+                    limit=limit,
+                )
+            ]
+
+    def delete(
+        self: ProjectRegistry,
+        repo_path: str,
+    ) -> Project | None:
+        """Removes the project and leaves a tombstone in its slot.
+
+        The indices of the other projects do not move, so the display indices
+        held by every client stay valid.
+        """
+        with self._lock:
+            index: int | None = self._indices.pop(repo_path, None)
+            if index is None:
+                return None
+
+            project: Project | None = self._projects[index]
+            self._projects[index] = None
+            self._search_index.remove(repo_path)
+            return project
+
+
+project_registry: ProjectRegistry = ProjectRegistry()
+
+
+def _save_projects(
+    projects: list[Project],
+) -> list[Project]:
+    with rx.session() as session:
+        return helper_db.save_projects(
+            session=session,
+            projects=projects,
+        )
+
+
+project_write_queue: helper_db.WriteBehindQueue[Project] = helper_db.WriteBehindQueue(
+    flush=_save_projects,
+    name="projects",
+)
+
+
+def submit_project(
+    project: Project,
+    span_name: str,
+) -> rx.Component | None:
+    """Queues the project for the next write batch without blocking.
+
+    The callers are background events on the event loop, so a full queue is
+    reported with the returned toast instead of waiting for room.
+    """
+    with tracer.start_as_current_span(span_name) as span:
+        try:
+            project_write_queue.submit(
+                item=project,
+                block=False,
+            )
+
+        except queue.Full:
+            span_event_name: str = "project_write_queue-full"
+            span.add_event(
+                name=span_event_name,
+                attributes={
+                    "project_repo_path": str(project.repo_path),
+                },
+            )
+            return rx.toast.error(
+                message=span_event_name,
+            )
+
+        span.add_event(
+            name="project_write_queue-submitted",
+            attributes={
+                "project_repo_path": str(project.repo_path),
+            },
+        )
+        return None
+
+
+@contextlib.asynccontextmanager
+async def clients_lifespan() -> AsyncIterator[None]:
+    """Opens the pooled API clients and the project write queue on startup.
+
+    On shutdown the clients are closed, the write queue is drained, so no
+    submitted project is lost, and the async database pool and the GitHub
+    thread pool are shut down. It is entered by refresh_lifespan, so the
+    refresh loop stops before anything here is closed.
+    """
+    global perplexity_client
+    with tracer.start_as_current_span("app_state-clients_lifespan") as span:
+        client: helper_perplexity.Client | None = AppState.get_client(
+            client_type=ClientType.PERPLEXITY,
+        )
+        if client is not None:
+            client.get_http_client()
 
+        project_write_queue.start()
+        span.add_event(
+            name="clients-started",
+        )
+
+    try:
+        yield
+
+    finally:
+        await asyncio.to_thread(project_write_queue.close)
+        await helper_db.dispose_async_engine()
+        helper_github.github_executor.shutdown()
+        if perplexity_client is not None:
+            await perplexity_client.aclose()
+            perplexity_client = None
+
+
+class AppState(rx.State):
     @staticmethod
     def get_client( # trunk-ignore(ruff/ANN205)
         client_type: ClientType,
@@ -51,7 +341,9 @@ class AppState(rx.State):
                 if github_client := github_client:
                     return github_client
 
-                github_client = helper_github.set_up_client_from_tokens(
+                github_client = helper_github.set_up_pool_from_tokens(
+                    tokens=TOKENS,
+                ) or helper_github.set_up_client_from_tokens(
                     tokens=TOKENS,
                 )
                 return github_client
@@ -69,117 +361,12 @@ class AppState(rx.State):
         raise ValueError(error_msg)
 
 
-    def _save_projects_to_db(
-        self,
-        projects: list[Project],
-    ) -> Generator[None, None, None]:
-        def filter_projects_to_save(
-            db: Session,
-            projects: list[Project],
-        ) -> list[Project]:
-            span_name: str = f"{self.default_span_name}-event_get_new_projects"
-            with tracer.start_as_current_span(span_name) as span:
-                span.add_event(
-                    name="get_new_projects-started",
-                    attributes={
-                        "project_count-to_commit": len(projects),
-                    },
-                )
-                existing_repo_paths: set[str] = {
-                    str(path[0])
-                    for path in db.query(  # trunk-ignore(pyright/reportCallIssue)
-                        Project.repo_path,  # trunk-ignore(pyright/reportArgumentType)
-                    ).all()
-                }
-                span.add_event(
-                    name="get_new_projects-existing_repo_paths",
-                    attributes={
-                        "existing_repo_paths": str(existing_repo_paths),
-                        "existing_repo_path_count": len(existing_repo_paths),
-                        "existing_repo_path_type": str(type(existing_repo_paths)),
-                    },
-                )
-                new_projects: list[Project] = [
-                    project
-                    for project in projects
-                    if str(project.repo_path) not in existing_repo_paths
-                ]
-                span.add_event(
-                    name="get_new_projects-completed",
-                    attributes={
-                        "project_count-to_save": len(new_projects),
-                    },
-                )
-                return new_projects
-
-        span_name: str = f"{self.default_span_name}-event_save_projects_to_db"
-        with tracer.start_as_current_span(span_name) as span, rx.session() as session:
-            if not projects:
-                span.add_event(
-                    name="db-projects-no_projects_to_save",
-                )
-                yield
-
-                return
-
-            projects_to_save: list[Project] = filter_projects_to_save(
-                db=session,
-                projects=projects,
-            )
-            span.add_event(
-                name="db-projects-projects_to_save",
-                attributes={
-                    "project_count": len(projects_to_save),
-                },
-            )
-            if len(projects_to_save) == 0:
-                span.add_event(
-                    name="db-projects-no_new_projects_to_save",
-                )
-                if projects:
-                    first_repo, *_ = projects
-                    span.add_event(
-                        name="db-projects-repo_already_saved",
-                        attributes={
-                            "repo_path": str(first_repo.repo_path),
-                        },
-                    )
-
-                yield
-
-                return
-
-            session.bulk_save_objects(projects_to_save)
-            session.commit()
-            span.add_event(
-                name="db-projects-added_to_db",
-                attributes={
-                    "project_count": len(projects_to_save),
-                },
-            )
-            yield
-
     def save_project(
         self,
         project: Project,
-    ) -> Generator[None, None, None]:
-        span_name: str = f"{self.default_span_name}-event_save_project"
-        with tracer.start_as_current_span(span_name) as span:
-            AppState.projects_to_commit.append(project)
-            span.add_event(
-                name="projects_to_commit-added_project",
-                attributes={
-                    "project_repo_path": str(project.repo_path),
-                },
-            )
-            yield from self._save_projects_to_db(
-                projects=AppState.projects_to_commit,
-            )
-
-            span.add_event(
-                name="projects_to_commit-saved_to_db",
-            )
-            AppState.projects_to_commit.clear()
-            span.add_event(
-                name="projects_to_commit-cleared",
-            )
+    ) -> Generator[rx.Component | None, None, None]:
+        """Queues the project for the next write batch, see submit_project."""
+        yield submit_project(
+            project=project,
+            span_name=f"{self.default_span_name}-event_save_project",
+        )
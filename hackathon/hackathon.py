@@ -2,7 +2,10 @@
 import reflex as rx
 
 from .app_style import Style as AppStyle
+from .pages.repo_tracker.api import get_project_rows
+from .pages.repo_tracker.constants import PROJECT_ROWS_ROUTE
 from .pages.repo_tracker.page import index
+from .pages.repo_tracker.refresh import refresh_lifespan
 from .pages.repo_tracker.state_repo import RepoState
 
 APP_STYLE: AppStyle = AppStyle()
@@ -15,8 +18,16 @@ app = rx.App(
         accent_color="teal",
     ),
 )
+app.register_lifespan_task(
+    refresh_lifespan,
+)
 app.add_page(
     component=index,
     route="/",
     on_load=RepoState.event_on_page_load, # trunk-ignore(pyright/reportArgumentType)
 )
+app.api.add_api_route(
+    path=PROJECT_ROWS_ROUTE,
+    endpoint=get_project_rows,
+    methods=["GET"],
+)
@@ -0,0 +1,3 @@
+__all__ = ["CacheStats", "SqliteCache"]
+
+from .helper_cache import CacheStats, SqliteCache
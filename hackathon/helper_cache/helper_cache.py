@@ -0,0 +1,202 @@
+from __future__ import annotations
+
+import dataclasses
+import sqlite3
+import threading
+import time
+from pathlib import Path  # trunk-ignore(ruff/TCH003)
+from typing import NamedTuple
+
+from hackathon.otel import meter, tracer
+
+SPAN_KEY: str = "cache"
+EVICTION_INTERVAL: int = 100
+
+cache_hit_counter = meter.create_counter(
+    name="cache.hits",
+    description="Number of cache lookups that returned a fresh entry",
+)
+cache_miss_counter = meter.create_counter(
+    name="cache.misses",
+    description="Number of cache lookups that found no fresh entry",
+)
+
+
+class CacheStats(NamedTuple):
+
+    hits: int
+    misses: int
+
+
+@dataclasses.dataclass
+class SqliteCache:
+    """A persistent key value cache backed by one SQLite table.
+
+    Entries older than ttl_seconds are treated as misses. Every hit refreshes
+    the access time, and the least recently accessed entries beyond
+    max_entries are evicted every EVICTION_INTERVAL writes. Several caches can
+    share one file by using different namespaces.
+    """
+
+    path: Path
+    namespace: str
+    ttl_seconds: float | None
+    max_entries: int
+    _connection: sqlite3.Connection | None = dataclasses.field(
+        default=None,
+        init=False,
+        repr=False,
+    )
+    _lock: threading.Lock = dataclasses.field(
+        default_factory=threading.Lock,
+        init=False,
+        repr=False,
+    )
+    _hits: int = dataclasses.field(
+        default=0,
+        init=False,
+    )
+    _misses: int = dataclasses.field(
+        default=0,
+        init=False,
+    )
+    _writes: int = dataclasses.field(
+        default=0,
+        init=False,
+    )
+
+    @property
+    def stats(
+        self: SqliteCache,
+    ) -> CacheStats:
+        return CacheStats(
+            hits=self._hits,
+            misses=self._misses,
+        )
+
+    def _get_connection(
+        self: SqliteCache,
+    ) -> sqlite3.Connection:
+        if self._connection is not None:
+            return self._connection
+
+        self.path.parent.mkdir(
+            parents=True,
+            exist_ok=True,
+        )
+        connection: sqlite3.Connection = sqlite3.connect(
+            self.path,
+            check_same_thread=False,
+            isolation_level=None,
+        )
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.execute("PRAGMA synchronous=NORMAL")
+        connection.execute(
+            "CREATE TABLE IF NOT EXISTS cache ("
+            "namespace TEXT NOT NULL, "
+            "key TEXT NOT NULL, "
+            "value TEXT NOT NULL, "
+            "created_at REAL NOT NULL, "
+            "accessed_at REAL NOT NULL, "
+            "PRIMARY KEY (namespace, key))",
+        )
+        connection.execute(
+            "CREATE INDEX IF NOT EXISTS cache_namespace_accessed_at "
+            "ON cache (namespace, accessed_at)",
+        )
+        self._connection = connection
+        return connection
+
+    def _record(
+        self: SqliteCache,
+        hit: bool,  # trunk-ignore(ruff/FBT001)
+    ) -> None:
+        attributes: dict[str, str] = {
+            "namespace": self.namespace,
+        }
+        if hit:
+            self._hits += 1
+            cache_hit_counter.add(1, attributes)
+            return
+
+        self._misses += 1
+        cache_miss_counter.add(1, attributes)
+
+    def get(
+        self: SqliteCache,
+        key: str,
+    ) -> str | None:
+        with self._lock:
+            connection: sqlite3.Connection = self._get_connection()
+            now: float = time.time()
+            row: tuple[str, float] | None = connection.execute(
+                "SELECT value, created_at FROM cache WHERE namespace = ? AND key = ?",
+                (self.namespace, key),
+            ).fetchone()
+            if row is None:
+                self._record(hit=False)
+                return None
+
+            value, created_at = row
+            if self.ttl_seconds is not None and now - created_at > self.ttl_seconds:
+                connection.execute(
+                    "DELETE FROM cache WHERE namespace = ? AND key = ?",
+                    (self.namespace, key),
+                )
+                self._record(hit=False)
+                return None
+
+            connection.execute(
+                "UPDATE cache SET accessed_at = ? WHERE namespace = ? AND key = ?",
+                (now, self.namespace, key),
+            )
+            self._record(hit=True)
+            return value
+
+    def set(
+        self: SqliteCache,
+        key: str,
+        value: str,
+    ) -> None:
+        with self._lock:
+            connection: sqlite3.Connection = self._get_connection()
+            now: float = time.time()
+            connection.execute(
+                "INSERT OR REPLACE INTO cache "
+                "(namespace, key, value, created_at, accessed_at) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (self.namespace, key, value, now, now),
+            )
+            self._writes += 1
+            if self._writes % EVICTION_INTERVAL == 0:
+                self._evict(connection)
+
+    def _evict(
+        self: SqliteCache,
+        connection: sqlite3.Connection,
+    ) -> None:
+        span_name: str = f"{SPAN_KEY}-evict"
+        with tracer.start_as_current_span(span_name) as span:
+            cursor: sqlite3.Cursor = connection.execute(
+                "DELETE FROM cache WHERE namespace = ? AND key IN ("
+                "SELECT key FROM cache WHERE namespace = ? "
+                "ORDER BY accessed_at DESC LIMIT -1 OFFSET ?)",
+                (self.namespace, self.namespace, self.max_entries),
+            )
+            span.add_event(
+                name="evict-completed",
+                attributes={
+                    "namespace": self.namespace,
+                    "evicted_count": cursor.rowcount,
+                },
+            )
+
+    def close(
+        self: SqliteCache,
+    ) -> None:
+        with self._lock:
+            if self._connection is None:
+                return
+
+            self._connection.close()
+            self._connection = None
@@ -1,4 +1,31 @@
-__all__ = ["add_item", "get_items", "set_up_client_from_tokens"]
-
-from .helper_chroma import add_item, get_items, set_up_client_from_tokens
+__all__ = [
+    "DEFAULT_BATCH_SIZE",
+    "Embedder",
+    "IvfIndex",
+    "LocalCollection",
+    "LocalVectorStore",
+    "add_item",
+    "add_items",
+    "get_items",
+    "invalidate_collection",
+    "invalidate_query_results",
+    "set_up_client_from_tokens",
+    "set_up_local_client_from_tokens",
+]
 
+from .helper_chroma import (
+    DEFAULT_BATCH_SIZE,
+    add_item,
+    add_items,
+    get_items,
+    invalidate_collection,
+    invalidate_query_results,
+    set_up_client_from_tokens,
+    set_up_local_client_from_tokens,
+)
+from .helper_embeddings import Embedder
+from .ivf_index import IvfIndex
+from .local_vector_store import (
+    LocalCollection,
+    LocalVectorStore,
+)
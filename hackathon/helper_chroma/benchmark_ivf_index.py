@@ -0,0 +1,111 @@
+from __future__ import annotations
+
+import dataclasses
+import time
+
+import numpy as np
+
+from hackathon.helper_chroma.ivf_index import IvfIndex, squared_l2_distances
+
+
+@dataclasses.dataclass
+class RecallBenchmark:
+    nprobe: int
+    recall: float
+    brute_force_ms: float
+    ann_ms: float
+
+    def __str__(
+        self: RecallBenchmark,
+    ) -> str:
+        return (
+            f"nprobe={self.nprobe}: recall={self.recall:.3f}, "
+            f"brute force {self.brute_force_ms:.3f} ms/query, "
+            f"ann {self.ann_ms:.3f} ms/query"
+        )
+
+
+def _top_k(
+    distances: np.ndarray,
+    k: int,
+) -> np.ndarray:
+    if k >= len(distances):
+        return np.argsort(distances)
+
+    top_rows: np.ndarray = np.argpartition(distances, k - 1)[:k]
+    return top_rows[np.argsort(distances[top_rows])]
+
+
+def benchmark_recall(
+    embeddings: np.ndarray,
+    query_vectors: np.ndarray,
+    k: int,
+    nprobes: list[int],
+) -> list[RecallBenchmark]:
+    """Reports recall@k of the index against brute force for each nprobe.
+
+    Both searches run one query at a time, the way LocalCollection.query does.
+    Run with python -m hackathon.helper_chroma.benchmark_ivf_index.
+    """
+    index: IvfIndex = IvfIndex()
+    index.train(embeddings)
+    start: float = time.perf_counter()
+    expected: list[set[int]] = [
+        set(
+            _top_k(
+                distances=squared_l2_distances(
+                    query_vectors=query_vector[None, :],
+                    embeddings=embeddings,
+                )[0],
+                k=k,
+            ).tolist(),
+        )
+        for query_vector in query_vectors
+    ]
+    brute_force_ms: float = (time.perf_counter() - start) * 1000 / len(query_vectors)
+    benchmarks: list[RecallBenchmark] = []
+    for nprobe in nprobes:
+        found_count: int = 0
+        start = time.perf_counter()
+        for query_vector, expected_rows in zip(query_vectors, expected):
+            rows: np.ndarray = index.candidates(
+                query_vector=query_vector,
+                nprobe=nprobe,
+            )
+            distances: np.ndarray = squared_l2_distances(
+                query_vectors=query_vector[None, :],
+                embeddings=embeddings[rows],
+            )[0]
+            found_count += len(
+                expected_rows & set(rows[_top_k(distances, k)].tolist()),
+            )
+
+        benchmarks.append(
+            RecallBenchmark(
+                nprobe=nprobe,
+                recall=found_count / (k * len(query_vectors)),
+                brute_force_ms=brute_force_ms,
+                ann_ms=(time.perf_counter() - start) * 1000 / len(query_vectors),
+            ),
+        )
+
+    return benchmarks
+
+
+if __name__ == "__main__":
+    rng: np.random.Generator = np.random.default_rng(0)
+    centers: np.ndarray = rng.normal(size=(256, 384)).astype(np.float32)
+    embeddings: np.ndarray = (
+        centers[rng.integers(0, len(centers), size=100_000)]
+        + rng.normal(scale=0.5, size=(100_000, 384))
+    ).astype(np.float32)
+    query_vectors: np.ndarray = embeddings[rng.choice(len(embeddings), size=100)] + (
+        rng.normal(scale=0.1, size=(100, 384)).astype(np.float32)
+    )
+    for benchmark in benchmark_recall(
+        embeddings=embeddings,
+        query_vectors=query_vectors,
+        k=10,
+        nprobes=[1, 2, 4, 8, 16, 32],
+    ):
+        print(benchmark)  # trunk-ignore(ruff/T201)
@@ -1,23 +1,79 @@
 from __future__ import annotations
 
-from typing import TYPE_CHECKING
+import threading
+import weakref
+from collections import OrderedDict
+from itertools import islice
+from pathlib import Path
+from typing import TYPE_CHECKING, Callable, Iterable, TypeVar
 
 import chromadb
+import chromadb.errors
 
 from hackathon.otel import tracer
 
+from .ivf_index import DEFAULT_NPROBE
+from .local_vector_store import LocalVectorStore
+
 if TYPE_CHECKING:
+    import numpy as np
+
     from hackathon.models.project import Project
 
+    from .helper_embeddings import Embedder
+
 
 SPAN_KEY: str = "chroma"
+DEFAULT_BATCH_SIZE: int = 100
+DEFAULT_LOCAL_VECTOR_STORE_PATH: str = ".cache/vector_store"
+
+T = TypeVar("T")
+
+_collections: weakref.WeakKeyDictionary[
+    chromadb.api.ClientAPI,
+    dict[str, chromadb.Collection],
+] = weakref.WeakKeyDictionary()
+_collections_lock: threading.Lock = threading.Lock()
+
+MAX_CACHED_QUERY_RESULTS: int = 256
+
+_query_results: weakref.WeakKeyDictionary[
+    chromadb.api.ClientAPI,
+    OrderedDict[tuple[str, str, int], chromadb.QueryResult],
+] = weakref.WeakKeyDictionary()
+_query_results_lock: threading.Lock = threading.Lock()
+
+
+def set_up_local_client_from_tokens(
+    tokens: dict[str, str | None],
+) -> LocalVectorStore:
+    nprobe: str | None = tokens.get("VECTOR_STORE_NPROBE")
+    return LocalVectorStore(
+        directory=Path(
+            tokens.get("VECTOR_STORE_PATH") or DEFAULT_LOCAL_VECTOR_STORE_PATH,
+        ),
+        nprobe=DEFAULT_NPROBE if nprobe is None else int(nprobe),
+    )
 
 
 def set_up_client_from_tokens(
     tokens: dict[str, str | None],
 ) -> chromadb.api.ClientAPI | None:
+    """Returns the hosted Chroma client, or the in process store.
+
+    The in process store is used when VECTOR_STORE_BACKEND is local, or as a
+    fallback when the hosted Chroma tokens are missing.
+    """
     span_name: str = f"{SPAN_KEY}-set_up_client_from_tokens"
     with tracer.start_as_current_span(span_name) as span:
+        if tokens.get("VECTOR_STORE_BACKEND") == "local":
+            span.add_event(
+                name="vector_store_backend-local",
+            )
+            return set_up_local_client_from_tokens(  # trunk-ignore(pyright/reportReturnType)
+                tokens=tokens,
+            )
+
         required_tokens: list[str] = ["CHROMA_TENANT", "CHROMA_DATABASE", "CHROMA_API_KEY"]
         missing_tokens = [token for token in required_tokens if not tokens.get(token)]
         for token in missing_tokens:
@@ -29,7 +85,12 @@ def set_up_client_from_tokens(
             )
 
         if missing_tokens:
-            return None
+            span.add_event(
+                name="vector_store_backend-local_fallback",
+            )
+            return set_up_local_client_from_tokens(  # trunk-ignore(pyright/reportReturnType)
+                tokens=tokens,
+            )
 
         return chromadb.HttpClient(
             ssl=True,
@@ -42,6 +103,130 @@ def set_up_client_from_tokens(
         )
 
 
+def _get_collection(
+    client: chromadb.api.ClientAPI,
+    collection_name: str,
+    create: bool,  # trunk-ignore(ruff/FBT001)
+) -> chromadb.Collection:
+    with _collections_lock:
+        client_collections: dict[str, chromadb.Collection] = (
+            _collections.setdefault(client, {})
+        )
+        if (collection := client_collections.get(collection_name)) is not None:
+            return collection
+
+    span_name: str = f"{SPAN_KEY}-get_collection"
+    with tracer.start_as_current_span(span_name) as span:
+        collection = (
+            client.get_or_create_collection(
+                name=collection_name,
+            )
+            if create
+            else client.get_collection(
+                name=collection_name,
+            )
+        )
+        span.add_event(
+            name="get_collection-resolved",
+            attributes={
+                "collection_name": collection_name,
+            },
+        )
+        with _collections_lock:
+            _collections.setdefault(client, {})[collection_name] = collection
+
+        return collection
+
+
+def invalidate_collection(
+    client: chromadb.api.ClientAPI,
+    collection_name: str,
+) -> None:
+    with _collections_lock:
+        _collections.get(client, {}).pop(collection_name, None)
+
+
+def _call_with_collection(
+    client: chromadb.api.ClientAPI,
+    collection_name: str,
+    create: bool,  # trunk-ignore(ruff/FBT001)
+    call: Callable[[chromadb.Collection], T],
+) -> T:
+    """Runs the call against the cached collection handle.
+
+    A handle goes stale when the collection is deleted or recreated, so on a
+    Chroma error the handle is dropped, resolved again and the call retried once.
+    """
+    collection: chromadb.Collection = _get_collection(
+        client=client,
+        collection_name=collection_name,
+        create=create,
+    )
+    try:
+        return call(collection)
+
+    except chromadb.errors.ChromaError as e:
+        with tracer.start_as_current_span(f"{SPAN_KEY}-collection_retry") as span:
+            span.record_exception(e)
+            span.add_event(
+                name="collection-invalidated",
+                attributes={
+                    "collection_name": collection_name,
+                },
+            )
+
+        invalidate_collection(
+            client=client,
+            collection_name=collection_name,
+        )
+        collection = _get_collection(
+            client=client,
+            collection_name=collection_name,
+            create=create,
+        )
+        return call(collection)
+
+
+def _get_cached_query_result(
+    client: chromadb.api.ClientAPI,
+    key: tuple[str, str, int],
+) -> chromadb.QueryResult | None:
+    with _query_results_lock:
+        client_query_results = _query_results.get(client)
+        if client_query_results is None or key not in client_query_results:
+            return None
+
+        client_query_results.move_to_end(key)
+        return client_query_results[key]
+
+
+def _set_cached_query_result(
+    client: chromadb.api.ClientAPI,
+    key: tuple[str, str, int],
+    result: chromadb.QueryResult,
+) -> None:
+    with _query_results_lock:
+        client_query_results = _query_results.setdefault(client, OrderedDict())
+        client_query_results[key] = result
+        client_query_results.move_to_end(key)
+        while len(client_query_results) > MAX_CACHED_QUERY_RESULTS:
+            client_query_results.popitem(last=False)
+
+
+def invalidate_query_results(
+    client: chromadb.api.ClientAPI,
+    collection_name: str,
+) -> None:
+    """Drops the cached query results of a collection after it is written to."""
+    with _query_results_lock:
+        client_query_results = _query_results.get(client)
+        if client_query_results is None:
+            return
+
+        for key in [key for key in client_query_results if key[0] == collection_name]:
+            del client_query_results[key]
+
+
 def _get_metadata(
     item: Project,
     metadata_keys: list[str],
@@ -61,6 +246,7 @@ def add_item(
     metadata_keys: list[str],
     collection_name: str,
     client: chromadb.api.client.Client,
+    embedder: Embedder | None = None,
 ) -> None:
     span_name: str = f"{SPAN_KEY}-add_item"
     with tracer.start_as_current_span(span_name) as span:
@@ -92,13 +278,23 @@ def add_item(
             name=f"{span_name}-started",
             attributes=metadata,
         )
-        collection: chromadb.Collection = client.get_or_create_collection(
-            name=collection_name,
+        embeddings: list[np.ndarray] | None = (
+            None if embedder is None else embedder.embed_documents([item_document])
+        )
+        _call_with_collection(
+            client=client,
+            collection_name=collection_name,
+            create=True,
+            call=lambda collection: collection.add(
+                ids=[item_id],
+                documents=[item_document],
+                metadatas=[metadata],
+                embeddings=embeddings,
+            ),
         )
-        collection.add(
-            ids=[item_id],
-            documents=[item_document],
-            metadatas=[metadata],
+        invalidate_query_results(
+            client=client,
+            collection_name=collection_name,
         )
         span.add_event(
             name=f"{span_name}-completed",
@@ -106,12 +302,98 @@ def add_item(
         )
 
 
+def add_items(  # trunk-ignore(ruff/PLR0913)
+    items: Iterable[Project],
+    get_item_id: Callable[[Project], str],
+    get_item_document: Callable[[Project], str],
+    metadata_keys: list[str],
+    collection_name: str,
+    client: chromadb.api.client.Client,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    embedder: Embedder | None = None,
+) -> int:
+    """Upserts the items in batches of batch_size, resolving the collection once.
+
+    With an embedder, each batch is embedded up front and the vectors are
+    passed to the collection instead of letting it embed the documents.
+
+    Returns:
+        int: The number of items upserted.
+    """
+    span_name: str = f"{SPAN_KEY}-add_items"
+    with tracer.start_as_current_span(span_name) as span:
+        span.add_event(
+            name=f"{span_name}-started",
+            attributes={
+                "collection_name": collection_name,
+                "batch_size": batch_size,
+            },
+        )
+        item_iterator = iter(items)
+        item_count: int = 0
+        while batch := list(islice(item_iterator, batch_size)):
+            ids: list[str] = [get_item_id(item) for item in batch]
+            documents: list[str] = [get_item_document(item) for item in batch]
+            metadatas: list[dict] = [
+                {
+                    **_get_metadata(
+                        item=item,
+                        metadata_keys=metadata_keys,
+                    ),
+                    "collection_name": collection_name,
+                }
+                for item in batch
+            ]
+            embeddings: list[np.ndarray] | None = (
+                None if embedder is None else embedder.embed_documents(documents)
+            )
+            _call_with_collection(
+                client=client,
+                collection_name=collection_name,
+                create=True,
+                call=lambda collection: collection.upsert(
+                    ids=ids,  # trunk-ignore(ruff/B023)
+                    documents=documents,  # trunk-ignore(ruff/B023)
+                    metadatas=metadatas,  # trunk-ignore(ruff/B023)
+                    embeddings=embeddings,  # trunk-ignore(ruff/B023)
+                ),
+            )
+            invalidate_query_results(
+                client=client,
+                collection_name=collection_name,
+            )
+            item_count += len(batch)
+            span.add_event(
+                name=f"{span_name}-batch_upserted",
+                attributes={
+                    "collection_name": collection_name,
+                    "item_count": item_count,
+                },
+            )
+
+        span.add_event(
+            name=f"{span_name}-completed",
+            attributes={
+                "collection_name": collection_name,
+                "item_count": item_count,
+            },
+        )
+        return item_count
+
+
 def get_items(
     query: str,
     n_results: int,
     collection_name: str,
     client: chromadb.api.client.Client,
+    embedder: Embedder | None = None,
 ) -> chromadb.QueryResult:
+    """Queries the collection, reusing the raw result of an identical recent query.
+
+    Results are kept in a per-client LRU keyed by (collection_name, query,
+    n_results) and dropped whenever the collection is written to, so callers
+    that only change how they filter the distances never hit the network.
+    """
     span_name: str = f"{SPAN_KEY}-get_items"
     with tracer.start_as_current_span(span_name) as span:
         attributes: dict = {
@@ -124,28 +406,45 @@ def get_items(
             name="get_items-started",
             attributes=attributes,
         )
-        span.add_event(
-            name="get_collection-started",
-            attributes=attributes,
-        )
-        collection: chromadb.Collection = client.get_collection(
-            name=collection_name,
-        )
-        span.add_event(
-            name="get_collection-completed",
-            attributes={
-                "collection_name": collection_name,
-            },
-        )
+        cache_key: tuple[str, str, int] = (collection_name, query, n_results)
+        if (
+            cached_result := _get_cached_query_result(
+                client=client,
+                key=cache_key,
+            )
+        ) is not None:
+            span.add_event(
+                name="query-cache_hit",
+                attributes=attributes,
+            )
+            return cached_result
+
         span.add_event(
             name="query-started",
             attributes=attributes,
         )
-        result: chromadb.QueryResult = collection.query(
-            query_texts=query,
-            n_results=n_results,
+        result: chromadb.QueryResult = _call_with_collection(
+            client=client,
+            collection_name=collection_name,
+            create=False,
+            call=lambda collection: (
+                collection.query(
+                    query_texts=query,
+                    n_results=n_results,
+                )
+                if embedder is None
+                else collection.query(
+                    query_embeddings=[embedder.embed_query(query)],
+                    n_results=n_results,
+                )
+            ),
         )
         span.add_event(
             name="query-completed",
         )
+        _set_cached_query_result(
+            client=client,
+            key=cache_key,
+            result=result,
+        )
         return result
@@ -0,0 +1,144 @@
+from __future__ import annotations
+
+import base64
+import dataclasses
+import hashlib
+import threading
+from collections import OrderedDict
+from itertools import islice
+from typing import TYPE_CHECKING, Protocol, Sequence
+
+import numpy as np
+
+from hackathon.otel import tracer
+
+if TYPE_CHECKING:
+    from hackathon.helper_cache import SqliteCache
+
+
+SPAN_KEY: str = "embeddings"
+DEFAULT_EMBEDDING_MODEL_NAME: str = "all-MiniLM-L6-v2"
+DEFAULT_EMBEDDING_BATCH_SIZE: int = 64
+MAX_CACHED_QUERY_EMBEDDINGS: int = 1024
+
+
+class EmbeddingFunction(Protocol):
+    def __call__(
+        self: EmbeddingFunction,
+        input: list[str],  # trunk-ignore(ruff/A002)
+    ) -> Sequence[Sequence[float]]: ...
+
+
+def get_default_embedding_function() -> EmbeddingFunction:
+    """Chroma's default ONNX MiniLM model, which runs in process."""
+    from chromadb.utils.embedding_functions import DefaultEmbeddingFunction
+
+    return DefaultEmbeddingFunction()  # trunk-ignore(pyright/reportReturnType)
+
+
+def _encode(
+    embedding: np.ndarray,
+) -> str:
+    return base64.b64encode(embedding.astype(np.float32).tobytes()).decode()
+
+
+def _decode(
+    value: str,
+) -> np.ndarray:
+    return np.frombuffer(base64.b64decode(value), dtype=np.float32)
+
+
+@dataclasses.dataclass(eq=False)
+class Embedder:
+    """Turns documents into embeddings ahead of the vector store.
+
+    Document embeddings are cached by a hash of the model name and the text,
+    so an unchanged description is never embedded twice, and only the misses
+    of a call are sent to the model, batch_size documents at a time. Query
+    embeddings are also kept in an in memory LRU, since the same filter text
+    is searched over and over while the distance slider moves.
+    """
+
+    model_name: str = DEFAULT_EMBEDDING_MODEL_NAME
+    embedding_function: EmbeddingFunction | None = None
+    cache: SqliteCache | None = None
+    batch_size: int = DEFAULT_EMBEDDING_BATCH_SIZE
+    _query_embeddings: OrderedDict[str, np.ndarray] = dataclasses.field(
+        default_factory=OrderedDict,
+        repr=False,
+    )
+    _lock: threading.Lock = dataclasses.field(
+        default_factory=threading.Lock,
+        repr=False,
+    )
+
+    def _get_embedding_function(
+        self: Embedder,
+    ) -> EmbeddingFunction:
+        if self.embedding_function is None:
+            self.embedding_function = get_default_embedding_function()
+
+        return self.embedding_function
+
+    def get_cache_key(
+        self: Embedder,
+        document: str,
+    ) -> str:
+        return hashlib.sha256(f"{self.model_name}\n{document}".encode()).hexdigest()
+
+    def embed_documents(
+        self: Embedder,
+        documents: list[str],
+    ) -> list[np.ndarray]:
+        span_name: str = f"{SPAN_KEY}-embed_documents"
+        with tracer.start_as_current_span(span_name) as span:
+            keys: list[str] = [self.get_cache_key(document) for document in documents]
+            embeddings: dict[str, np.ndarray] = {}
+            if self.cache is not None:
+                for key in dict.fromkeys(keys):
+                    if (value := self.cache.get(key)) is not None:
+                        embeddings[key] = _decode(value)
+
+            missing: dict[str, str] = {
+                key: document
+                for key, document in zip(keys, documents)
+                if key not in embeddings
+            }
+            missing_iterator = iter(missing.items())
+            while batch := list(islice(missing_iterator, self.batch_size)):
+                batch_embeddings: Sequence[Sequence[float]] = (
+                    self._get_embedding_function()([document for _, document in batch])
+                )
+                for (key, _), embedding in zip(batch, batch_embeddings):
+                    embeddings[key] = np.asarray(embedding, dtype=np.float32)
+                    if self.cache is not None:
+                        self.cache.set(
+                            key=key,
+                            value=_encode(embeddings[key]),
+                        )
+
+            span.add_event(
+                name="embed_documents-completed",
+                attributes={
+                    "document_count": len(documents),
+                    "document_count-embedded": len(missing),
+                },
+            )
+            return [embeddings[key] for key in keys]
+
+    def embed_query(
+        self: Embedder,
+        query: str,
+    ) -> np.ndarray:
+        with self._lock:
+            if (embedding := self._query_embeddings.get(query)) is not None:
+                self._query_embeddings.move_to_end(query)
+                return embedding
+
+        embedding = self.embed_documents([query])[0]
+        with self._lock:
+            self._query_embeddings[query] = embedding
+            while len(self._query_embeddings) > MAX_CACHED_QUERY_EMBEDDINGS:
+                self._query_embeddings.popitem(last=False)
+
+        return embedding
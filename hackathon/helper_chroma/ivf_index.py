@@ -0,0 +1,195 @@
+from __future__ import annotations
+
+import dataclasses
+import math
+
+import numpy as np
+
+from hackathon.otel import tracer
+
+SPAN_KEY: str = "ivf_index"
+DEFAULT_NPROBE: int = 8
+TRAINING_ITERATIONS: int = 10
+TRAINING_SAMPLES_PER_LIST: int = 64
+ASSIGNMENT_CHUNK_SIZE: int = 4096
+
+
+def squared_l2_distances(
+    query_vectors: np.ndarray,
+    embeddings: np.ndarray,
+) -> np.ndarray:
+    squared_norms: np.ndarray = np.einsum("ij,ij->i", embeddings, embeddings)
+    query_squared_norms: np.ndarray = np.einsum(
+        "ij,ij->i",
+        query_vectors,
+        query_vectors,
+    )
+    return np.maximum(
+        query_squared_norms[:, None]
+        - 2.0 * (query_vectors @ embeddings.T)
+        + squared_norms[None, :],
+        0.0,
+    )
+
+
+def _nearest_centroids(
+    vectors: np.ndarray,
+    centroids: np.ndarray,
+) -> np.ndarray:
+    return np.concatenate(
+        [
+            squared_l2_distances(
+                query_vectors=vectors[start : start + ASSIGNMENT_CHUNK_SIZE],
+                embeddings=centroids,
+            ).argmin(axis=1)
+            for start in range(0, len(vectors), ASSIGNMENT_CHUNK_SIZE)
+        ]
+        or [np.empty(0, dtype=np.intp)],
+    )
+
+
+@dataclasses.dataclass(eq=False)
+class IvfIndex:
+    """An inverted file index over the rows of an embedding matrix.
+
+    Training runs k-means on a sample of the rows to pick sqrt(n) centroids,
+    and every row is filed under its nearest centroid. A search only scans
+    the rows filed under the nprobe centroids closest to the query, so nprobe
+    trades recall for latency. Rows added after training are filed under the
+    existing centroids; the owner retrains once the index has grown enough
+    for the centroids to drift.
+    """
+
+    nprobe: int = DEFAULT_NPROBE
+    seed: int = 0
+    _centroids: np.ndarray | None = dataclasses.field(default=None, repr=False)
+    _lists: list[set[int]] = dataclasses.field(default_factory=list, repr=False)
+    _row_lists: dict[int, int] = dataclasses.field(default_factory=dict, repr=False)
+    _list_rows: list[np.ndarray | None] = dataclasses.field(
+        default_factory=list,
+        repr=False,
+    )
+    _trained_count: int = 0
+
+    @property
+    def is_trained(
+        self: IvfIndex,
+    ) -> bool:
+        return self._centroids is not None
+
+    @property
+    def trained_count(
+        self: IvfIndex,
+    ) -> int:
+        return self._trained_count
+
+    def train(
+        self: IvfIndex,
+        embeddings: np.ndarray,
+    ) -> None:
+        span_name: str = f"{SPAN_KEY}-train"
+        with tracer.start_as_current_span(span_name) as span:
+            row_count: int = len(embeddings)
+            list_count: int = max(1, math.isqrt(row_count))
+            rng: np.random.Generator = np.random.default_rng(self.seed)
+            sample: np.ndarray = np.asarray(
+                embeddings[
+                    np.sort(
+                        rng.choice(
+                            row_count,
+                            size=min(row_count, list_count * TRAINING_SAMPLES_PER_LIST),
+                            replace=False,
+                        ),
+                    )
+                ],
+            )
+            centroids: np.ndarray = sample[
+                rng.choice(
+                    len(sample),
+                    size=list_count,
+                    replace=False,
+                )
+            ].copy()
+            for _ in range(TRAINING_ITERATIONS):
+                assignments: np.ndarray = _nearest_centroids(
+                    vectors=sample,
+                    centroids=centroids,
+                )
+                sums: np.ndarray = np.zeros_like(centroids)
+                np.add.at(sums, assignments, sample)
+                counts: np.ndarray = np.bincount(assignments, minlength=list_count)
+                filled: np.ndarray = counts > 0
+                centroids[filled] = sums[filled] / counts[filled, None]
+
+            self._centroids = centroids
+            self._lists = [set() for _ in range(list_count)]
+            self._list_rows = [None] * list_count
+            self._row_lists = {}
+            self.add(
+                rows=np.arange(row_count),
+                vectors=embeddings,
+            )
+            self._trained_count = row_count
+            span.add_event(
+                name="train-completed",
+                attributes={
+                    "row_count": row_count,
+                    "list_count": list_count,
+                },
+            )
+
+    def add(
+        self: IvfIndex,
+        rows: np.ndarray,
+        vectors: np.ndarray,
+    ) -> None:
+        """Files the rows under their nearest centroid, moving rows that were re-embedded."""
+        if self._centroids is None:
+            return
+
+        assignments: np.ndarray = _nearest_centroids(
+            vectors=np.asarray(vectors),
+            centroids=self._centroids,
+        )
+        for row, list_id in zip(rows.tolist(), assignments.tolist()):
+            previous_list_id: int | None = self._row_lists.get(row)
+            if previous_list_id is not None:
+                self._lists[previous_list_id].discard(row)
+                self._list_rows[previous_list_id] = None
+
+            self._lists[list_id].add(row)
+            self._list_rows[list_id] = None
+            self._row_lists[row] = list_id
+
+    def _get_list_rows(
+        self: IvfIndex,
+        list_id: int,
+    ) -> np.ndarray:
+        list_rows: np.ndarray | None = self._list_rows[list_id]
+        if list_rows is None:
+            list_rows = np.fromiter(self._lists[list_id], dtype=np.intp)
+            self._list_rows[list_id] = list_rows
+
+        return list_rows
+
+    def candidates(
+        self: IvfIndex,
+        query_vector: np.ndarray,
+        nprobe: int | None = None,
+    ) -> np.ndarray:
+        if self._centroids is None:
+            error_msg: str = "The index has to be trained before it is searched"
+            raise ValueError(error_msg)
+
+        probe_count: int = min(nprobe or self.nprobe, len(self._centroids))
+        centroid_distances: np.ndarray = squared_l2_distances(
+            query_vectors=query_vector[None, :],
+            embeddings=self._centroids,
+        )[0]
+        probed_lists: np.ndarray = np.argpartition(
+            centroid_distances,
+            probe_count - 1,
+        )[:probe_count]
+        return np.concatenate(
+            [self._get_list_rows(list_id) for list_id in probed_lists],
+        )
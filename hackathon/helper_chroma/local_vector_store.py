@@ -0,0 +1,446 @@
+from __future__ import annotations
+
+import dataclasses
+import json
+import threading
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Callable, Literal, Sequence
+
+import chromadb.errors
+import numpy as np
+
+from hackathon.otel import tracer
+
+from .helper_embeddings import EmbeddingFunction, get_default_embedding_function
+from .ivf_index import DEFAULT_NPROBE, IvfIndex, squared_l2_distances
+
+if TYPE_CHECKING:
+    import chromadb
+
+
+SPAN_KEY: str = "local_vector_store"
+INITIAL_CAPACITY: int = 1024
+ANN_MIN_ITEMS: int = 10_000
+ANN_RETRAIN_GROWTH_FACTOR: int = 4
+DistanceSpace = Literal["l2", "cosine"]
+
+
+@dataclasses.dataclass(eq=False)
+class LocalCollection:
+    """An in process collection with the add/upsert/query subset of chromadb.Collection.
+
+    Embeddings are rows of a float32 matrix kept in a memory-mapped .npy file,
+    and ids, documents and metadatas in a JSON file next to it. Queries are a
+    single vectorized distance computation followed by an argpartition top-k.
+    Distances use the same space as Chroma's default (squared L2), so distance
+    thresholds carry over between backends.
+
+    Once the collection holds ann_min_items items, queries go through an IVF
+    index instead and only scan the rows of the nprobe closest clusters. The
+    index is trained lazily on the first query and retrained whenever the
+    collection has grown ANN_RETRAIN_GROWTH_FACTOR times since.
+    """
+
+    name: str
+    directory: Path
+    embedding_function: Callable[[], EmbeddingFunction]
+    space: DistanceSpace = "l2"
+    ann_min_items: int | None = ANN_MIN_ITEMS
+    nprobe: int = DEFAULT_NPROBE
+    _ids: list[str] = dataclasses.field(default_factory=list)
+    _documents: list[str | None] = dataclasses.field(default_factory=list)
+    _metadatas: list[dict[str, Any] | None] = dataclasses.field(default_factory=list)
+    _rows: dict[str, int] = dataclasses.field(default_factory=dict)
+    _embeddings: np.ndarray | None = dataclasses.field(default=None, repr=False)
+    _index: IvfIndex | None = dataclasses.field(default=None, repr=False)
+    _lock: threading.RLock = dataclasses.field(
+        default_factory=threading.RLock,
+        repr=False,
+    )
+
+    def __post_init__(
+        self: LocalCollection,
+    ) -> None:
+        self.directory.mkdir(
+            parents=True,
+            exist_ok=True,
+        )
+        if not self._records_path.exists():
+            return
+
+        records: dict[str, Any] = json.loads(self._records_path.read_text())
+        self._ids = records["ids"]
+        self._documents = records["documents"]
+        self._metadatas = records["metadatas"]
+        self._rows = {item_id: row for row, item_id in enumerate(self._ids)}
+        if self._embeddings_path.exists():
+            self._embeddings = np.load(
+                self._embeddings_path,
+                mmap_mode="r+",
+            )
+
+    @property
+    def _records_path(
+        self: LocalCollection,
+    ) -> Path:
+        return self.directory / f"{self.name}.json"
+
+    @property
+    def _embeddings_path(
+        self: LocalCollection,
+    ) -> Path:
+        return self.directory / f"{self.name}.npy"
+
+    def count(
+        self: LocalCollection,
+    ) -> int:
+        return len(self._ids)
+
+    def _get_embeddings(
+        self: LocalCollection,
+    ) -> np.ndarray:
+        if self._embeddings is None:
+            return np.empty((0, 0), dtype=np.float32)
+
+        return self._embeddings[: len(self._ids)]
+
+    def _embed(
+        self: LocalCollection,
+        documents: list[str] | None,
+        embeddings: Sequence[Sequence[float]] | None,
+    ) -> np.ndarray:
+        if embeddings is None:
+            if documents is None:
+                error_msg: str = "Either documents or embeddings are required"
+                raise ValueError(error_msg)
+
+            embeddings = self.embedding_function()(documents)
+
+        vectors: np.ndarray = np.asarray(embeddings, dtype=np.float32)
+        if self.space == "cosine":
+            norms: np.ndarray = np.linalg.norm(vectors, axis=1, keepdims=True)
+            vectors = vectors / np.maximum(norms, np.finfo(np.float32).tiny)
+
+        return vectors
+
+    def _reserve(
+        self: LocalCollection,
+        row_count: int,
+        dimension: int,
+    ) -> np.ndarray:
+        """Grows the memory-mapped matrix geometrically so appends stay amortized O(1)."""
+        embeddings: np.ndarray | None = self._embeddings
+        if embeddings is not None and embeddings.shape[1] != dimension:
+            error_msg: str = (
+                f"Embedding dimension {dimension} does not match "
+                f"collection {self.name} dimension {embeddings.shape[1]}"
+            )
+            raise ValueError(error_msg)
+
+        if embeddings is not None and embeddings.shape[0] >= row_count:
+            return embeddings
+
+        capacity: int = max(
+            INITIAL_CAPACITY,
+            row_count,
+            0 if embeddings is None else embeddings.shape[0] * 2,
+        )
+        grown: np.ndarray = np.lib.format.open_memmap(
+            self.directory / f"{self.name}.npy.tmp",
+            mode="w+",
+            dtype=np.float32,
+            shape=(capacity, dimension),
+        )
+        if embeddings is not None:
+            grown[: len(self._ids)] = embeddings[: len(self._ids)]
+
+        grown.flush()
+        del grown
+        Path(self.directory / f"{self.name}.npy.tmp").replace(
+            self._embeddings_path,
+        )
+        self._embeddings = np.load(
+            self._embeddings_path,
+            mmap_mode="r+",
+        )
+        return self._embeddings
+
+    def _persist(
+        self: LocalCollection,
+    ) -> None:
+        if isinstance(self._embeddings, np.memmap):
+            self._embeddings.flush()
+
+        self._records_path.write_text(
+            json.dumps(
+                {
+                    "ids": self._ids,
+                    "documents": self._documents,
+                    "metadatas": self._metadatas,
+                },
+            ),
+        )
+
+    def _write(  # trunk-ignore(ruff/PLR0913)
+        self: LocalCollection,
+        ids: list[str],
+        documents: list[str] | None,
+        metadatas: list[dict[str, Any]] | None,
+        embeddings: Sequence[Sequence[float]] | None,
+        overwrite: bool,  # trunk-ignore(ruff/FBT001)
+    ) -> None:
+        span_name: str = f"{SPAN_KEY}-write"
+        with tracer.start_as_current_span(span_name) as span, self._lock:
+            vectors: np.ndarray = self._embed(
+                documents=documents,
+                embeddings=embeddings,
+            )
+            new_ids: list[str] = [
+                item_id for item_id in dict.fromkeys(ids) if item_id not in self._rows
+            ]
+            matrix: np.ndarray = self._reserve(
+                row_count=len(self._ids) + len(new_ids),
+                dimension=vectors.shape[1],
+            )
+            written_rows: list[int] = []
+            written_positions: list[int] = []
+            for position, item_id in enumerate(ids):
+                row: int | None = self._rows.get(item_id)
+                if row is not None and not overwrite:
+                    continue
+
+                if row is None:
+                    row = len(self._ids)
+                    self._rows[item_id] = row
+                    self._ids.append(item_id)
+                    self._documents.append(None)
+                    self._metadatas.append(None)
+
+                matrix[row] = vectors[position]
+                self._documents[row] = None if documents is None else documents[position]
+                self._metadatas[row] = None if metadatas is None else metadatas[position]
+                written_rows.append(row)
+                written_positions.append(position)
+
+            if self._index is not None:
+                self._index.add(
+                    rows=np.asarray(written_rows, dtype=np.intp),
+                    vectors=vectors[written_positions],
+                )
+
+            self._persist()
+            span.add_event(
+                name="write-completed",
+                attributes={
+                    "collection_name": self.name,
+                    "written_count": len(written_rows),
+                    "item_count": len(self._ids),
+                },
+            )
+
+    def add(
+        self: LocalCollection,
+        ids: list[str],
+        documents: list[str] | None = None,
+        metadatas: list[dict[str, Any]] | None = None,
+        embeddings: Sequence[Sequence[float]] | None = None,
+    ) -> None:
+        """Adds the items, skipping ids that already exist like Chroma does."""
+        self._write(
+            ids=ids,
+            documents=documents,
+            metadatas=metadatas,
+            embeddings=embeddings,
+            overwrite=False,
+        )
+
+    def upsert(
+        self: LocalCollection,
+        ids: list[str],
+        documents: list[str] | None = None,
+        metadatas: list[dict[str, Any]] | None = None,
+        embeddings: Sequence[Sequence[float]] | None = None,
+    ) -> None:
+        self._write(
+            ids=ids,
+            documents=documents,
+            metadatas=metadatas,
+            embeddings=embeddings,
+            overwrite=True,
+        )
+
+    def _distances(
+        self: LocalCollection,
+        query_vectors: np.ndarray,
+        embeddings: np.ndarray,
+    ) -> np.ndarray:
+        if self.space == "cosine":
+            return 1.0 - query_vectors @ embeddings.T
+
+        return squared_l2_distances(
+            query_vectors=query_vectors,
+            embeddings=embeddings,
+        )
+
+    def _get_index(
+        self: LocalCollection,
+    ) -> IvfIndex | None:
+        if self.ann_min_items is None or len(self._ids) < self.ann_min_items:
+            return None
+
+        if (
+            self._index is None
+            or len(self._ids) >= self._index.trained_count * ANN_RETRAIN_GROWTH_FACTOR
+        ):
+            self._index = IvfIndex(
+                nprobe=self.nprobe,
+            )
+            self._index.train(self._get_embeddings())
+
+        return self._index
+
+    def _top_k(
+        self: LocalCollection,
+        query_vector: np.ndarray,
+        n_results: int,
+        nprobe: int | None,
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """Returns the rows and distances of the nearest items, closest first."""
+        embeddings: np.ndarray = self._get_embeddings()
+        index: IvfIndex | None = self._get_index()
+        rows: np.ndarray | None = (
+            None
+            if index is None
+            else index.candidates(
+                query_vector=query_vector,
+                nprobe=nprobe,
+            )
+        )
+        if rows is not None and len(rows) < n_results:
+            rows = None
+
+        distances: np.ndarray = self._distances(
+            query_vectors=query_vector[None, :],
+            embeddings=embeddings if rows is None else embeddings[rows],
+        )[0]
+        k: int = min(n_results, len(distances))
+        top: np.ndarray = (
+            np.argpartition(distances, k - 1)[:k]
+            if 0 < k < len(distances)
+            else np.arange(k)
+        )
+        top = top[np.argsort(distances[top])]
+        return (top if rows is None else rows[top]), distances[top]
+
+    def query(
+        self: LocalCollection,
+        query_texts: str | list[str] | None = None,
+        query_embeddings: Sequence[Sequence[float]] | None = None,
+        n_results: int = 10,
+        nprobe: int | None = None,
+    ) -> chromadb.QueryResult:
+        span_name: str = f"{SPAN_KEY}-query"
+        with tracer.start_as_current_span(span_name) as span, self._lock:
+            if isinstance(query_texts, str):
+                query_texts = [query_texts]
+
+            query_vectors: np.ndarray = self._embed(
+                documents=query_texts,
+                embeddings=query_embeddings,
+            )
+            result: dict[str, Any] = {
+                "ids": [],
+                "distances": [],
+                "documents": [],
+                "metadatas": [],
+                "embeddings": None,
+                "uris": None,
+                "data": None,
+                "included": ["documents", "metadatas", "distances"],
+            }
+            for query_vector in query_vectors:
+                top_rows, top_distances = (
+                    self._top_k(
+                        query_vector=query_vector,
+                        n_results=n_results,
+                        nprobe=nprobe,
+                    )
+                    if self._ids
+                    else (np.empty(0, dtype=np.intp), np.empty(0, dtype=np.float32))
+                )
+                result["ids"].append([self._ids[row] for row in top_rows])
+                result["distances"].append(top_distances.tolist())
+                result["documents"].append([self._documents[row] for row in top_rows])
+                result["metadatas"].append([self._metadatas[row] for row in top_rows])
+
+            span.add_event(
+                name="query-completed",
+                attributes={
+                    "collection_name": self.name,
+                    "n_results": n_results,
+                    "item_count": len(self._ids),
+                    "used_ann_index": self._index is not None,
+                },
+            )
+            return result  # trunk-ignore(pyright/reportReturnType)
+
+
+@dataclasses.dataclass(eq=False)
+class LocalVectorStore:
+    """An offline backend exposing the chromadb client calls helper_chroma uses."""
+
+    directory: Path
+    space: DistanceSpace = "l2"
+    ann_min_items: int | None = ANN_MIN_ITEMS
+    nprobe: int = DEFAULT_NPROBE
+    embedding_function: EmbeddingFunction | None = None
+    _collections: dict[str, LocalCollection] = dataclasses.field(
+        default_factory=dict,
+    )
+    _lock: threading.Lock = dataclasses.field(
+        default_factory=threading.Lock,
+        repr=False,
+    )
+
+    def _get_embedding_function(
+        self: LocalVectorStore,
+    ) -> EmbeddingFunction:
+        if self.embedding_function is None:
+            self.embedding_function = get_default_embedding_function()
+
+        return self.embedding_function
+
+    def _has_collection(
+        self: LocalVectorStore,
+        name: str,
+    ) -> bool:
+        return name in self._collections or (self.directory / f"{name}.json").exists()
+
+    def get_or_create_collection(
+        self: LocalVectorStore,
+        name: str,
+    ) -> LocalCollection:
+        with self._lock:
+            if (collection := self._collections.get(name)) is not None:
+                return collection
+
+            collection = LocalCollection(
+                name=name,
+                directory=self.directory,
+                embedding_function=self._get_embedding_function,
+                space=self.space,
+                ann_min_items=self.ann_min_items,
+                nprobe=self.nprobe,
+            )
+            self._collections[name] = collection
+            return collection
+
+    def get_collection(
+        self: LocalVectorStore,
+        name: str,
+    ) -> LocalCollection:
+        if not self._has_collection(name):
+            error_msg: str = f"Collection {name} does not exist"
+            raise chromadb.errors.NotFoundError(error_msg)
+
+        return self.get_or_create_collection(name)
@@ -0,0 +1,39 @@
+__all__ = [
+    "WriteBehindQueue",
+    "async_fetch_projects",
+    "async_fetch_projects_due_for_refresh",
+    "async_fetch_pull_request_checkpoint",
+    "async_save_project_changes",
+    "async_save_projects",
+    "async_save_pull_requests",
+    "async_search_projects_by_keywords",
+    "async_session",
+    "dispose_async_engine",
+    "fetch_project_rows",
+    "fetch_projects",
+    "fetch_projects_due_for_refresh",
+    "fetch_pull_request_checkpoint",
+    "save_project_changes",
+    "save_projects",
+    "save_pull_requests",
+    "search_projects_by_keywords",
+    "supports_keyword_search",
+]
+
+from .helper_ag_grid import fetch_project_rows
+from .helper_async import (
+    async_fetch_projects,
+    async_fetch_projects_due_for_refresh,
+    async_fetch_pull_request_checkpoint,
+    async_save_project_changes,
+    async_save_projects,
+    async_save_pull_requests,
+    async_search_projects_by_keywords,
+    async_session,
+    dispose_async_engine,
+)
+from .helper_db import fetch_projects, save_projects
+from .helper_pull_requests import fetch_pull_request_checkpoint, save_pull_requests
+from .helper_refresh import fetch_projects_due_for_refresh, save_project_changes
+from .helper_search import search_projects_by_keywords, supports_keyword_search
+from .write_behind import WriteBehindQueue
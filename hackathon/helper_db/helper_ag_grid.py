@@ -0,0 +1,343 @@
+from __future__ import annotations
+
+import datetime
+import json
+import threading
+from collections import OrderedDict
+from typing import TYPE_CHECKING, Any
+
+from sqlalchemy import and_, false, or_, select
+
+from hackathon.models.project import AG_GRID_FIELDS, Project
+from hackathon.otel import tracer
+
+if TYPE_CHECKING:
+    from sqlalchemy.orm import Session
+    from sqlalchemy.sql.elements import ColumnElement
+
+
+SPAN_KEY: str = "db-ag_grid"
+MAX_ROW_CURSOR_QUERIES: int = 64
+MAX_ROW_CURSORS_PER_QUERY: int = 256
+LIKE_ESCAPE: str = "\\"
+
+# The cursors are shared by every client and keyed by the query, the sort and
+# filter model, and the row the next block starts at. Nothing about the
+# client is part of the key. A cursor only holds the sort values of the last
+# row of a block, which any client with the same sort and filter model can
+# read from the grid anyway, and it is a valid position in that order no
+# matter who computed it. When rows were inserted since, the block after a
+# cursor can differ from the one an offset would give. That is the same
+# shift a single client sees when it keeps scrolling while rows are inserted.
+# Each query has its own LRU of MAX_ROW_CURSORS_PER_QUERY cursors, so
+# scrolling deep into one query only evicts cursors of that query, and the
+# least recently used of MAX_ROW_CURSOR_QUERIES queries is dropped as a whole.
+_row_cursors: OrderedDict[str, OrderedDict[int, tuple[Any, ...]]] = OrderedDict()
+_row_cursors_lock: threading.Lock = threading.Lock()
+
+
+def _parse_date(
+    value: str | None,
+) -> datetime.datetime | None:
+    if value is None:
+        return None
+
+    return datetime.datetime.fromisoformat(value)
+
+
+def _escape_like(
+    value: object,
+) -> str:
+    """Makes % and _ in the filter text match literally."""
+    return (
+        str(value)
+        .replace(LIKE_ESCAPE, LIKE_ESCAPE * 2)
+        .replace("%", f"{LIKE_ESCAPE}%")
+        .replace("_", f"{LIKE_ESCAPE}_")
+    )
+
+
+def _condition_clause(  # trunk-ignore(ruff/PLR0911,ruff/PLR0912,ruff/C901)
+    column: Any,  # trunk-ignore(ruff/ANN401)
+    condition: dict[str, Any],
+) -> ColumnElement[bool]:
+    filter_type: str | None = condition.get("filterType")
+    condition_type: str | None = condition.get("type")
+    match filter_type:
+        case "date":
+            value: Any = _parse_date(condition.get("dateFrom"))
+            value_to: Any = _parse_date(condition.get("dateTo"))
+
+        case _:
+            value = condition.get("filter")
+            value_to = condition.get("filterTo")
+
+    match condition_type:
+        case "contains":
+            return column.ilike(f"%{_escape_like(value)}%", escape=LIKE_ESCAPE)
+
+        case "notContains":
+            return ~column.ilike(f"%{_escape_like(value)}%", escape=LIKE_ESCAPE)
+
+        case "startsWith":
+            return column.ilike(f"{_escape_like(value)}%", escape=LIKE_ESCAPE)
+
+        case "endsWith":
+            return column.ilike(f"%{_escape_like(value)}", escape=LIKE_ESCAPE)
+
+        case "equals":
+            return column == value
+
+        case "notEqual":
+            return column != value
+
+        case "lessThan":
+            return column < value
+
+        case "lessThanOrEqual":
+            return column <= value
+
+        case "greaterThan":
+            return column > value
+
+        case "greaterThanOrEqual":
+            return column >= value
+
+        case "inRange":
+            return and_(column >= value, column <= value_to)
+
+        case "blank" if filter_type == "text":
+            return or_(column.is_(None), column == "")
+
+        case "blank":
+            return column.is_(None)
+
+        case "notBlank" if filter_type == "text":
+            return and_(column.is_not(None), column != "")
+
+        case "notBlank":
+            return column.is_not(None)
+
+        case _:
+            error_msg: str = f"Unsupported ag grid filter type: {condition_type}"
+            raise ValueError(error_msg)
+
+
+def _filter_clauses(
+    filter_model: dict[str, dict[str, Any]] | None,
+) -> list[ColumnElement[bool]]:
+    if not filter_model:
+        return []
+
+    clauses: list[ColumnElement[bool]] = []
+    for field, model in filter_model.items():
+        if field not in AG_GRID_FIELDS:
+            error_msg: str = f"Cannot filter on unknown ag grid column: {field}"
+            raise ValueError(error_msg)
+
+        column: Any = getattr(Project, field)
+        conditions: list[dict[str, Any]] | None = model.get("conditions")
+        if conditions is None:
+            clauses.append(_condition_clause(column, model))
+            continue
+
+        condition_clauses: list[ColumnElement[bool]] = [
+            _condition_clause(
+                column,
+                {
+                    "filterType": model.get("filterType"),
+                    **condition,
+                },
+            )
+            for condition in conditions
+        ]
+        match model.get("operator", "AND"):
+            case "OR":
+                clauses.append(or_(*condition_clauses))
+
+            case _:
+                clauses.append(and_(*condition_clauses))
+
+    return clauses
+
+
+def _sort_columns(
+    sort_model: list[dict[str, str]] | None,
+) -> list[tuple[str, bool]]:
+    """Returns (field, is_descending) pairs, always ending with the id tie-breaker."""
+    sort_columns: list[tuple[str, bool]] = []
+    for sort in sort_model or []:
+        field: str | None = sort.get("colId")
+        if field not in AG_GRID_FIELDS:
+            error_msg: str = f"Cannot sort on unknown ag grid column: {field}"
+            raise ValueError(error_msg)
+
+        sort_columns.append((field, sort.get("sort") == "desc"))
+
+    sort_columns.append(("id", False))
+    return sort_columns
+
+
+def _keyset_clause(
+    sort_columns: list[tuple[str, bool]],
+    cursor: tuple[Any, ...],
+) -> ColumnElement[bool]:
+    """Rows strictly after the cursor in the (possibly mixed direction) sort order.
+
+    NULLs sort last in either direction, see fetch_project_rows. Nothing
+    sorts after a NULL cursor value, and every non NULL value sorts before
+    it, so a NULL cursor value compares with IS NULL instead of = and <.
+    """
+    clause: ColumnElement[bool] = false()
+    for position in reversed(range(len(sort_columns))):
+        field, is_descending = sort_columns[position]
+        column: Any = getattr(Project, field)
+        value: Any = cursor[position]
+        if value is None:
+            clause = and_(column.is_(None), clause)
+            continue
+
+        after: ColumnElement[bool] = or_(
+            column < value if is_descending else column > value,
+            column.is_(None),
+        )
+        clause = or_(after, and_(column == value, clause))
+
+    return clause
+
+
+def _get_cursor(
+    query_key: str,
+    start: int,
+) -> tuple[Any, ...] | None:
+    with _row_cursors_lock:
+        query_cursors: OrderedDict[int, tuple[Any, ...]] | None = _row_cursors.get(
+            query_key,
+        )
+        if query_cursors is None:
+            return None
+
+        _row_cursors.move_to_end(query_key)
+        cursor: tuple[Any, ...] | None = query_cursors.get(start)
+        if cursor is not None:
+            query_cursors.move_to_end(start)
+
+        return cursor
+
+
+def _set_cursor(
+    query_key: str,
+    start: int,
+    cursor: tuple[Any, ...],
+) -> None:
+    with _row_cursors_lock:
+        query_cursors: OrderedDict[int, tuple[Any, ...]] = _row_cursors.setdefault(
+            query_key,
+            OrderedDict(),
+        )
+        _row_cursors.move_to_end(query_key)
+        query_cursors[start] = cursor
+        query_cursors.move_to_end(start)
+        while len(query_cursors) > MAX_ROW_CURSORS_PER_QUERY:
+            query_cursors.popitem(last=False)
+
+        while len(_row_cursors) > MAX_ROW_CURSOR_QUERIES:
+            _row_cursors.popitem(last=False)
+
+
+def fetch_project_rows(
+    session: Session,
+    start: int,
+    end: int,
+    sort_model: list[dict[str, str]] | None,
+    filter_model: dict[str, dict[str, Any]] | None,
+) -> list[Project]:
+    """Fetches one ag grid block with the sort and filter model applied in SQL.
+
+    The grid asks for consecutive blocks while scrolling, so the last row of
+    each block is kept as a keyset cursor for the block after it. Blocks that
+    are requested out of order fall back to an offset. NULLs sort last in
+    both directions, on every database, so the keyset clause can rely on it.
+    """
+    span_name: str = f"{SPAN_KEY}-fetch_project_rows"
+    with tracer.start_as_current_span(span_name) as span:
+        query_key: str = json.dumps(
+            [sort_model, filter_model],
+            sort_keys=True,
+        )
+        attributes: dict = {
+            "start": start,
+            "end": end,
+            "query_key": query_key,
+        }
+        span.add_event(
+            name="fetch_project_rows-started",
+            attributes=attributes,
+        )
+        sort_columns: list[tuple[str, bool]] = _sort_columns(
+            sort_model=sort_model,
+        )
+        statement = select(  # trunk-ignore(pyright/reportArgumentType)
+            Project,
+        ).order_by(
+            *(
+                (
+                    getattr(Project, field).desc()
+                    if is_descending
+                    else getattr(Project, field).asc()
+                ).nulls_last()
+                for field, is_descending in sort_columns
+            ),
+        ).limit(
+            end - start,
+        )
+        if filter_clauses := _filter_clauses(
+            filter_model=filter_model,
+        ):
+            statement = statement.where(*filter_clauses)
+
+        cursor: tuple[Any, ...] | None = (
+            _get_cursor(
+                query_key=query_key,
+                start=start,
+            )
+            if start > 0
+            else None
+        )
+        if cursor is not None:
+            statement = statement.where(
+                _keyset_clause(
+                    sort_columns=sort_columns,
+                    cursor=cursor,
+                ),
+            )
+
+        else:
+            statement = statement.offset(start)
+
+        projects: list[Project] = list(
+            session.exec(  # trunk-ignore(pyright/reportCallIssue)
+                statement=statement,  # trunk-ignore(pyright/reportArgumentType)
+            )
+            .scalars()
+            .all(),
+        )
+        if projects:
+            last_project: Project = projects[-1]
+            _set_cursor(
+                query_key=query_key,
+                start=start + len(projects),
+                cursor=tuple(
+                    getattr(last_project, field) for field, _ in sort_columns
+                ),
+            )
+
+        span.add_event(
+            name="fetch_project_rows-completed",
+            attributes={
+                **attributes,
+                "used_keyset_cursor": cursor is not None,
+                "project_count": len(projects),
+            },
+        )
+        return projects
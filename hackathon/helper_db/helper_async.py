@@ -0,0 +1,223 @@
+from __future__ import annotations
+
+import contextlib
+import datetime  # trunk-ignore(ruff/TCH003)
+import threading
+from typing import TYPE_CHECKING, Any, AsyncIterator
+from urllib.parse import parse_qsl, urlencode
+
+import reflex as rx
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from hackathon.otel import tracer
+
+from .helper_db import fetch_projects, save_projects
+from .helper_pull_requests import fetch_pull_request_checkpoint, save_pull_requests
+from .helper_refresh import fetch_projects_due_for_refresh, save_project_changes
+from .helper_search import search_projects_by_keywords, supports_keyword_search
+
+if TYPE_CHECKING:
+    from sqlmodel import Session
+
+    from hackathon.models.project import Project
+    from hackathon.models.pull_request import PullRequest, PullRequestCheckpoint
+
+
+SPAN_KEY: str = "db-async"
+ASYNC_POOL_SIZE: int = 10
+ASYNC_MAX_OVERFLOW: int = 20
+ASYNC_DRIVERS: dict[str, str] = {
+    "postgresql": "postgresql+asyncpg",
+    "postgresql+psycopg2": "postgresql+asyncpg",
+    "sqlite": "sqlite+aiosqlite",
+}
+# libpq connection parameters that asyncpg does not accept as query arguments.
+# asyncpg sends SNI, so the Neon endpoint option is not needed.
+ASYNCPG_DROPPED_PARAMETERS: frozenset[str] = frozenset({"options"})
+
+_async_engine: AsyncEngine | None = None
+_async_engine_lock: threading.Lock = threading.Lock()
+
+
+def get_async_db_url(
+    db_url: str,
+) -> str:
+    """Rewrites the sync db_url of the reflex config for its asyncio driver."""
+    scheme, separator, location = db_url.partition("://")
+    driver: str | None = ASYNC_DRIVERS.get(scheme)
+    if driver is None:
+        return db_url
+
+    location, _, query_string = location.partition("?")
+    query: list[tuple[str, str]] = parse_qsl(query_string)
+    if driver == "postgresql+asyncpg":
+        query = [
+            ("ssl" if key == "sslmode" else key, value)
+            for key, value in query
+            if key not in ASYNCPG_DROPPED_PARAMETERS
+        ]
+
+    return f"{driver}{separator}{location}" + (f"?{urlencode(query)}" if query else "")
+
+
+def get_async_engine() -> AsyncEngine:
+    global _async_engine  # trunk-ignore(ruff/PLW0603)
+    with _async_engine_lock:
+        if _async_engine is not None:
+            return _async_engine
+
+        db_url: str = get_async_db_url(
+            db_url=str(rx.config.get_config().db_url),
+        )
+        _async_engine = (
+            create_async_engine(db_url)
+            if db_url.startswith("sqlite")
+            else create_async_engine(
+                db_url,
+                pool_size=ASYNC_POOL_SIZE,
+                max_overflow=ASYNC_MAX_OVERFLOW,
+                pool_pre_ping=True,
+            )
+        )
+        return _async_engine
+
+
+@contextlib.asynccontextmanager
+async def async_session() -> AsyncIterator[AsyncSession]:
+    """The asyncio counterpart of rx.session(), on a pooled engine."""
+    async with AsyncSession(
+        get_async_engine(),
+        expire_on_commit=False,
+    ) as session:
+        yield session
+
+
+async def async_fetch_projects(
+    after_id: int | None,
+    limit: int | None,
+) -> list[Project]:
+    """fetch_projects without blocking the event loop on database I/O.
+
+    The query code is shared with the sync path through run_sync, which runs
+    it on the connection of the async session.
+    """
+    span_name: str = f"{SPAN_KEY}-fetch_projects"
+    with tracer.start_as_current_span(span_name):
+        async with async_session() as session:
+            return await session.run_sync(
+                fetch_projects,
+                after_id,
+                limit,
+            )
+
+
+async def async_save_projects(
+    projects: list[Project],
+) -> list[Project]:
+    """save_projects without blocking the event loop on database I/O."""
+    span_name: str = f"{SPAN_KEY}-save_projects"
+    with tracer.start_as_current_span(span_name):
+        async with async_session() as session:
+            return await session.run_sync(
+                save_projects,
+                projects,
+            )
+
+
+def _search_projects_by_keywords_if_supported(
+    session: Session,
+    query: str,
+    limit: int,
+) -> list[Project]:
+    if not supports_keyword_search(session):
+        return []
+
+    return search_projects_by_keywords(
+        session=session,
+        query=query,
+        limit=limit,
+    )
+
+
+async def async_search_projects_by_keywords(
+    query: str,
+    limit: int,
+) -> list[Project]:
+    """search_projects_by_keywords, empty on a database without search_vector."""
+    span_name: str = f"{SPAN_KEY}-search_projects_by_keywords"
+    with tracer.start_as_current_span(span_name):
+        async with async_session() as session:
+            return await session.run_sync(
+                _search_projects_by_keywords_if_supported,
+                query,
+                limit,
+            )
+
+
+async def async_fetch_projects_due_for_refresh(
+    now: datetime.datetime,
+    hot_stars: int,
+    hot_interval: datetime.timedelta,
+    cold_interval: datetime.timedelta,
+    limit: int,
+) -> list[Project]:
+    span_name: str = f"{SPAN_KEY}-fetch_projects_due_for_refresh"
+    with tracer.start_as_current_span(span_name):
+        async with async_session() as session:
+            return await session.run_sync(
+                fetch_projects_due_for_refresh,
+                now,
+                hot_stars,
+                hot_interval,
+                cold_interval,
+                limit,
+            )
+
+
+async def async_save_project_changes(
+    changes: dict[int, dict[str, Any]],
+    refreshed_at: datetime.datetime,
+) -> int:
+    span_name: str = f"{SPAN_KEY}-save_project_changes"
+    with tracer.start_as_current_span(span_name):
+        async with async_session() as session:
+            return await session.run_sync(
+                save_project_changes,
+                changes,
+                refreshed_at,
+            )
+
+
+async def async_fetch_pull_request_checkpoint(
+    repo_path: str,
+) -> PullRequestCheckpoint | None:
+    async with async_session() as session:
+        return await session.run_sync(
+            fetch_pull_request_checkpoint,
+            repo_path,
+        )
+
+
+async def async_save_pull_requests(
+    pull_requests: list[PullRequest],
+    checkpoint: PullRequestCheckpoint,
+) -> int:
+    span_name: str = f"{SPAN_KEY}-save_pull_requests"
+    with tracer.start_as_current_span(span_name):
+        async with async_session() as session:
+            return await session.run_sync(
+                save_pull_requests,
+                pull_requests,
+                checkpoint,
+            )
+
+
+async def dispose_async_engine() -> None:
+    global _async_engine  # trunk-ignore(ruff/PLW0603)
+    with _async_engine_lock:
+        engine: AsyncEngine | None = _async_engine
+        _async_engine = None
+
+    if engine is not None:
+        await engine.dispose()
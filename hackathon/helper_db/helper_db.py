@@ -0,0 +1,170 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any, Callable
+
+from sqlalchemy import select
+from sqlalchemy.dialects import postgresql, sqlite
+
+from hackathon.models.project import Project
+from hackathon.otel import tracer
+
+if TYPE_CHECKING:
+    from sqlalchemy.orm import Session
+
+
+SPAN_KEY: str = "db"
+# How far below the watermark late commits are looked for. It only has to
+# cover the inserts that can be in flight at once.
+WATERMARK_RESCAN_WINDOW: int = 1_000
+# The id and the server side timestamp are filled in by the database.
+INSERT_COLUMNS: tuple[str, ...] = tuple(
+    column.name
+    for column in Project.__table__.columns  # trunk-ignore(pyright/reportAttributeAccessIssue)
+    if not column.primary_key and column.server_default is None and not column.computed
+)
+
+
+def _get_insert(
+    session: Session,
+) -> Callable[..., Any]:
+    dialect_name: str = session.get_bind().dialect.name
+    match dialect_name:
+        case "postgresql":
+            return postgresql.insert
+
+        case "sqlite":
+            return sqlite.insert
+
+        case _:
+            error_msg: str = f"Upserts are not supported on {dialect_name}"
+            raise ValueError(error_msg)
+
+
+def fetch_projects(
+    session: Session,
+    after_id: int | None,
+    limit: int | None,
+) -> list[Project]:
+    """Fetches the projects with an id greater than the watermark, in id order.
+
+    The id is the keyset, so fetching the next page is an index range scan on
+    the primary key no matter how many rows are already loaded.
+
+    Ids are handed out in allocation order, not commit order. A row can
+    commit after a row with a higher id, for example when the write queue
+    and a bulk import write concurrently. So the WATERMARK_RESCAN_WINDOW ids
+    at and below the watermark are fetched again as well. The caller skips
+    the rows it already has.
+    """
+    span_name: str = f"{SPAN_KEY}-fetch_projects"
+    with tracer.start_as_current_span(span_name) as span:
+        attributes: dict = {
+            "after_id": str(after_id),
+            "limit": str(limit),
+        }
+        span.add_event(
+            name="fetch_projects-started",
+            attributes=attributes,
+        )
+        statement = select(  # trunk-ignore(pyright/reportArgumentType)
+            Project,
+        ).order_by(
+            Project.id,  # trunk-ignore(pyright/reportArgumentType)
+        )
+        rescanned_projects: list[Project] = []
+        if after_id is not None:
+            rescanned_projects = list(
+                session.exec(  # trunk-ignore(pyright/reportCallIssue)
+                    statement=statement.where(  # trunk-ignore(pyright/reportArgumentType)
+                        Project.id > after_id - WATERMARK_RESCAN_WINDOW,  # trunk-ignore(pyright/reportOptionalOperand)
+                        Project.id <= after_id,  # trunk-ignore(pyright/reportOptionalOperand)
+                    ),
+                )
+                .scalars()
+                .all(),
+            )
+            statement = statement.where(
+                Project.id > after_id,  # trunk-ignore(pyright/reportOptionalOperand)
+            )
+
+        if limit is not None:
+            statement = statement.limit(limit)
+
+        projects: list[Project] = list(
+            session.exec(  # trunk-ignore(pyright/reportCallIssue)
+                statement=statement,  # trunk-ignore(pyright/reportArgumentType)
+            )
+            .scalars()
+            .all(),
+        )
+        span.add_event(
+            name="fetch_projects-completed",
+            attributes={
+                **attributes,
+                "project_count": len(projects),
+                "project_count-rescanned": len(rescanned_projects),
+            },
+        )
+        return rescanned_projects + projects
+
+
+def save_projects(
+    session: Session,
+    projects: list[Project],
+) -> list[Project]:
+    """Saves the projects whose repo_path is not in the table yet, in one commit.
+
+    The rows go out in one INSERT ... ON CONFLICT (repo_path) DO NOTHING, so
+    the unique index on repo_path does the dedup. The cost only depends on
+    the batch size, and concurrent saves of the same repo cannot race into
+    duplicates. The saved projects get their ids from RETURNING.
+
+    Returns:
+        list[Project]: The projects that were saved.
+    """
+    span_name: str = f"{SPAN_KEY}-save_projects"
+    with tracer.start_as_current_span(span_name) as span:
+        span.add_event(
+            name="save_projects-started",
+            attributes={
+                "project_count-to_commit": len(projects),
+            },
+        )
+        if not projects:
+            return []
+
+        projects_by_repo_path: dict[str, Project] = {
+            str(project.repo_path): project for project in projects
+        }
+        statement = (
+            _get_insert(session)(Project)
+            .values(
+                [
+                    {name: getattr(project, name) for name in INSERT_COLUMNS}
+                    for project in projects_by_repo_path.values()
+                ],
+            )
+            .on_conflict_do_nothing(
+                index_elements=["repo_path"],
+            )
+            .returning(
+                Project.id,
+                Project.repo_path,
+            )
+        )
+        saved_projects: list[Project] = []
+        for project_id, repo_path in session.execute(statement).all():
+            project: Project = projects_by_repo_path[str(repo_path)]
+            project.id = project_id
+            saved_projects.append(project)
+
+        session.commit()
+        span.add_event(
+            name="save_projects-completed",
+            attributes={
+                "project_count-already_saved": len(projects_by_repo_path)
+                - len(saved_projects),
+                "project_count-saved": len(saved_projects),
+            },
+        )
+        return saved_projects
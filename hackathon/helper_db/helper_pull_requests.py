@@ -0,0 +1,104 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+from sqlalchemy import select
+
+from hackathon.models.pull_request import PullRequest, PullRequestCheckpoint
+from hackathon.otel import tracer
+
+from .helper_db import _get_insert
+
+if TYPE_CHECKING:
+    from sqlalchemy.orm import Session
+
+
+SPAN_KEY: str = "db-pull_requests"
+PULL_REQUEST_KEY_COLUMNS: tuple[str, ...] = ("repo_path", "number")
+# The id and the server side timestamp are filled in by the database.
+PULL_REQUEST_INSERT_COLUMNS: tuple[str, ...] = tuple(
+    column.name
+    for column in PullRequest.__table__.columns  # trunk-ignore(pyright/reportAttributeAccessIssue)
+    if not column.primary_key and column.server_default is None
+)
+CHECKPOINT_INSERT_COLUMNS: tuple[str, ...] = tuple(
+    column.name
+    for column in PullRequestCheckpoint.__table__.columns  # trunk-ignore(pyright/reportAttributeAccessIssue)
+    if not column.primary_key and column.server_default is None
+)
+
+
+def fetch_pull_request_checkpoint(
+    session: Session,
+    repo_path: str,
+) -> PullRequestCheckpoint | None:
+    return session.exec(  # trunk-ignore(pyright/reportCallIssue)
+        statement=select(  # trunk-ignore(pyright/reportArgumentType)
+            PullRequestCheckpoint,
+        ).where(
+            PullRequestCheckpoint.repo_path == repo_path,
+        ),
+    ).scalar_one_or_none()
+
+
+def save_pull_requests(
+    session: Session,
+    pull_requests: list[PullRequest],
+    checkpoint: PullRequestCheckpoint,
+) -> int:
+    """Upserts one page of pull requests and the checkpoint after it, in one commit.
+
+    Pull requests are keyed by (repo_path, number), so a pull request seen
+    again after it was updated overwrites its row, and pages seen twice after
+    a resume are harmless. Since the checkpoint commits with the page, it
+    never points past a pull request that was not stored.
+
+    Returns:
+        int: The number of pull requests upserted.
+    """
+    span_name: str = f"{SPAN_KEY}-save_pull_requests"
+    with tracer.start_as_current_span(span_name) as span:
+        insert = _get_insert(session)
+        rows: dict[int, dict] = {
+            pull_request.number: {
+                name: getattr(pull_request, name)
+                for name in PULL_REQUEST_INSERT_COLUMNS
+            }
+            for pull_request in pull_requests
+        }
+        if rows:
+            statement = insert(PullRequest).values(list(rows.values()))
+            session.execute(
+                statement.on_conflict_do_update(
+                    index_elements=list(PULL_REQUEST_KEY_COLUMNS),
+                    set_={
+                        name: statement.excluded[name]
+                        for name in PULL_REQUEST_INSERT_COLUMNS
+                        if name not in PULL_REQUEST_KEY_COLUMNS
+                    },
+                ),
+            )
+
+        statement = insert(PullRequestCheckpoint).values(
+            {name: getattr(checkpoint, name) for name in CHECKPOINT_INSERT_COLUMNS},
+        )
+        session.execute(
+            statement.on_conflict_do_update(
+                index_elements=["repo_path"],
+                set_={
+                    name: statement.excluded[name]
+                    for name in CHECKPOINT_INSERT_COLUMNS
+                    if name != "repo_path"
+                },
+            ),
+        )
+        session.commit()
+        span.add_event(
+            name="save_pull_requests-completed",
+            attributes={
+                "repo_path": str(checkpoint.repo_path),
+                "pull_request_count": len(rows),
+                "run_offset": str(checkpoint.run_offset),
+            },
+        )
+        return len(rows)
@@ -0,0 +1,117 @@
+from __future__ import annotations
+
+import datetime  # trunk-ignore(ruff/TCH003)
+from typing import TYPE_CHECKING, Any
+
+from sqlalchemy import or_, select, update
+
+from hackathon.models.project import Project
+from hackathon.otel import tracer
+
+if TYPE_CHECKING:
+    from sqlalchemy.orm import Session
+
+
+SPAN_KEY: str = "db-refresh"
+
+
+def fetch_projects_due_for_refresh(  # trunk-ignore(ruff/PLR0913)
+    session: Session,
+    now: datetime.datetime,
+    hot_stars: int,
+    hot_interval: datetime.timedelta,
+    cold_interval: datetime.timedelta,
+    limit: int,
+) -> list[Project]:
+    """Fetches the projects that are due for a refresh, stalest first.
+
+    A project is due when it was never refreshed, when it was last refreshed
+    longer than cold_interval ago, or, for hot projects with at least
+    hot_stars stars, longer than hot_interval ago. Ties go to the hotter
+    project. The refreshed_at index keeps this a range scan.
+    """
+    span_name: str = f"{SPAN_KEY}-fetch_projects_due_for_refresh"
+    with tracer.start_as_current_span(span_name) as span:
+        refreshed_at = Project.refreshed_at
+        statement = (
+            select(  # trunk-ignore(pyright/reportArgumentType)
+                Project,
+            )
+            .where(
+                or_(
+                    refreshed_at.is_(None),  # trunk-ignore(pyright/reportOptionalMemberAccess)
+                    refreshed_at < now - cold_interval,  # trunk-ignore(pyright/reportOptionalOperand)
+                    (Project.stars >= hot_stars)
+                    & (refreshed_at < now - hot_interval),  # trunk-ignore(pyright/reportOptionalOperand)
+                ),
+            )
+            .order_by(
+                refreshed_at.asc().nulls_first(),  # trunk-ignore(pyright/reportOptionalMemberAccess)
+                Project.stars.desc(),  # trunk-ignore(pyright/reportAttributeAccessIssue)
+            )
+            .limit(limit)
+        )
+        projects: list[Project] = list(
+            session.exec(  # trunk-ignore(pyright/reportCallIssue)
+                statement=statement,  # trunk-ignore(pyright/reportArgumentType)
+            )
+            .scalars()
+            .all(),
+        )
+        span.add_event(
+            name="fetch_projects_due_for_refresh-completed",
+            attributes={
+                "limit": limit,
+                "project_count": len(projects),
+            },
+        )
+        return projects
+
+
+def save_project_changes(
+    session: Session,
+    changes: dict[int, dict[str, Any]],
+    refreshed_at: datetime.datetime,
+) -> int:
+    """Writes the changed columns of each project id and stamps refreshed_at.
+
+    Projects without changes are passed with an empty dict, so only their
+    refreshed_at is written. Everything goes out as one executemany per set
+    of changed columns, in one commit.
+
+    Returns:
+        int: The number of projects with changed columns.
+    """
+    span_name: str = f"{SPAN_KEY}-save_project_changes"
+    with tracer.start_as_current_span(span_name) as span:
+        if not changes:
+            return 0
+
+        rows_by_columns: dict[tuple[str, ...], list[dict[str, Any]]] = {}
+        for project_id, project_changes in changes.items():
+            rows_by_columns.setdefault(tuple(sorted(project_changes)), []).append(
+                {
+                    "id": project_id,
+                    "refreshed_at": refreshed_at,
+                    **project_changes,
+                },
+            )
+
+        for rows in rows_by_columns.values():
+            session.execute(
+                update(Project),
+                rows,
+            )
+
+        session.commit()
+        changed_count: int = sum(
+            len(rows) for columns, rows in rows_by_columns.items() if columns
+        )
+        span.add_event(
+            name="save_project_changes-completed",
+            attributes={
+                "project_count-refreshed": len(changes),
+                "project_count-changed": changed_count,
+            },
+        )
+        return changed_count
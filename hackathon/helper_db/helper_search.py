@@ -0,0 +1,76 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+from sqlalchemy import column, func, select
+from sqlalchemy.dialects import postgresql
+
+from hackathon.models.project import Project
+from hackathon.otel import tracer
+
+if TYPE_CHECKING:
+    from sqlalchemy.orm import Session
+    from sqlalchemy.sql.elements import ColumnElement
+
+
+SPAN_KEY: str = "db-search"
+TEXT_SEARCH_CONFIG: str = "english"
+
+# Generated by the b7e2d41c9a05 migration, and since e5f83b1d7a94 also from
+# repo_path. It is kept off the model on purpose, since Postgres computes it
+# from repo_path, description and language on every write.
+search_vector: ColumnElement = column(
+    "search_vector",
+    type_=postgresql.TSVECTOR(),
+)
+
+
+def supports_keyword_search(
+    session: Session,
+) -> bool:
+    """Whether the database has the search_vector column, i.e. is Postgres."""
+    return session.get_bind().dialect.name == "postgresql"
+
+
+def search_projects_by_keywords(
+    session: Session,
+    query: str,
+    limit: int,
+) -> list[Project]:
+    """Full text search over repo_path, description and language, best match first.
+
+    The query accepts web search syntax ("quoted phrases", -excluded, or) and
+    is answered from the GIN index on the generated search_vector column.
+    """
+    span_name: str = f"{SPAN_KEY}-search_projects_by_keywords"
+    with tracer.start_as_current_span(span_name) as span:
+        ts_query = func.websearch_to_tsquery(TEXT_SEARCH_CONFIG, query)
+        statement = (
+            select(  # trunk-ignore(pyright/reportArgumentType)
+                Project,
+            )
+            .where(
+                search_vector.op("@@")(ts_query),
+            )
+            .order_by(
+                func.ts_rank(search_vector, ts_query).desc(),
+                Project.id,  # trunk-ignore(pyright/reportArgumentType)
+            )
+            .limit(limit)
+        )
+        projects: list[Project] = list(
+            session.exec(  # trunk-ignore(pyright/reportCallIssue)
+                statement=statement,  # trunk-ignore(pyright/reportArgumentType)
+            )
+            .scalars()
+            .all(),
+        )
+        span.add_event(
+            name="search_projects_by_keywords-completed",
+            attributes={
+                "query": query,
+                "limit": limit,
+                "project_count": len(projects),
+            },
+        )
+        return projects
@@ -0,0 +1,239 @@
+from __future__ import annotations
+
+import dataclasses
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from typing import Callable, Generic, TypeVar
+
+from sqlalchemy.exc import InterfaceError, OperationalError
+
+from hackathon.otel import tracer
+
+SPAN_KEY: str = "db-write_behind"
+DEFAULT_MAX_BATCH_SIZE: int = 100
+DEFAULT_MAX_DELAY_SECONDS: float = 0.5
+DEFAULT_MAX_PENDING: int = 10_000
+DEFAULT_MAX_RETRIES: int = 3
+DEFAULT_RETRY_BACKOFF_SECONDS: float = 0.5
+TRANSIENT_ERRORS: tuple[type[Exception], ...] = (OperationalError, InterfaceError)
+
+T = TypeVar("T")
+
+_STOP: object = object()
+
+
+@dataclasses.dataclass(eq=False)
+class WriteBehindQueue(Generic[T]):
+    """Buffers writes in process and commits them in batches on a worker thread.
+
+    A batch is flushed once it holds max_batch_size items or max_delay_seconds
+    after its first item arrived, whichever comes first, with a single call
+    to flush. Flushes that fail with a transient database error are retried
+    with exponential backoff. A batch that fails for any other reason is
+    flushed again one item at a time, so one bad item does not take its
+    neighbours down with it. submit blocks, or raises queue.Full when it
+    must not block, once max_pending items are waiting, so producers slow
+    down instead of growing the buffer without bound. close drains
+    everything that was submitted before it, and later submits raise.
+    """
+
+    flush: Callable[[list[T]], object]
+    name: str
+    max_batch_size: int = DEFAULT_MAX_BATCH_SIZE
+    max_delay_seconds: float = DEFAULT_MAX_DELAY_SECONDS
+    max_pending: int = DEFAULT_MAX_PENDING
+    max_retries: int = DEFAULT_MAX_RETRIES
+    retry_backoff_seconds: float = DEFAULT_RETRY_BACKOFF_SECONDS
+    _queue: queue.Queue | None = dataclasses.field(default=None, repr=False)
+    _worker: threading.Thread | None = dataclasses.field(default=None, repr=False)
+    _closed: bool = dataclasses.field(default=False, repr=False)
+    _lock: threading.Lock = dataclasses.field(
+        default_factory=threading.Lock,
+        repr=False,
+    )
+
+    def start(
+        self: WriteBehindQueue,
+    ) -> None:
+        """Starts the worker, and reopens the queue if it was closed."""
+        with self._lock:
+            self._closed = False
+            self._start()
+
+    def _start(
+        self: WriteBehindQueue,
+    ) -> queue.Queue:
+        """Starts the worker if it is not running. The caller holds the lock."""
+        if self._worker is None or self._queue is None:
+            self._queue = queue.Queue(
+                maxsize=self.max_pending,
+            )
+            self._worker = threading.Thread(
+                target=self._run,
+                args=(self._queue,),
+                name=f"write_behind-{self.name}",
+                daemon=True,
+            )
+            self._worker.start()
+
+        return self._queue
+
+    def submit(
+        self: WriteBehindQueue,
+        item: T,
+        block: bool = True,  # trunk-ignore(ruff/FBT001,ruff/FBT002)
+        timeout: float | None = None,
+    ) -> Future[None]:
+        """Queues the item and returns a future that resolves once it is committed.
+
+        The put happens under the lock close takes, so an item is either
+        queued ahead of the stop marker and flushed, or rejected.
+
+        Raises:
+            queue.Full: When the queue was full and block is False, or
+                stayed full for timeout seconds.
+            RuntimeError: When the queue was closed.
+        """
+        future: Future[None] = Future()
+        with self._lock:
+            if self._closed:
+                error_msg: str = f"Write queue {self.name} is closed"
+                raise RuntimeError(error_msg)
+
+            self._start().put(
+                (item, future),
+                block=block,
+                timeout=timeout,
+            )
+
+        return future
+
+    def close(
+        self: WriteBehindQueue,
+        timeout: float | None = None,
+    ) -> None:
+        """Flushes everything submitted so far and stops the worker."""
+        with self._lock:
+            worker: threading.Thread | None = self._worker
+            pending: queue.Queue | None = self._queue
+            self._worker = None
+            self._queue = None
+            self._closed = True
+
+        if worker is None or pending is None:
+            return
+
+        pending.put(_STOP)
+        worker.join(timeout)
+
+    def _run(
+        self: WriteBehindQueue,
+        pending: queue.Queue,
+    ) -> None:
+        stopping: bool = False
+        while not stopping:
+            entry: tuple[T, Future[None]] | object = pending.get()
+            if entry is _STOP:
+                return
+
+            batch: list[tuple[T, Future[None]]] = [entry]  # trunk-ignore(pyright/reportAssignmentType)
+            deadline: float = time.monotonic() + self.max_delay_seconds
+            while len(batch) < self.max_batch_size:
+                try:
+                    entry = pending.get(
+                        timeout=max(0.0, deadline - time.monotonic()),
+                    )
+
+                except queue.Empty:
+                    break
+
+                if entry is _STOP:
+                    stopping = True
+                    break
+
+                batch.append(entry)  # trunk-ignore(pyright/reportArgumentType)
+
+            self._flush_batch(batch)
+
+    def _flush_batch(
+        self: WriteBehindQueue,
+        batch: list[tuple[T, Future[None]]],
+    ) -> None:
+        span_name: str = f"{SPAN_KEY}-flush"
+        with tracer.start_as_current_span(span_name) as span:
+            items: list[T] = [item for item, _ in batch]
+            for attempt in range(self.max_retries + 1):
+                try:
+                    self.flush(items)
+
+                except TRANSIENT_ERRORS as e:
+                    span.record_exception(e)
+                    if attempt < self.max_retries:
+                        time.sleep(self.retry_backoff_seconds * 2**attempt)
+                        continue
+
+                    for _, future in batch:
+                        future.set_exception(e)
+
+                    return
+
+                except Exception as e:  # trunk-ignore(ruff/BLE001)
+                    span.record_exception(e)
+                    if len(batch) > 1:
+                        self._flush_one_by_one(batch)
+
+                    else:
+                        for _, future in batch:
+                            future.set_exception(e)
+
+                    return
+
+                span.add_event(
+                    name="flush-completed",
+                    attributes={
+                        "name": self.name,
+                        "item_count": len(items),
+                        "attempt_count": attempt + 1,
+                    },
+                )
+                for _, future in batch:
+                    future.set_result(None)
+
+                return
+
+    def _flush_one_by_one(
+        self: WriteBehindQueue,
+        batch: list[tuple[T, Future[None]]],
+    ) -> None:
+        """Flushes every item of a failed batch on its own to find the bad ones."""
+        span_name: str = f"{SPAN_KEY}-flush_one_by_one"
+        with tracer.start_as_current_span(span_name) as span:
+            failed_count: int = 0
+            for item, future in batch:
+                try:
+                    self.flush([item])
+
+                except Exception as e:  # trunk-ignore(ruff/BLE001)
+                    failed_count += 1
+                    span.record_exception(
+                        exception=e,
+                        attributes={
+                            "name": self.name,
+                            "item": repr(item),
+                        },
+                    )
+                    future.set_exception(e)
+                    continue
+
+                future.set_result(None)
+
+            span.add_event(
+                name="flush_one_by_one-completed",
+                attributes={
+                    "name": self.name,
+                    "item_count": len(batch),
+                    "item_count-failed": failed_count,
+                },
+            )
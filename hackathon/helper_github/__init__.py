@@ -1,11 +1,43 @@
+from .helper_async import (
+    GithubExecutor,
+    github_executor,
+)
+from .helper_conditional import (
+    get_repo_conditionally,
+)
 from .helper_github import (
     check_client,
     extract_repo_path_from_url,
+    get_requester,
     set_up_client_from_tokens,
 )
+from .helper_graphql import (
+    GRAPHQL_BATCH_SIZE,
+    build_repositories_query,
+    fetch_repositories,
+)
+from .helper_token_pool import (
+    GithubTokenPool,
+    TokenBudget,
+    is_authenticated,
+    is_rate_limited,
+    set_up_pool_from_tokens,
+)
 
 __all__ = [
+    "GRAPHQL_BATCH_SIZE",
+    "GithubExecutor",
+    "GithubTokenPool",
+    "TokenBudget",
+    "build_repositories_query",
     "check_client",
     "extract_repo_path_from_url",
+    "fetch_repositories",
+    "get_repo_conditionally",
+    "get_requester",
+    "github_executor",
+    "is_authenticated",
+    "is_rate_limited",
     "set_up_client_from_tokens",
+    "set_up_pool_from_tokens",
 ]
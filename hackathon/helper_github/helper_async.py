@@ -0,0 +1,148 @@
+from __future__ import annotations
+
+import asyncio
+import contextvars
+import dataclasses
+import functools
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING, Callable, TypeVar
+
+from hackathon.otel import tracer
+
+from .helper_token_pool import GithubTokenPool, get_token_key
+
+if TYPE_CHECKING:
+    from github import Github
+
+SPAN_KEY: str = "github-async"
+DEFAULT_MAX_WORKERS: int = 32
+DEFAULT_PER_TOKEN_CONCURRENCY: int = 8
+
+T = TypeVar("T")
+
+
+@dataclasses.dataclass(eq=False)
+class GithubExecutor:
+    """Runs blocking PyGithub calls on a bounded thread pool.
+
+    Every call holds a semaphore of the token it is made with, so a burst of
+    calls on one token cannot exhaust its rate limit or the whole pool, and
+    calls on other tokens keep flowing. The OpenTelemetry context is copied
+    into the worker thread so spans opened there keep their parent.
+    """
+
+    max_workers: int = DEFAULT_MAX_WORKERS
+    per_token_concurrency: int = DEFAULT_PER_TOKEN_CONCURRENCY
+    _executor: ThreadPoolExecutor | None = dataclasses.field(
+        default=None,
+        repr=False,
+    )
+    _semaphores: dict[str, asyncio.Semaphore] = dataclasses.field(
+        default_factory=dict,
+        repr=False,
+    )
+    _lock: threading.Lock = dataclasses.field(
+        default_factory=threading.Lock,
+        repr=False,
+    )
+
+    def _get_executor(
+        self: GithubExecutor,
+    ) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.max_workers,
+                    thread_name_prefix="github",
+                )
+
+            return self._executor
+
+    def _get_semaphore(
+        self: GithubExecutor,
+        client: Github | GithubTokenPool | None,
+    ) -> tuple[str, asyncio.Semaphore]:
+        """A pool gets one semaphore sized for all of its tokens."""
+        token_key: str = get_token_key(client)
+        with self._lock:
+            semaphore: asyncio.Semaphore | None = self._semaphores.get(token_key)
+            if semaphore is None:
+                semaphore = asyncio.Semaphore(
+                    self.per_token_concurrency * len(client)
+                    if isinstance(client, GithubTokenPool)
+                    else self.per_token_concurrency,
+                )
+                self._semaphores[token_key] = semaphore
+
+            return token_key, semaphore
+
+    async def run(
+        self: GithubExecutor,
+        client: Github | GithubTokenPool | None,
+        call: Callable[..., T],
+        *args: object,
+    ) -> T:
+        token_key, semaphore = self._get_semaphore(client)
+        span_name: str = f"{SPAN_KEY}-run"
+        with tracer.start_as_current_span(span_name) as span:
+            span.add_event(
+                name="run-queued",
+                attributes={
+                    "call": getattr(call, "__name__", str(call)),
+                    "token_key": token_key,
+                },
+            )
+            async with semaphore:
+                context: contextvars.Context = contextvars.copy_context()
+                return await asyncio.get_running_loop().run_in_executor(
+                    self._get_executor(),
+                    functools.partial(context.run, call, *args),
+                )
+
+    async def run_with_client(
+        self: GithubExecutor,
+        client: Github | GithubTokenPool | None,
+        call: Callable[..., T],
+        **kwargs: object,
+    ) -> T:
+        """Runs call(client=..., **kwargs) on the pool.
+
+        With a token pool, the client is picked by the pool in the worker
+        thread, and rate limited calls are retried on another token.
+        """
+        if isinstance(client, GithubTokenPool):
+            return await self.run(
+                client,
+                client.call,
+                lambda pooled_client: call(
+                    client=pooled_client,
+                    **kwargs,
+                ),
+            )
+
+        return await self.run(
+            client,
+            functools.partial(
+                call,
+                client=client,
+                **kwargs,
+            ),
+        )
+
+    def shutdown(
+        self: GithubExecutor,
+    ) -> None:
+        with self._lock:
+            executor: ThreadPoolExecutor | None = self._executor
+            self._executor = None
+            self._semaphores = {}
+
+        if executor is not None:
+            executor.shutdown(
+                wait=False,
+                cancel_futures=True,
+            )
+
+
+github_executor: GithubExecutor = GithubExecutor()
@@ -0,0 +1,102 @@
+from __future__ import annotations
+
+import json
+from http import HTTPStatus
+from typing import TYPE_CHECKING, Any
+from urllib.parse import quote
+
+from github.Repository import Repository
+
+from hackathon.otel import meter, tracer
+
+from .helper_github import get_requester
+
+if TYPE_CHECKING:
+    from github import Github
+
+    from hackathon.helper_cache import SqliteCache
+
+SPAN_KEY: str = "github-conditional"
+
+not_modified_counter = meter.create_counter(
+    name="github.not_modified",
+    description="Number of GitHub requests answered with 304 from the local cache",
+)
+
+
+def _get_cache_key(
+    repo_path: str,
+) -> str:
+    return repo_path.lower()
+
+
+def get_repo_conditionally(
+    repo_path: str,
+    client: Github,
+    cache: SqliteCache,
+) -> Repository:
+    """client.get_repo, revalidated against the last response of the same repo.
+
+    The ETag and Last-Modified of every 200 are stored next to the raw body.
+    The next request sends them back as If-None-Match and If-Modified-Since,
+    and a 304, which GitHub does not count against the rate limit, is served
+    from the stored body.
+
+    Raises:
+        GithubException: When GitHub answers with an error status.
+    """
+    span_name: str = f"{SPAN_KEY}-get_repo"
+    with tracer.start_as_current_span(span_name) as span:
+        requester = get_requester(client)
+        key: str = _get_cache_key(repo_path)
+        cached_value: str | None = cache.get(key)
+        cached: dict[str, Any] | None = (
+            None if cached_value is None else json.loads(cached_value)
+        )
+        headers: dict[str, str] = {}
+        if cached is not None:
+            if cached.get("etag"):
+                headers["If-None-Match"] = cached["etag"]
+
+            if cached.get("last_modified"):
+                headers["If-Modified-Since"] = cached["last_modified"]
+
+        status, response_headers, output = requester.requestJson(
+            "GET",
+            f"/repos/{quote(repo_path)}",
+            headers=headers,
+        )
+        span.add_event(
+            name="get_repo-responded",
+            attributes={
+                "repo_path": repo_path,
+                "status": status,
+                "revalidated": cached is not None,
+            },
+        )
+        if status == HTTPStatus.NOT_MODIFIED and cached is not None:
+            not_modified_counter.add(1)
+            return client.create_from_raw_data(
+                Repository,
+                cached["data"],
+            )
+
+        data: Any = json.loads(output) if output else None
+        if status >= HTTPStatus.BAD_REQUEST:
+            raise requester.createException(status, response_headers, data)
+
+        cache.set(
+            key=key,
+            value=json.dumps(
+                {
+                    "etag": response_headers.get("etag"),
+                    "last_modified": response_headers.get("last-modified"),
+                    "data": data,
+                },
+            ),
+        )
+        return client.create_from_raw_data(
+            Repository,
+            data,
+            response_headers,
+        )
@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import re
+from typing import TYPE_CHECKING
 
 from github import Github
 
@@ -8,6 +9,9 @@ from hackathon import helper_utils
 from hackathon.helper_logging import Severity, log
 from hackathon.otel import tracer
 
+if TYPE_CHECKING:
+    from github.Requester import Requester
+
 GITHUB_REPO_PARSER_REGEX: re.Pattern = re.compile(
     r"^https://github\.com/(?P<owner>[^/]+)/(?P<repo>[^/]+)$",
 )
@@ -115,3 +119,17 @@ def check_client(
         return client
 
 
+def get_requester(
+    client: Github,
+) -> Requester:
+    """The Requester behind the client, for the calls PyGithub has no method for.
+
+    PyGithub exposes it as Github.requester from 2.5 on. requirements.txt
+    pins 2.4.0, which only has the name mangled private attribute, so this
+    is the one place that reaches into it.
+    """
+    requester: Requester | None = getattr(client, "requester", None)
+    if requester is not None:
+        return requester
+
+    return client._Github__requester  # trunk-ignore(pyright/reportAttributeAccessIssue)
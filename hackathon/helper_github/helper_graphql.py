@@ -0,0 +1,132 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any, Iterator
+
+from hackathon.otel import tracer
+
+from .helper_github import get_requester
+
+if TYPE_CHECKING:
+    from github import Github
+
+SPAN_KEY: str = "github-graphql"
+GRAPHQL_BATCH_SIZE: int = 100
+REPOSITORY_FRAGMENT: str = """
+fragment RepositoryFields on Repository {
+  nameWithOwner
+  stargazerCount
+  primaryLanguage {
+    name
+  }
+  createdAt
+  homepageUrl
+  url
+  description
+}
+"""
+
+
+def _split_repo_path(
+    repo_path: str,
+) -> tuple[str, str] | None:
+    owner, separator, name = repo_path.partition("/")
+    if not separator or not owner or not name or "/" in name:
+        return None
+
+    return owner, name
+
+
+def build_repositories_query(
+    repo_paths: list[str],
+) -> tuple[str, dict[str, str]]:
+    """One query that resolves every repo under its own alias, repo0 to repoN.
+
+    Owners and names are passed as variables, so repo paths never have to be
+    escaped into the query text.
+    """
+    parameters: list[str] = []
+    selections: list[str] = []
+    variables: dict[str, str] = {}
+    for index, repo_path in enumerate(repo_paths):
+        owner, name = _split_repo_path(repo_path)  # trunk-ignore(pyright/reportGeneralTypeIssues)
+        variables[f"owner{index}"] = owner
+        variables[f"name{index}"] = name
+        parameters.append(f"$owner{index}: String!, $name{index}: String!")
+        selections.append(
+            f"  repo{index}: repository(owner: $owner{index}, name: $name{index}) "
+            "{ ...RepositoryFields }",
+        )
+
+    query: str = (
+        f"query({', '.join(parameters)}) {{\n"
+        + "\n".join(selections)
+        + "\n  rateLimit { cost remaining }\n}\n"
+        + REPOSITORY_FRAGMENT
+    )
+    return query, variables
+
+
+def _batched(
+    repo_paths: list[str],
+    batch_size: int,
+) -> Iterator[list[str]]:
+    for start in range(0, len(repo_paths), batch_size):
+        yield repo_paths[start : start + batch_size]
+
+
+def fetch_repositories(
+    repo_paths: list[str],
+    client: Github,
+    batch_size: int = GRAPHQL_BATCH_SIZE,
+) -> dict[str, dict[str, Any] | None]:
+    """Fetches the fields Project needs for many repos, batch_size per request.
+
+    The result maps every requested repo path to its repository node, or to
+    None when the repo does not exist, is not visible to the client or is not
+    an owner/name path.
+
+    Raises:
+        GithubException: When a request fails as a whole, e.g. without a token.
+    """
+    span_name: str = f"{SPAN_KEY}-fetch_repositories"
+    with tracer.start_as_current_span(span_name) as span:
+        requester = get_requester(client)
+        repositories: dict[str, dict[str, Any] | None] = {
+            repo_path: None for repo_path in repo_paths
+        }
+        valid_repo_paths: list[str] = [
+            repo_path
+            for repo_path in repositories
+            if _split_repo_path(repo_path) is not None
+        ]
+        for batch in _batched(valid_repo_paths, batch_size):
+            query, variables = build_repositories_query(
+                repo_paths=batch,
+            )
+            response_headers, output = requester.requestJsonAndCheck(
+                "POST",
+                requester.graphql_url,
+                input={
+                    "query": query,
+                    "variables": variables,
+                },
+            )
+            data: dict[str, Any] | None = output.get("data")
+            if data is None:
+                raise requester.createException(400, response_headers, output)
+
+            for index, repo_path in enumerate(batch):
+                repositories[repo_path] = data.get(f"repo{index}")
+
+            rate_limit: dict[str, int] = data.get("rateLimit") or {}
+            span.add_event(
+                name="batch-fetched",
+                attributes={
+                    "repo_count": len(batch),
+                    "error_count": len(output.get("errors") or []),
+                    "rate_limit-cost": rate_limit.get("cost", 0),
+                    "rate_limit-remaining": rate_limit.get("remaining", 0),
+                },
+            )
+
+        return repositories
@@ -0,0 +1,417 @@
+from __future__ import annotations
+
+import dataclasses
+import hashlib
+import threading
+import time
+import weakref
+from http import HTTPStatus
+from typing import TYPE_CHECKING, Callable, Iterable, Iterator, NamedTuple, TypeVar
+
+from github import Auth, Github
+from github.GithubException import GithubException, RateLimitExceededException
+from opentelemetry.metrics import CallbackOptions, Observation
+from urllib3.util import Retry
+
+from hackathon import helper_utils
+from hackathon.otel import meter, tracer
+
+from .helper_github import get_requester
+
+if TYPE_CHECKING:
+    from github.Requester import Requester
+
+SPAN_KEY: str = "github-token_pool"
+TOKEN_SEPARATOR: str = ","
+ANONYMOUS_TOKEN_KEY: str = "anonymous"
+POOL_TOKEN_KEY_PREFIX: str = "pool-"
+DEFAULT_MAX_ATTEMPTS: int = 4
+# GitHub asks clients to wait at least a minute after a secondary rate limit
+# that comes without a retry-after header.
+DEFAULT_BACK_OFF_SECONDS: float = 60.0
+MAX_BACK_OFF_SECONDS: float = 15 * 60.0
+# Requests other callers may still have in flight on the token.
+DEFAULT_REMAINING_RESERVE: int = 10
+# The hourly limit of a personal access token, assumed until a response says otherwise.
+DEFAULT_RATE_LIMIT: int = 5_000
+# The largest page GitHub serves, so listing endpoints take the fewest requests.
+DEFAULT_PER_PAGE: int = 100
+SERVER_ERROR_RETRY: Retry = Retry(
+    total=3,
+    backoff_factor=1.0,
+    status_forcelist=(
+        HTTPStatus.INTERNAL_SERVER_ERROR,
+        HTTPStatus.BAD_GATEWAY,
+        HTTPStatus.SERVICE_UNAVAILABLE,
+        HTTPStatus.GATEWAY_TIMEOUT,
+    ),
+    allowed_methods=None,
+)
+
+T = TypeVar("T")
+
+_token_pools: weakref.WeakSet[GithubTokenPool] = weakref.WeakSet()
+
+back_off_counter = meter.create_counter(
+    name="github.rate_limit.back_offs",
+    description="Number of times a GitHub token was rate limited and set aside",
+)
+
+
+def get_token_key(
+    client: Github | GithubTokenPool | None,
+) -> str:
+    """Identifies the credentials of the client without keeping the token itself."""
+    if client is None:
+        return ANONYMOUS_TOKEN_KEY
+
+    if isinstance(client, GithubTokenPool):
+        return f"{POOL_TOKEN_KEY_PREFIX}{id(client):x}"
+
+    auth: object | None = get_requester(client).auth
+    token: str | None = getattr(auth, "token", None)
+    if token is None:
+        return ANONYMOUS_TOKEN_KEY
+
+    return hashlib.sha256(token.encode()).hexdigest()[:16]
+
+
+def is_authenticated(
+    client: Github | GithubTokenPool | None,
+) -> bool:
+    """Whether the client sends a token, which e.g. the GraphQL API requires."""
+    return get_token_key(client) != ANONYMOUS_TOKEN_KEY
+
+
+class TokenBudget(NamedTuple):
+
+    token_key: str
+    remaining: int | None
+    limit: int | None
+    reset_at: float
+    blocked_until: float
+    in_flight: int
+
+
+@dataclasses.dataclass(eq=False)
+class _PooledClient:
+    client: Github
+    token_key: str
+    blocked_until: float = 0.0
+    back_off_count: int = 0
+    in_flight: int = 0
+
+    @property
+    def requester(
+        self: _PooledClient,
+    ) -> Requester:
+        return get_requester(self.client)
+
+    @property
+    def remaining(
+        self: _PooledClient,
+    ) -> int | None:
+        remaining, _ = self.requester.rate_limiting
+        return None if remaining < 0 else remaining
+
+    @property
+    def limit(
+        self: _PooledClient,
+    ) -> int | None:
+        _, limit = self.requester.rate_limiting
+        return None if limit < 0 else limit
+
+    @property
+    def reset_at(
+        self: _PooledClient,
+    ) -> float:
+        return float(self.requester.rate_limiting_resettime)
+
+    def get_available_at(
+        self: _PooledClient,
+        reserve: int,
+    ) -> float:
+        """The time from which the token may be used, 0 when it has budget now."""
+        remaining: int | None = self.remaining
+        if remaining is not None and remaining - self.in_flight <= reserve:
+            return max(self.blocked_until, self.reset_at)
+
+        return self.blocked_until
+
+    def get_score(
+        self: _PooledClient,
+    ) -> int:
+        remaining: int | None = self.remaining
+        if remaining is None:
+            remaining = DEFAULT_RATE_LIMIT
+
+        return remaining - self.in_flight
+
+
+def _get_back_off_seconds(
+    exception: GithubException,
+    now: float,
+    back_off_count: int,
+) -> float:
+    headers: dict[str, str] = {
+        key.lower(): value for key, value in (exception.headers or {}).items()
+    }
+    if (retry_after := headers.get("retry-after")) is not None:
+        return float(retry_after)
+
+    if headers.get("x-ratelimit-remaining") == "0" and (
+        reset := headers.get("x-ratelimit-reset")
+    ) is not None:
+        return max(0.0, float(reset) - now)
+
+    return min(
+        MAX_BACK_OFF_SECONDS,
+        DEFAULT_BACK_OFF_SECONDS * 2**back_off_count,
+    )
+
+
+def is_rate_limited(
+    exception: GithubException,
+) -> bool:
+    return isinstance(exception, RateLimitExceededException) or (
+        exception.status == HTTPStatus.TOO_MANY_REQUESTS
+    )
+
+
+@dataclasses.dataclass(eq=False)
+class GithubTokenPool:
+    """Spreads GitHub calls across several tokens by their remaining budget.
+
+    Every call runs on the token with the most requests left, according to
+    the x-ratelimit headers of its last response. A token that is down to
+    remaining_reserve requests is set aside until its reset. A call that is
+    rate limited, with a 403 or a 429, sets its token aside until the reset
+    or retry-after time of the response and is retried on another token.
+    When every token is set aside, calls wait for the first one to free up.
+    """
+
+    clients: list[Github]
+    max_attempts: int = DEFAULT_MAX_ATTEMPTS
+    remaining_reserve: int = DEFAULT_REMAINING_RESERVE
+    _pooled_clients: list[_PooledClient] = dataclasses.field(
+        default_factory=list,
+        repr=False,
+    )
+    _condition: threading.Condition = dataclasses.field(
+        default_factory=threading.Condition,
+        repr=False,
+    )
+
+    def __post_init__(
+        self: GithubTokenPool,
+    ) -> None:
+        self._pooled_clients = [
+            _PooledClient(
+                client=client,
+                token_key=get_token_key(client),
+            )
+            for client in self.clients
+        ]
+        _token_pools.add(self)
+
+    def __len__(
+        self: GithubTokenPool,
+    ) -> int:
+        return len(self._pooled_clients)
+
+    @classmethod
+    def from_tokens(
+        cls: type[GithubTokenPool],
+        tokens: Iterable[str],
+        **kwargs: object,
+    ) -> GithubTokenPool:
+        """The pooled clients leave rate limits to the pool and retry 5xx only."""
+        return cls(
+            clients=[
+                Github(
+                    auth=Auth.Token(token),
+                    **{
+                        "retry": SERVER_ERROR_RETRY,
+                        "per_page": DEFAULT_PER_PAGE,
+                        **kwargs,
+                    },  # trunk-ignore(pyright/reportArgumentType)
+                )
+                for token in dict.fromkeys(tokens)
+            ],
+        )
+
+    @property
+    def budgets(
+        self: GithubTokenPool,
+    ) -> list[TokenBudget]:
+        with self._condition:
+            return [
+                TokenBudget(
+                    token_key=pooled_client.token_key,
+                    remaining=pooled_client.remaining,
+                    limit=pooled_client.limit,
+                    reset_at=pooled_client.reset_at,
+                    blocked_until=pooled_client.blocked_until,
+                    in_flight=pooled_client.in_flight,
+                )
+                for pooled_client in self._pooled_clients
+            ]
+
+    def _acquire(
+        self: GithubTokenPool,
+    ) -> _PooledClient:
+        with self._condition:
+            while True:
+                now: float = time.time()
+                available_at: dict[_PooledClient, float] = {
+                    pooled_client: pooled_client.get_available_at(
+                        reserve=self.remaining_reserve,
+                    )
+                    for pooled_client in self._pooled_clients
+                }
+                available: list[_PooledClient] = [
+                    pooled_client
+                    for pooled_client, at in available_at.items()
+                    if at <= now
+                ]
+                if available:
+                    pooled_client: _PooledClient = max(
+                        available,
+                        key=_PooledClient.get_score,
+                    )
+                    pooled_client.in_flight += 1
+                    return pooled_client
+
+                self._condition.wait(
+                    timeout=min(available_at.values()) - now,
+                )
+
+    def _release(
+        self: GithubTokenPool,
+        pooled_client: _PooledClient,
+        exception: GithubException | None,
+    ) -> None:
+        with self._condition:
+            pooled_client.in_flight -= 1
+            if exception is None:
+                pooled_client.back_off_count = 0
+
+            else:
+                now: float = time.time()
+                pooled_client.blocked_until = now + _get_back_off_seconds(
+                    exception=exception,
+                    now=now,
+                    back_off_count=pooled_client.back_off_count,
+                )
+                pooled_client.back_off_count += 1
+                back_off_counter.add(
+                    1,
+                    {
+                        "token_key": pooled_client.token_key,
+                    },
+                )
+
+            self._condition.notify_all()
+
+    def call(
+        self: GithubTokenPool,
+        call: Callable[[Github], T],
+    ) -> T:
+        """Runs call with the client of the token that has the most budget left.
+
+        Raises:
+            GithubException: When the call fails for any other reason than a
+                rate limit, or is still rate limited after max_attempts.
+        """
+        span_name: str = f"{SPAN_KEY}-call"
+        with tracer.start_as_current_span(span_name) as span:
+            for attempt in range(1, self.max_attempts + 1):
+                pooled_client: _PooledClient = self._acquire()
+                try:
+                    result: T = call(pooled_client.client)
+
+                except GithubException as e:
+                    rate_limited: bool = is_rate_limited(e)
+                    self._release(
+                        pooled_client=pooled_client,
+                        exception=e if rate_limited else None,
+                    )
+                    if not rate_limited or attempt == self.max_attempts:
+                        raise
+
+                    span.add_event(
+                        name="call-rate_limited",
+                        attributes={
+                            "token_key": pooled_client.token_key,
+                            "status": e.status,
+                            "attempt": attempt,
+                        },
+                    )
+                    continue
+
+                except BaseException:
+                    self._release(
+                        pooled_client=pooled_client,
+                        exception=None,
+                    )
+                    raise
+
+                self._release(
+                    pooled_client=pooled_client,
+                    exception=None,
+                )
+                return result
+
+        error_msg: str = "max_attempts must be at least 1"
+        raise ValueError(error_msg)
+
+
+def set_up_pool_from_tokens(
+    tokens: dict[
+        str,
+        str | None,
+    ],
+) -> GithubTokenPool | None:
+    """Builds a pool from the comma separated personal access tokens in GITHUB_TOKENS."""
+    with tracer.start_as_current_span(f"{SPAN_KEY}-set_up_pool_from_tokens") as span:
+        tokens = helper_utils.check_tokens(
+            tokens=tokens,
+        )
+        github_tokens: list[str] = [
+            token.strip()
+            for token in (tokens.get("GITHUB_TOKENS") or "").split(TOKEN_SEPARATOR)
+            if token.strip()
+        ]
+        if not github_tokens:
+            span.add_event(
+                name="missing_tokens-github",
+                attributes={
+                    "missing_token": "GITHUB_TOKENS",
+                },
+            )
+            return None
+
+        return GithubTokenPool.from_tokens(
+            tokens=github_tokens,
+        )
+
+
+def _observe_remaining(
+    _options: CallbackOptions,
+) -> Iterator[Observation]:
+    for token_pool in list(_token_pools):
+        for budget in token_pool.budgets:
+            if budget.remaining is not None:
+                yield Observation(
+                    budget.remaining,
+                    {
+                        "token_key": budget.token_key,
+                    },
+                )
+
+
+meter.create_observable_gauge(
+    name="github.rate_limit.remaining",
+    callbacks=[_observe_remaining],
+    description="Requests left on each pooled GitHub token until its reset",
+)
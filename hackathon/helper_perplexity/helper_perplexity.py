@@ -1,10 +1,12 @@
 from __future__ import annotations
 
+import dataclasses
 from typing import TYPE_CHECKING
 
 import httpx
 from pydantic.dataclasses import dataclass
 
+from hackathon.helper_utils import PydanticConfiguration
 from hackathon.otel import tracer
 
 if TYPE_CHECKING:
@@ -16,12 +18,31 @@ from .model_chat_response import ChatResponse
 
 BASE_API_URL: str = "https://api.perplexity.ai"
 TIMEOUT: int = 30
+MAX_CONNECTIONS: int = 20
+MAX_KEEPALIVE_CONNECTIONS: int = 10
+KEEPALIVE_EXPIRY: float = 60.0
 SPAN_KEY: str = "perplexity"
 
 
-@dataclass
+@dataclass(
+    config=PydanticConfiguration,
+)
 class Client:
+    """A Perplexity API client that reuses one pooled HTTP/2 connection pool.
+
+    The pool is opened on first use and has to be closed with aclose.
+    """
+
     token: str
+    max_connections: int = MAX_CONNECTIONS
+    max_keepalive_connections: int = MAX_KEEPALIVE_CONNECTIONS
+    keepalive_expiry: float = KEEPALIVE_EXPIRY
+    http2: bool = True
+    _http_client: httpx.AsyncClient | None = dataclasses.field(
+        default=None,
+        init=False,
+        repr=False,
+    )
 
     @classmethod
     def set_up_client_from_tokens(
@@ -44,27 +65,64 @@ class Client:
             token=token,
         )
 
+    def get_http_client(
+        self: Client,
+    ) -> httpx.AsyncClient:
+        if self._http_client is not None and not self._http_client.is_closed:
+            return self._http_client
+
+        span_name: str = f"{SPAN_KEY}-client-get_http_client"
+        with tracer.start_as_current_span(span_name) as span:
+            self._http_client = httpx.AsyncClient(
+                base_url=BASE_API_URL,
+                timeout=TIMEOUT,
+                http2=self.http2,
+                limits=httpx.Limits(
+                    max_connections=self.max_connections,
+                    max_keepalive_connections=self.max_keepalive_connections,
+                    keepalive_expiry=self.keepalive_expiry,
+                ),
+                headers={
+                    "Authorization": f"Bearer {self.token}",
+                    "Content-Type": "application/json",
+                },
+            )
+            span.add_event(
+                name="http_client-opened",
+                attributes={
+                    "max_connections": self.max_connections,
+                    "max_keepalive_connections": self.max_keepalive_connections,
+                    "http2": self.http2,
+                },
+            )
+            return self._http_client
+
+    async def aclose(
+        self: Client,
+    ) -> None:
+        span_name: str = f"{SPAN_KEY}-client-aclose"
+        with tracer.start_as_current_span(span_name) as span:
+            if self._http_client is None:
+                return
+
+            await self._http_client.aclose()
+            self._http_client = None
+            span.add_event(
+                name="http_client-closed",
+            )
+
     async def call_perplexity_api(
         self: Client,
         chat_completion: ChatCompletion,
     ) -> ChatResponse:
         span_name: str = f"{SPAN_KEY}-client-call_perplexity_api"
         with tracer.start_as_current_span(span_name) as span:
-            api_key = self.token
-            headers: dict[str, str] = {
-                "Authorization": f"Bearer {api_key}",
-                "Content-Type": "application/json",
-            }
             try:
-                async with httpx.AsyncClient(
-                    timeout=TIMEOUT,
-                ) as client:
-                    response: Response = await client.post(
-                        url=f"{BASE_API_URL}/chat/completions",
-                        headers=headers,
-                        content=chat_completion.model_dump_json(),
-                    )
-                    response.raise_for_status()
+                response: Response = await self.get_http_client().post(
+                    url="/chat/completions",
+                    content=chat_completion.model_dump_json(),
+                )
+                response.raise_for_status()
 
             except httpx.ReadTimeout as e:
                 span.record_exception(e)
@@ -0,0 +1,11 @@
+__all__ = [
+    "Bm25Index",
+    "reciprocal_rank_fusion",
+    "tokenize",
+]
+
+from .helper_search import (
+    Bm25Index,
+    reciprocal_rank_fusion,
+    tokenize,
+)
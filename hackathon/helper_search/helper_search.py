@@ -0,0 +1,167 @@
+from __future__ import annotations
+
+import dataclasses
+import heapq
+import math
+import re
+import threading
+from collections import Counter
+from typing import Iterable
+
+from hackathon.otel import tracer
+
+SPAN_KEY: str = "search"
+TOKEN_REGEX: re.Pattern = re.compile(r"[a-z0-9]+")
+BM25_K1: float = 1.2
+BM25_B: float = 0.75
+RRF_K: int = 60
+
+
+def tokenize(
+    text: str | None,
+) -> list[str]:
+    if not text:
+        return []
+
+    return TOKEN_REGEX.findall(text.lower())
+
+
+@dataclasses.dataclass(eq=False)
+class Bm25Index:
+    """An in memory inverted index scored with Okapi BM25.
+
+    Postings map each term to the term frequency per document, so a search
+    only touches the documents that contain one of the query terms. Documents
+    can be added, replaced and removed one at a time.
+    """
+
+    k1: float = BM25_K1
+    b: float = BM25_B
+    _postings: dict[str, dict[str, int]] = dataclasses.field(
+        default_factory=dict,
+        repr=False,
+    )
+    _document_terms: dict[str, Counter[str]] = dataclasses.field(
+        default_factory=dict,
+        repr=False,
+    )
+    _document_lengths: dict[str, int] = dataclasses.field(
+        default_factory=dict,
+        repr=False,
+    )
+    _total_length: int = 0
+    _lock: threading.Lock = dataclasses.field(
+        default_factory=threading.Lock,
+        repr=False,
+    )
+
+    def __len__(
+        self: Bm25Index,
+    ) -> int:
+        return len(self._document_terms)
+
+    def _remove(
+        self: Bm25Index,
+        document_id: str,
+    ) -> None:
+        terms: Counter[str] | None = self._document_terms.pop(document_id, None)
+        if terms is None:
+            return
+
+        self._total_length -= self._document_lengths.pop(document_id)
+        for term in terms:
+            postings: dict[str, int] = self._postings[term]
+            del postings[document_id]
+            if not postings:
+                del self._postings[term]
+
+    def add(
+        self: Bm25Index,
+        document_id: str,
+        text: str,
+    ) -> None:
+        """Indexes the document, replacing the previous text of the same id."""
+        terms: Counter[str] = Counter(tokenize(text))
+        with self._lock:
+            self._remove(document_id)
+            self._document_terms[document_id] = terms
+            self._document_lengths[document_id] = sum(terms.values())
+            self._total_length += self._document_lengths[document_id]
+            for term, frequency in terms.items():
+                self._postings.setdefault(term, {})[document_id] = frequency
+
+    def remove(
+        self: Bm25Index,
+        document_id: str,
+    ) -> None:
+        with self._lock:
+            self._remove(document_id)
+
+    def clear(
+        self: Bm25Index,
+    ) -> None:
+        with self._lock:
+            self._postings = {}
+            self._document_terms = {}
+            self._document_lengths = {}
+            self._total_length = 0
+
+    def search(
+        self: Bm25Index,
+        query: str,
+        limit: int,
+    ) -> list[tuple[str, float]]:
+        """Returns up to limit (document_id, score) pairs, best match first."""
+        span_name: str = f"{SPAN_KEY}-bm25_search"
+        with tracer.start_as_current_span(span_name) as span, self._lock:
+            document_count: int = len(self._document_terms)
+            if document_count == 0:
+                return []
+
+            average_length: float = self._total_length / document_count
+            scores: dict[str, float] = {}
+            for term in set(tokenize(query)):
+                postings: dict[str, int] | None = self._postings.get(term)
+                if postings is None:
+                    continue
+
+                idf: float = math.log(
+                    1 + (document_count - len(postings) + 0.5) / (len(postings) + 0.5),
+                )
+                for document_id, frequency in postings.items():
+                    length_norm: float = self.k1 * (
+                        1
+                        - self.b
+                        + self.b * self._document_lengths[document_id] / average_length
+                    )
+                    scores[document_id] = scores.get(document_id, 0.0) + idf * (
+                        frequency * (self.k1 + 1) / (frequency + length_norm)
+                    )
+
+            results: list[tuple[str, float]] = heapq.nlargest(
+                limit,
+                scores.items(),
+                key=lambda item: item[1],
+            )
+            span.add_event(
+                name="bm25_search-completed",
+                attributes={
+                    "query": query,
+                    "document_count-matched": len(scores),
+                    "document_count-returned": len(results),
+                },
+            )
+            return results
+
+
+def reciprocal_rank_fusion(
+    rankings: Iterable[list[str]],
+    k: int = RRF_K,
+) -> list[str]:
+    """Merges ranked id lists, scoring each id by the sum of 1 / (k + rank)."""
+    scores: dict[str, float] = {}
+    for ranking in rankings:
+        for rank, document_id in enumerate(ranking, start=1):
+            scores[document_id] = scores.get(document_id, 0.0) + 1 / (k + rank)
+
+    return sorted(scores, key=lambda document_id: scores[document_id], reverse=True)
@@ -1,6 +1,7 @@
 __all__ = [
     "FileType",
     "PydanticConfiguration",
+    "TokenBucket",
     "check_tokens",
     "create_datetime_from_timestamp_float",
     "create_datetime_from_timestamp_string",
@@ -15,6 +16,7 @@ __all__ = [
     "write_to_disk",
 ]
 
+from .helper_rate_limit import TokenBucket
 from .helper_utils import (
     FileType,
     PydanticConfiguration,
@@ -0,0 +1,48 @@
+from __future__ import annotations
+
+import asyncio
+import dataclasses
+import time
+
+
+@dataclasses.dataclass(eq=False)
+class TokenBucket:
+    """An asyncio rate limiter that allows rate calls per second on average.
+
+    Up to capacity calls can go out back to back after an idle period, and
+    every further call waits for its token. Waiters are served in order.
+    """
+
+    rate: float
+    capacity: float = 1.0
+    _tokens: float | None = dataclasses.field(default=None, repr=False)
+    _updated_at: float = dataclasses.field(
+        default_factory=time.monotonic,
+        repr=False,
+    )
+    _lock: asyncio.Lock = dataclasses.field(
+        default_factory=asyncio.Lock,
+        repr=False,
+    )
+
+    def _refill(
+        self: TokenBucket,
+    ) -> float:
+        now: float = time.monotonic()
+        tokens: float = self.capacity if self._tokens is None else self._tokens
+        self._tokens = min(
+            self.capacity,
+            tokens + (now - self._updated_at) * self.rate,
+        )
+        self._updated_at = now
+        return self._tokens
+
+    async def acquire(
+        self: TokenBucket,
+        tokens: float = 1.0,
+    ) -> None:
+        async with self._lock:
+            while (available := self._refill()) < tokens:
+                await asyncio.sleep((tokens - available) / self.rate)
+
+            self._tokens = available - tokens
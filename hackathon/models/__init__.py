@@ -1,3 +1,4 @@
 from .project import Project
+from .pull_request import PullRequest, PullRequestCheckpoint
 
-__all__ = ["Project"]
+__all__ = ["Project", "PullRequest", "PullRequestCheckpoint"]
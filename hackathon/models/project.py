@@ -6,14 +6,13 @@ import datetime  # trunk-ignore(ruff/TCH003)
 from typing import TYPE_CHECKING, Any
 
 from reflex_ag_grid import ag_grid
-from sqlmodel import Field
+from sqlmodel import Column, DateTime, Field
 
 from .base import Base
 
 if TYPE_CHECKING:
 
     from github.Repository import Repository
-    from reflex import Var
     from reflex_ag_grid.ag_grid import ColumnDef
 
 
@@ -21,7 +20,10 @@ class Project(Base, table=True): # trunk-ignore(pyright/reportGeneralTypeIssues,
     """A hackathon project."""
 
     stars: int
-    repo_path: str
+    repo_path: str = Field(
+        unique=True,
+        index=True,
+    )
     language: str = Field(
         default="",
     )
@@ -31,6 +33,25 @@ class Project(Base, table=True): # trunk-ignore(pyright/reportGeneralTypeIssues,
     description: str = Field(
         default="",
     )
+    refreshed_at: datetime.datetime | None = Field(
+        default=None,
+        sa_column=Column(
+            DateTime(
+                timezone=True,
+            ),
+            index=True,
+            nullable=True,
+        ),
+    )
+
+    def __setattr__(
+        self: Project,
+        name: str,
+        value: Any,  # trunk-ignore(ruff/ANN401)
+    ) -> None:
+        super().__setattr__(name, value)
+        if not name.startswith("_"):
+            object.__setattr__(self, "_version", self.version + 1)
 
     def __hash__(
         self: Project,
@@ -43,19 +64,55 @@ class Project(Base, table=True): # trunk-ignore(pyright/reportGeneralTypeIssues,
         """
         return hash(self.repo_path)
 
+    @property
+    def version(
+        self: Project,
+    ) -> int:
+        """Counts the field assignments made on this instance.
+
+        The counter and the cached ag grid row live outside the model fields,
+        so they are never persisted or serialized.
+        """
+        return getattr(self, "_version", 0)
+
     @classmethod
     def from_repo(
         cls: type[Project],
         repo: Repository,
     ) -> Project:
+        """A missing language, homepage or description becomes an empty string.
+
+        GitHub leaves them out when they are not set, and the columns are not
+        nullable.
+        """
         return cls(
             stars=repo.stargazers_count,
-            language=repo.language,
+            language=repo.language or "",
             created_at=repo.created_at,
             repo_path=repo.full_name,
-            website=repo.homepage,
+            website=repo.homepage or "",
             repo_url=repo.html_url,
-            description=repo.description,
+            description=repo.description or "",
+        )
+
+    @classmethod
+    def from_graphql(
+        cls: type[Project],
+        repository: dict[str, Any],
+    ) -> Project:
+        """The counterpart of from_repo for a node of helper_github.fetch_repositories.
+
+        Missing values become empty strings, like in from_repo.
+        """
+        primary_language: dict[str, str] | None = repository.get("primaryLanguage")
+        return cls(
+            stars=repository["stargazerCount"],
+            language="" if primary_language is None else primary_language["name"],
+            created_at=datetime.datetime.fromisoformat(repository["createdAt"]),
+            repo_path=repository["nameWithOwner"],
+            website=repository.get("homepageUrl") or "",
+            repo_url=repository["url"],
+            description=repository.get("description") or "",
         )
 
     @staticmethod
@@ -119,24 +176,35 @@ class Project(Base, table=True): # trunk-ignore(pyright/reportGeneralTypeIssues,
     def to_ag_grid_dict(
         self: Project,
     ) -> dict:
-        def _formatted_key_values(
-            field: str,
-        ) -> tuple[str, Any]:
-            return field, Project.format_value(
+        version: int = self.version
+        cached_version, cached_row = getattr(
+            self,
+            "_ag_grid_dict_cache",
+            (None, None),
+        )
+        if cached_version == version and cached_row is not None:
+            return cached_row
+
+        row: dict = {
+            field: Project.format_value(
                 field=field,
                 value=getattr(
                     self,
                     field,
                 ),
             )
-
-        displayable_fields: list[str | Var[str]] = [
-            column_def.field for column_def in Project.get_ag_grid_column_definitions()
-        ]
-        return dict(_formatted_key_values(field) for field in displayable_fields) ## trunk-ignore(pyright/reportArgumentType,pyright/reportCallIssue)
+            for field in AG_GRID_FIELDS
+        }
+        object.__setattr__(self, "_ag_grid_dict_cache", (version, row))
+        return row
 
     def set_description(
         self: Project,
         description: str,
     ) -> None:
         self.description = description
+
+
+AG_GRID_FIELDS: tuple[str, ...] = tuple(
+    str(column_def.field) for column_def in Project.get_ag_grid_column_definitions()
+)
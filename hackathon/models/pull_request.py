@@ -0,0 +1,129 @@
+"""Models related to the pull requests of hackathon projects."""
+# trunk-ignore-all(trunk/ignore-does-nothing)
+from __future__ import annotations
+
+import datetime  # trunk-ignore(ruff/TCH003)
+from typing import TYPE_CHECKING
+
+from sqlmodel import Column, DateTime, Field, UniqueConstraint
+
+from .base import Base
+
+if TYPE_CHECKING:
+
+    from github.PullRequest import PullRequest as GithubPullRequest
+
+
+class PullRequest(Base, table=True): # trunk-ignore(pyright/reportGeneralTypeIssues,pyright/reportCallIssue)
+    """A pull request of a hackathon project, as of its last harvest."""
+
+    __tablename__ = "pull_request"
+    __table_args__ = (
+        UniqueConstraint(
+            "repo_path",
+            "number",
+            name="uq_pull_request_repo_path_number",
+        ),
+    )
+
+    repo_path: str
+    number: int
+    title: str
+    state: str
+    author: str | None = Field(
+        default=None,
+    )
+    html_url: str
+    created_at: datetime.datetime = Field(
+        sa_column=Column(
+            DateTime(
+                timezone=True,
+            ),
+            nullable=False,
+        ),
+    )
+    updated_at: datetime.datetime = Field(
+        sa_column=Column(
+            DateTime(
+                timezone=True,
+            ),
+            nullable=False,
+        ),
+    )
+    closed_at: datetime.datetime | None = Field(
+        default=None,
+        sa_column=Column(
+            DateTime(
+                timezone=True,
+            ),
+            nullable=True,
+        ),
+    )
+    merged_at: datetime.datetime | None = Field(
+        default=None,
+        sa_column=Column(
+            DateTime(
+                timezone=True,
+            ),
+            nullable=True,
+        ),
+    )
+
+    @classmethod
+    def from_pull_request(
+        cls: type[PullRequest],
+        repo_path: str,
+        pull_request: GithubPullRequest,
+    ) -> PullRequest:
+        """Only reads attributes of the list payload, so no extra request is made."""
+        return cls(
+            repo_path=repo_path,
+            number=pull_request.number,
+            title=pull_request.title,
+            state=pull_request.state,
+            author=None if pull_request.user is None else pull_request.user.login,
+            html_url=pull_request.html_url,
+            created_at=pull_request.created_at,
+            updated_at=pull_request.updated_at,
+            closed_at=pull_request.closed_at,
+            merged_at=pull_request.merged_at,
+        )
+
+
+class PullRequestCheckpoint(Base, table=True): # trunk-ignore(pyright/reportGeneralTypeIssues,pyright/reportCallIssue)
+    """How far the pull requests of a repo have been harvested.
+
+    Every pull request updated at or before updated_at is stored. A harvest
+    lists pull requests by updated_at, newest first, so while one is running,
+    run_updated_at is the newest updated_at it started from and run_offset
+    the number of pull requests it has stored so far. An interrupted harvest
+    resumes from run_offset instead of starting over.
+    """
+
+    __tablename__ = "pull_request_checkpoint"
+
+    repo_path: str = Field(
+        unique=True,
+        index=True,
+    )
+    updated_at: datetime.datetime | None = Field(
+        default=None,
+        sa_column=Column(
+            DateTime(
+                timezone=True,
+            ),
+            nullable=True,
+        ),
+    )
+    run_updated_at: datetime.datetime | None = Field(
+        default=None,
+        sa_column=Column(
+            DateTime(
+                timezone=True,
+            ),
+            nullable=True,
+        ),
+    )
+    run_offset: int | None = Field(
+        default=None,
+    )
@@ -62,3 +62,4 @@ METER_PROVIDER = MeterProvider(
 metrics.set_meter_provider(
     METER_PROVIDER,
 )
+meter = metrics.get_meter(resource_attributes[ResourceAttributes.SERVICE_NAME])
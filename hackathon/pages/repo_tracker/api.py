@@ -0,0 +1,76 @@
+from __future__ import annotations
+
+import json
+from http import HTTPStatus
+from typing import Any
+
+import reflex as rx
+from fastapi import HTTPException
+
+from hackathon import helper_db
+from hackathon.models.project import Project  # trunk-ignore(ruff/TCH001)
+from hackathon.otel import tracer
+
+from .constants import AG_GRID_CACHE_BLOCK_SIZE
+
+SPAN_KEY: str = "api"
+
+
+def get_project_rows(
+    start: int,
+    end: int,
+    sort_model: str | None = None,
+    filter_model: str | None = None,
+) -> list[dict]:
+    """Answers the ag grid infinite row model with one block of project rows.
+
+    The sort and filter models arrive as JSON encoded query parameters. A
+    block is never larger than the cache block size of the grid, and a
+    malformed request is answered with a 400.
+    """
+    span_name: str = f"{SPAN_KEY}-get_project_rows"
+    with tracer.start_as_current_span(span_name) as span, rx.session() as session:
+        span.add_event(
+            name="get_project_rows-started",
+            attributes={
+                "start": start,
+                "end": end,
+            },
+        )
+        if start < 0 or end < start:
+            error_msg: str = f"Invalid row range: {start} to {end}"
+            span.record_exception(ValueError(error_msg))
+            raise HTTPException(
+                status_code=HTTPStatus.BAD_REQUEST,
+                detail=error_msg,
+            )
+
+        try:
+            sort_model_decoded: list[dict[str, str]] | None = (
+                json.loads(sort_model) if sort_model else None
+            )
+            filter_model_decoded: dict[str, dict[str, Any]] | None = (
+                json.loads(filter_model) if filter_model else None
+            )
+            projects: list[Project] = helper_db.fetch_project_rows(
+                session=session,
+                start=start,
+                end=min(end, start + AG_GRID_CACHE_BLOCK_SIZE),
+                sort_model=sort_model_decoded,
+                filter_model=filter_model_decoded,
+            )
+
+        except (ValueError, TypeError, AttributeError) as e:
+            span.record_exception(e)
+            raise HTTPException(
+                status_code=HTTPStatus.BAD_REQUEST,
+                detail=str(e),
+            ) from e
+
+        span.add_event(
+            name="get_project_rows-completed",
+            attributes={
+                "project_count": len(projects),
+            },
+        )
+        return [project.to_ag_grid_dict() for project in projects]
@@ -11,3 +11,28 @@ NUMBER_OF_WORDS_TO_DISPLAY_FOR_REPO_DESCRIPTION: int = 30
 REPO_SIMILARITY_THRESHOLD_MIN: int = 0
 REPO_SIMILARITY_THRESHOLD_MAX: int = 200
 REPO_SIMILARITY_THRESHOLD_STEP: int = 4
+PROJECT_LOAD_PAGE_SIZE: int | None = None
+AG_GRID_SERVER_SIDE_ROW_MODEL: bool = False
+AG_GRID_CACHE_BLOCK_SIZE: int = 100
+AG_GRID_MAX_BLOCKS_IN_CACHE: int = 10
+PROJECT_ROWS_ROUTE: str = "/api/projects/rows"
+REPO_BULK_IMPORT_INPUT_ID: str = "repo-bulk-import-input"
+BULK_IMPORT_BATCH_SIZE: int = 50
+BULK_IMPORT_GITHUB_CONCURRENCY: int = 8
+BULK_IMPORT_PERPLEXITY_CONCURRENCY: int = 4
+BULK_IMPORT_SOURCE_LIMIT: int | None = 500
+BULK_IMPORT_FILE_DIRECTORY: str | None = None
+CACHE_DIRECTORY: str = ".cache"
+PERPLEXITY_DESCRIPTION_CACHE_TTL_SECONDS: int = 30 * 24 * 60 * 60
+PERPLEXITY_DESCRIPTION_CACHE_MAX_ENTRIES: int = 100_000
+EMBEDDING_CACHE_MAX_ENTRIES: int = 1_000_000
+GITHUB_REPO_CACHE_MAX_ENTRIES: int = 100_000
+REFRESH_ENABLED: bool = True
+REFRESH_BATCH_SIZE: int = 100
+REFRESH_HOT_STARS: int = 1_000
+REFRESH_HOT_INTERVAL_SECONDS: int = 60 * 60
+REFRESH_COLD_INTERVAL_SECONDS: int = 24 * 60 * 60
+REFRESH_IDLE_SECONDS: float = 60.0
+REFRESH_GITHUB_QPS: float = 0.5
+REFRESH_PERPLEXITY_QPS: float = 0.1
+PULL_REQUEST_HARVEST_CONCURRENCY: int = 4
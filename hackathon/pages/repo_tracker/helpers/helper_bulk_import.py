@@ -0,0 +1,365 @@
+from __future__ import annotations
+
+import asyncio
+import re
+from dataclasses import dataclass
+from pathlib import Path
+from typing import TYPE_CHECKING, Awaitable, Callable
+
+from hackathon import helper_db, helper_github
+from hackathon.models.project import Project
+from hackathon.otel import tracer
+
+from .helper_chroma import chroma_add_projects
+from .helper_github import (
+    fetch_repo_paths_for_org,
+    fetch_repo_paths_for_topic,
+)
+from .helper_perplexity import perplexity_get_repo
+from .helper_repo_pipeline import fetch_projects
+
+if TYPE_CHECKING:
+    import chromadb.api.client
+    from github import Github
+    from opentelemetry.trace import Span
+
+    from hackathon import helper_perplexity
+    from hackathon.helper_github import GithubTokenPool
+
+SPAN_KEY: str = "bulk_import"
+SOURCE_SEPARATOR_REGEX: re.Pattern = re.compile(r"[\s,]+")
+ORG_SOURCE_PREFIX: str = "org:"
+TOPIC_SOURCE_PREFIX: str = "topic:"
+FILE_SOURCE_PREFIX: str = "file:"
+
+
+@dataclass
+class BulkImportProgress:
+    total: int = 0
+    fetched: int = 0
+    described: int = 0
+    saved: int = 0
+    indexed: int = 0
+    failed: int = 0
+
+    def __str__(
+        self: BulkImportProgress,
+    ) -> str:
+        return (
+            f"{self.fetched}/{self.total} fetched, {self.described} described, "
+            f"{self.saved} saved, {self.indexed} indexed, {self.failed} failed"
+        )
+
+
+@dataclass
+class BulkImportLimits:
+    batch_size: int
+    github_concurrency: int
+    perplexity_concurrency: int
+    source_limit: int | None = None
+
+
+def parse_sources(
+    text: str,
+) -> list[str]:
+    return [source for source in SOURCE_SEPARATOR_REGEX.split(text) if source]
+
+
+def _read_file_source(
+    name: str,
+    import_directory: Path | None,
+) -> Path | None:
+    """The file a file: source names, if it is inside the import directory.
+
+    The sources come from a public text box, so file: only reads the files
+    an operator put in import_directory, and is disabled without one.
+    """
+    if import_directory is None:
+        return None
+
+    directory: Path = import_directory.resolve()
+    path: Path = (directory / name).resolve()
+    if not path.is_relative_to(directory) or not path.is_file():
+        return None
+
+    return path
+
+
+def _resolve_repo_paths(  # trunk-ignore(ruff/PLR0913)
+    sources: list[str],
+    client: Github | None,
+    source_limit: int | None,
+    import_directory: Path | None,
+    visited_paths: set[Path],
+    span: Span,
+) -> list[str]:
+    repo_paths: list[str] = []
+    for source in sources:
+        if source.startswith(ORG_SOURCE_PREFIX):
+            repo_paths.extend(
+                fetch_repo_paths_for_org(
+                    org=source.removeprefix(ORG_SOURCE_PREFIX),
+                    client=client,
+                    limit=source_limit,
+                ),
+            )
+
+        elif source.startswith(TOPIC_SOURCE_PREFIX):
+            repo_paths.extend(
+                fetch_repo_paths_for_topic(
+                    topic=source.removeprefix(TOPIC_SOURCE_PREFIX),
+                    client=client,
+                    limit=source_limit,
+                ),
+            )
+
+        elif source.startswith(FILE_SOURCE_PREFIX):
+            path: Path | None = _read_file_source(
+                name=source.removeprefix(FILE_SOURCE_PREFIX),
+                import_directory=import_directory,
+            )
+            if path is None or path in visited_paths:
+                span.add_event(
+                    name="file_source-skipped",
+                    attributes={
+                        "source": source,
+                        "already_visited": path is not None,
+                    },
+                )
+                continue
+
+            visited_paths.add(path)
+            repo_paths.extend(
+                _resolve_repo_paths(
+                    sources=parse_sources(
+                        text=path.read_text(),
+                    ),
+                    client=client,
+                    source_limit=source_limit,
+                    import_directory=import_directory,
+                    visited_paths=visited_paths,
+                    span=span,
+                ),
+            )
+
+        else:
+            repo_paths.append(
+                helper_github.extract_repo_path_from_url(
+                    url=source,
+                ),
+            )
+
+    return repo_paths
+
+
+def resolve_repo_paths(
+    sources: list[str],
+    client: Github | None,
+    source_limit: int | None,
+    import_directory: Path | None,
+) -> list[str]:
+    """Expands org:, topic: and file: sources into repo paths.
+
+    A file: source names a file inside import_directory, which is read as
+    more sources. Every file is read at most once, so files that reference
+    each other cannot recurse forever. Any other source is treated as a
+    repo path or a GitHub repo url.
+    """
+    span_name: str = f"{SPAN_KEY}-resolve_repo_paths"
+    with tracer.start_as_current_span(span_name) as span:
+        unique_repo_paths: list[str] = list(
+            dict.fromkeys(
+                _resolve_repo_paths(
+                    sources=sources,
+                    client=client,
+                    source_limit=source_limit,
+                    import_directory=import_directory,
+                    visited_paths=set(),
+                    span=span,
+                ),
+            ),
+        )
+        span.add_event(
+            name="resolve_repo_paths-completed",
+            attributes={
+                "source_count": len(sources),
+                "repo_path_count": len(unique_repo_paths),
+            },
+        )
+        return unique_repo_paths
+
+
+async def bulk_import_repos(  # trunk-ignore(ruff/PLR0913)
+    repo_paths: list[str],
+    github_client: Github | GithubTokenPool | None,
+    perplexity_client: helper_perplexity.Client | None,
+    chroma_client: chromadb.api.client.Client | None,
+    limits: BulkImportLimits,
+    on_progress: Callable[[BulkImportProgress, list[Project]], Awaitable[None]],
+) -> BulkImportProgress:
+    """Runs the fetch, describe, save and index pipeline over many repos.
+
+    Repos are fetched from GitHub one GraphQL batch at a time. GitHub batches
+    and Perplexity calls run concurrently, each bounded by its own semaphore.
+    Described projects are buffered and committed to the database and Chroma
+    one batch at a time. on_progress is awaited after every repo
+    with the projects of the batch that was just saved, if any.
+
+    A GitHub batch, a save or an index that fails counts its repos as failed
+    and the import carries on with the other batches. A failed Perplexity
+    call counts its repo as failed too, and the repo is saved with its
+    GitHub description.
+    """
+    span_name: str = f"{SPAN_KEY}-bulk_import_repos"
+    with tracer.start_as_current_span(span_name) as span:
+        progress: BulkImportProgress = BulkImportProgress(
+            total=len(repo_paths),
+        )
+        github_semaphore: asyncio.Semaphore = asyncio.Semaphore(
+            limits.github_concurrency,
+        )
+        perplexity_semaphore: asyncio.Semaphore = asyncio.Semaphore(
+            limits.perplexity_concurrency,
+        )
+        batch: list[Project] = []
+        batch_lock: asyncio.Lock = asyncio.Lock()
+
+        async def flush(
+            projects: list[Project],
+        ) -> None:
+            try:
+                saved_projects: list[Project] = await helper_db.async_save_projects(
+                    projects=projects,
+                )
+
+            except Exception as e:  # trunk-ignore(ruff/BLE001)
+                span.record_exception(e)
+                progress.failed += len(projects)
+                await on_progress(progress, [])
+                return
+
+            progress.saved += len(saved_projects)
+            if chroma_client is not None and saved_projects:
+                try:
+                    await asyncio.to_thread(
+                        chroma_add_projects,
+                        saved_projects,
+                        chroma_client,
+                        limits.batch_size,
+                    )
+                    progress.indexed += len(saved_projects)
+
+                except Exception as e:  # trunk-ignore(ruff/BLE001)
+                    span.record_exception(e)
+                    progress.failed += len(saved_projects)
+
+            span.add_event(
+                name="batch-flushed",
+                attributes={
+                    "project_count": len(projects),
+                    "project_count-saved": len(saved_projects),
+                },
+            )
+            await on_progress(progress, projects)
+
+        async def describe(
+            project: Project,
+        ) -> bool:
+            """Returns whether the project got a Perplexity description."""
+            if perplexity_client is None:
+                return False
+
+            try:
+                async with perplexity_semaphore:
+                    description: str | None = await perplexity_get_repo(
+                        repo_url=project.repo_url,
+                        client=perplexity_client,
+                    )
+
+            except Exception as e:  # trunk-ignore(ruff/BLE001)
+                span.record_exception(e)
+                progress.failed += 1
+                return False
+
+            if description is None:
+                return False
+
+            project.set_description(
+                description=description,
+            )
+            return True
+
+        async def import_project(
+            repo_path: str,
+            project: Project | None,
+        ) -> None:
+            if project is None:
+                progress.failed += 1
+                span.add_event(
+                    name="repo-not_found",
+                    attributes={
+                        "repo_path": repo_path,
+                    },
+                )
+                await on_progress(progress, [])
+                return
+
+            progress.fetched += 1
+            if await describe(project):
+                progress.described += 1
+
+            async with batch_lock:
+                batch.append(project)
+                if len(batch) < limits.batch_size:
+                    projects: list[Project] = []
+
+                else:
+                    projects = [*batch]
+                    batch.clear()
+
+            if not projects:
+                await on_progress(progress, [])
+                return
+
+            await flush(projects)
+
+        async def import_repos(
+            fetch_batch: list[str],
+        ) -> None:
+            try:
+                async with github_semaphore:
+                    projects: dict[str, Project | None] = await fetch_projects(
+                        repo_paths=fetch_batch,
+                        client=github_client,
+                    )
+
+            except Exception as e:  # trunk-ignore(ruff/BLE001)
+                span.record_exception(e)
+                progress.failed += len(fetch_batch)
+                await on_progress(progress, [])
+                return
+
+            await asyncio.gather(
+                *(
+                    import_project(repo_path, project)
+                    for repo_path, project in projects.items()
+                ),
+            )
+
+        fetch_batch_size: int = helper_github.GRAPHQL_BATCH_SIZE
+        await asyncio.gather(
+            *(
+                import_repos(repo_paths[start : start + fetch_batch_size])
+                for start in range(0, len(repo_paths), fetch_batch_size)
+            ),
+        )
+        if batch:
+            await flush([*batch])
+
+        span.add_event(
+            name="bulk_import_repos-completed",
+            attributes={
+                "progress": str(progress),
+            },
+        )
+        return progress
@@ -1,6 +1,7 @@
 from __future__ import annotations
 
-from typing import TYPE_CHECKING
+from pathlib import Path
+from typing import TYPE_CHECKING, Iterable
 
 if TYPE_CHECKING:
     import chromadb
@@ -8,8 +9,28 @@ if TYPE_CHECKING:
     from hackathon.models.project import Project
 
 from hackathon import helper_chroma
+from hackathon.helper_cache import SqliteCache
 from hackathon.otel import tracer
 
+from ..constants import CACHE_DIRECTORY, EMBEDDING_CACHE_MAX_ENTRIES
+
+PROJECT_COLLECTION_NAME: str = "projects"
+PROJECT_METADATA_KEYS: list[str] = [
+    "repo_path",
+    "stars",
+    "language",
+    "website",
+    "description",
+]
+PROJECT_EMBEDDER: helper_chroma.Embedder = helper_chroma.Embedder(
+    cache=SqliteCache(
+        path=Path(CACHE_DIRECTORY) / "cache.sqlite3",
+        namespace="embeddings",
+        ttl_seconds=None,
+        max_entries=EMBEDDING_CACHE_MAX_ENTRIES,
+    ),
+)
+
 
 def chroma_add_project(
     project: Project,
@@ -19,15 +40,27 @@ def chroma_add_project(
         item=project,
         item_id=str(project.repo_path),
         item_document=project.description,
-        metadata_keys=[
-            "repo_path",
-            "stars",
-            "language",
-            "website",
-            "description",
-        ],
-        collection_name="projects",
+        metadata_keys=PROJECT_METADATA_KEYS,
+        collection_name=PROJECT_COLLECTION_NAME,
+        client=client,
+        embedder=PROJECT_EMBEDDER,
+    )
+
+
+def chroma_add_projects(
+    projects: Iterable[Project],
+    client: chromadb.api.client.Client,
+    batch_size: int = helper_chroma.DEFAULT_BATCH_SIZE,
+) -> int:
+    return helper_chroma.add_items(
+        items=projects,
+        get_item_id=lambda project: str(project.repo_path),
+        get_item_document=lambda project: project.description,
+        metadata_keys=PROJECT_METADATA_KEYS,
+        collection_name=PROJECT_COLLECTION_NAME,
         client=client,
+        batch_size=batch_size,
+        embedder=PROJECT_EMBEDDER,
     )
 
 
@@ -69,8 +102,9 @@ def chroma_get_projects(
         result: chromadb.QueryResult = helper_chroma.get_items(
             query=repo_filter_vector_search_text,
             n_results=n_results,
-            collection_name="projects",
+            collection_name=PROJECT_COLLECTION_NAME,
             client=client,
+            embedder=PROJECT_EMBEDDER,
         )
         span.add_event(
             name="get_projects-completed",
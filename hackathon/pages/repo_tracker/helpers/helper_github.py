@@ -1,22 +1,46 @@
 from __future__ import annotations
 
-from typing import TYPE_CHECKING, Generator
+import asyncio
+from itertools import islice
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Generator
 
 from github.GithubException import GithubException
 
 from hackathon import helper_github
+from hackathon.helper_cache import SqliteCache
 from hackathon.otel import tracer
 
+from ..constants import (
+    CACHE_DIRECTORY,
+    GITHUB_REPO_CACHE_MAX_ENTRIES,
+)
+
 if TYPE_CHECKING:
     from github import Github
     from github.PullRequest import PullRequest
     from github.Repository import Repository
 
+    from hackathon.helper_github import GithubTokenPool
+
+# Entries are revalidated with GitHub on every read, so they never expire.
+REPO_RESPONSE_CACHE: SqliteCache = SqliteCache(
+    path=Path(CACHE_DIRECTORY) / "cache.sqlite3",
+    namespace="github_repo",
+    ttl_seconds=None,
+    max_entries=GITHUB_REPO_CACHE_MAX_ENTRIES,
+)
+
 
 def fetch_repo(
     repo_path: str,
     client: Github | None,
 ) -> Repository | None:
+    """Returns None when the repo cannot be fetched.
+
+    Rate limit errors are raised instead, so a token pool can retry them on
+    another token.
+    """
     with tracer.start_as_current_span("fetch_repo") as span:
         span.add_event(
             name="fetch_repo-started",
@@ -29,7 +53,11 @@ def fetch_repo(
             client = helper_github.check_client(
                 client=client,
             )
-            repo = client.get_repo(repo_path)
+            repo = helper_github.get_repo_conditionally(
+                repo_path=repo_path,
+                client=client,
+                cache=REPO_RESPONSE_CACHE,
+            )
             span.add_event(
                 name="fetch_repo-completed",
                 attributes={
@@ -46,6 +74,8 @@ def fetch_repo(
                 },
             )
             span.record_exception(e)
+            if helper_github.is_rate_limited(e):
+                raise
 
         return repo
 
@@ -84,3 +114,114 @@ def fetch_pull_request_for_repo(
         span.add_event(
             name=f"{span_name}-completed",
         )
+
+
+def fetch_repo_paths_for_org(
+    org: str,
+    client: Github | None,
+    limit: int | None,
+) -> list[str]:
+    span_name: str = "fetch_repo_paths_for_org"
+    with tracer.start_as_current_span(span_name) as span:
+        span.add_event(
+            name=f"{span_name}-started",
+            attributes={
+                "org": org,
+            },
+        )
+        client = helper_github.check_client(
+            client=client,
+        )
+        repo_paths: list[str] = [
+            repo.full_name
+            for repo in islice(
+                client.get_organization(org).get_repos(),
+                limit,
+            )
+        ]
+        span.add_event(
+            name=f"{span_name}-completed",
+            attributes={
+                "org": org,
+                "repo_count": len(repo_paths),
+            },
+        )
+        return repo_paths
+
+
+def fetch_repo_paths_for_topic(
+    topic: str,
+    client: Github | None,
+    limit: int | None,
+) -> list[str]:
+    span_name: str = "fetch_repo_paths_for_topic"
+    with tracer.start_as_current_span(span_name) as span:
+        span.add_event(
+            name=f"{span_name}-started",
+            attributes={
+                "topic": topic,
+            },
+        )
+        client = helper_github.check_client(
+            client=client,
+        )
+        repo_paths: list[str] = [
+            repo.full_name
+            for repo in islice(
+                client.search_repositories(
+                    query=f"topic:{topic}",
+                ),
+                limit,
+            )
+        ]
+        span.add_event(
+            name=f"{span_name}-completed",
+            attributes={
+                "topic": topic,
+                "repo_count": len(repo_paths),
+            },
+        )
+        return repo_paths
+
+
+async def async_fetch_repo(
+    repo_path: str,
+    client: Github | GithubTokenPool | None,
+) -> Repository | None:
+    """fetch_repo on the GitHub thread pool, bounded per token."""
+    try:
+        return await helper_github.github_executor.run_with_client(
+            client,
+            fetch_repo,
+            repo_path=repo_path,
+        )
+
+    except GithubException:
+        return None
+
+
+async def async_fetch_repositories(
+    repo_paths: list[str],
+    client: Github | GithubTokenPool | None,
+) -> dict[str, dict[str, Any] | None]:
+    """fetch_repositories with every GraphQL batch as its own task on the pool."""
+    client = helper_github.check_client(  # trunk-ignore(pyright/reportAssignmentType)
+        client=client,  # trunk-ignore(pyright/reportArgumentType)
+    )
+    batch_size: int = helper_github.GRAPHQL_BATCH_SIZE
+    batches: list[dict[str, dict[str, Any] | None]] = await asyncio.gather(
+        *(
+            helper_github.github_executor.run_with_client(
+                client,
+                helper_github.fetch_repositories,
+                repo_paths=repo_paths[start : start + batch_size],
+                batch_size=batch_size,
+            )
+            for start in range(0, len(repo_paths), batch_size)
+        ),
+    )
+    return {
+        repo_path: repository
+        for batch in batches
+        for repo_path, repository in batch.items()
+    }
@@ -1,5 +1,10 @@
 from __future__ import annotations
 
+import asyncio
+import hashlib
+from pathlib import Path
+
+from hackathon.helper_cache import SqliteCache
 from hackathon.helper_perplexity import (
     DEFAULT_PROMPT,
     ChatCompletion,
@@ -9,6 +14,60 @@ from hackathon.helper_perplexity import (
 )
 from hackathon.otel import tracer
 
+from ..constants import (
+    CACHE_DIRECTORY,
+    PERPLEXITY_DESCRIPTION_CACHE_MAX_ENTRIES,
+    PERPLEXITY_DESCRIPTION_CACHE_TTL_SECONDS,
+)
+
+DESCRIPTION_CACHE: SqliteCache = SqliteCache(
+    path=Path(CACHE_DIRECTORY) / "cache.sqlite3",
+    namespace="perplexity_description",
+    ttl_seconds=PERPLEXITY_DESCRIPTION_CACHE_TTL_SECONDS,
+    max_entries=PERPLEXITY_DESCRIPTION_CACHE_MAX_ENTRIES,
+)
+PROMPT_HASH: str = hashlib.sha256(DEFAULT_PROMPT.encode()).hexdigest()
+
+
+def get_description_cache_key(
+    repo_url: str,
+    chat_completion: ChatCompletion,
+) -> str:
+    """The key changes whenever the prompt or the model changes."""
+    return hashlib.sha256(
+        f"{repo_url}\n{PROMPT_HASH}\n{chat_completion.model}".encode(),
+    ).hexdigest()
+
+
+def get_chat_completion(
+    repo_url: str,
+) -> ChatCompletion:
+    content: str = DEFAULT_PROMPT.replace(
+        "<link_to_github_repository>",
+        repo_url,
+    )
+    return ChatCompletion(
+        messages=[
+            Message(
+                content=content,
+            ),
+        ],
+    )
+
+
+def get_cached_description(
+    repo_url: str,
+) -> str | None:
+    """The description perplexity_get_repo would return without calling the API."""
+    return DESCRIPTION_CACHE.get(
+        get_description_cache_key(
+            repo_url=repo_url,
+            chat_completion=get_chat_completion(
+                repo_url=repo_url,
+            ),
+        ),
+    )
+
 
 async def perplexity_get_repo(
     repo_url: str,
@@ -29,18 +88,35 @@ async def perplexity_get_repo(
             )
             raise AssertionError(error_message)
 
-        content: str = DEFAULT_PROMPT.replace(
-            "<link_to_github_repository>",
-            repo_url,
+        chat_completion: ChatCompletion = get_chat_completion(
+            repo_url=repo_url,
         )
-        chat_completion: ChatCompletion = ChatCompletion(
-            messages=[
-            Message(
-                content=content,
-            ),
-        ],
-    )
-    chat_response: ChatResponse = await client.call_perplexity_api(
-        chat_completion=chat_completion,
-    )
-    return chat_response.get_content()
+        cache_key: str = get_description_cache_key(
+            repo_url=repo_url,
+            chat_completion=chat_completion,
+        )
+        description: str | None = await asyncio.to_thread(
+            DESCRIPTION_CACHE.get,
+            cache_key,
+        )
+        if description is not None:
+            span.add_event(
+                name="perplexity_get_repo-cache_hit",
+                attributes={
+                    "repo_url": repo_url,
+                },
+            )
+            return description
+
+        chat_response: ChatResponse = await client.call_perplexity_api(
+            chat_completion=chat_completion,
+        )
+        description = chat_response.get_content()
+        if description is not None:
+            await asyncio.to_thread(
+                DESCRIPTION_CACHE.set,
+                cache_key,
+                description,
+            )
+
+        return description
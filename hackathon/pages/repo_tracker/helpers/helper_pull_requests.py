@@ -0,0 +1,279 @@
+from __future__ import annotations
+
+import asyncio
+import datetime
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Awaitable, Callable
+
+from github.GithubException import GithubException
+
+from hackathon import helper_db, helper_github
+from hackathon.models.pull_request import PullRequest, PullRequestCheckpoint
+from hackathon.otel import tracer
+
+from .helper_github import async_fetch_repo
+
+if TYPE_CHECKING:
+    from github import Github
+    from github.PullRequest import PullRequest as GithubPullRequest
+    from github.Repository import Repository
+
+    from hackathon.helper_github import GithubTokenPool
+
+SPAN_KEY: str = "pull_requests"
+
+
+@dataclass
+class HarvestProgress:
+    total: int = 0
+    harvested: int = 0
+    failed: int = 0
+    pull_requests: int = 0
+
+    def __str__(
+        self: HarvestProgress,
+    ) -> str:
+        return (
+            f"{self.harvested}/{self.total} repos harvested, "
+            f"{self.pull_requests} pull requests stored, {self.failed} failed"
+        )
+
+
+def _as_utc(
+    value: datetime.datetime | None,
+) -> datetime.datetime | None:
+    """SQLite hands timezone aware columns back without their timezone."""
+    if value is None or value.tzinfo is not None:
+        return value
+
+    return value.replace(tzinfo=datetime.timezone.utc)
+
+
+def fetch_pull_request_page(
+    repo_path: str,
+    offset: int,
+    client: Github,
+) -> tuple[list[GithubPullRequest], int]:
+    """The page of pull requests that holds offset, newest update first.
+
+    The page size is that of the client, which with a token pool is only
+    known once the pool picked one in the worker thread.
+
+    Returns:
+        tuple[list[GithubPullRequest], int]: The page and the page size.
+    """
+    page_size: int = helper_github.get_requester(client).per_page
+    pull_requests: list[GithubPullRequest] = (
+        client.get_repo(
+            repo_path,
+            lazy=True,
+        )
+        .get_pulls(
+            state="all",
+            sort="updated",
+            direction="desc",
+        )
+        .get_page(offset // page_size)
+    )
+    return pull_requests, page_size
+
+
+@dataclass
+class _RepoHarvest:
+    """Streams the pull requests of one repo into the table, page by page."""
+
+    repo: Repository
+    client: Github | GithubTokenPool | None
+    on_page: Callable[[int], Awaitable[None]]
+
+    @property
+    def repo_path(
+        self: _RepoHarvest,
+    ) -> str:
+        return self.repo.full_name
+
+    async def _scan(
+        self: _RepoHarvest,
+        offset: int,
+        stop_at: datetime.datetime | None,
+        get_checkpoint: Callable[[datetime.datetime | None, int], PullRequestCheckpoint],
+    ) -> datetime.datetime | None:
+        """Stores every pull request from offset on that was updated after stop_at.
+
+        Each page is committed with the checkpoint get_checkpoint returns for
+        the newest updated_at seen and the offset after the page. Every page
+        is fetched through the GitHub executor, so a token pool picks the
+        token and retries rate limited pages on another one.
+
+        Returns:
+            datetime.datetime | None: The newest updated_at seen, if any.
+        """
+        newest: datetime.datetime | None = None
+        while True:
+            page: list[GithubPullRequest]
+            page_size: int
+            page, page_size = await helper_github.github_executor.run_with_client(
+                self.client,
+                fetch_pull_request_page,
+                repo_path=self.repo_path,
+                offset=offset,
+            )
+            if not page:
+                return newest
+
+            if newest is None:
+                newest = page[0].updated_at
+
+            fresh: list[GithubPullRequest] = [
+                pull_request
+                for pull_request in page
+                if stop_at is None or pull_request.updated_at > stop_at
+            ]
+            offset = (offset // page_size + 1) * page_size
+            saved_count: int = await helper_db.async_save_pull_requests(
+                pull_requests=[
+                    PullRequest.from_pull_request(
+                        repo_path=self.repo_path,
+                        pull_request=pull_request,
+                    )
+                    for pull_request in fresh
+                ],
+                checkpoint=get_checkpoint(newest, offset),
+            )
+            await self.on_page(saved_count)
+            if len(fresh) < len(page) or len(page) < page_size:
+                return newest
+
+    async def run(
+        self: _RepoHarvest,
+    ) -> None:
+        """Harvests the pull requests updated since the last completed harvest.
+
+        Pull requests are listed by updated_at, newest first, so the scan can
+        stop at the first one at or before the checkpoint. An interrupted
+        harvest first catches up on what was updated since it started, which
+        lists in front of it, then resumes at its offset. Pull requests only
+        ever move to the front of the list, so nothing behind the offset is
+        skipped.
+        """
+        checkpoint: PullRequestCheckpoint | None = (
+            await helper_db.async_fetch_pull_request_checkpoint(
+                repo_path=self.repo_path,
+            )
+        )
+        updated_at: datetime.datetime | None = (
+            None if checkpoint is None else _as_utc(checkpoint.updated_at)
+        )
+        run_updated_at: datetime.datetime | None = (
+            None if checkpoint is None else _as_utc(checkpoint.run_updated_at)
+        )
+        run_offset: int | None = None if checkpoint is None else checkpoint.run_offset
+        if run_offset is not None and run_updated_at is not None:
+            interrupted_run_updated_at: datetime.datetime = run_updated_at
+            interrupted_run_offset: int = run_offset
+            newest: datetime.datetime | None = await self._scan(
+                offset=0,
+                stop_at=interrupted_run_updated_at,
+                get_checkpoint=lambda _newest, _offset: PullRequestCheckpoint(
+                    repo_path=self.repo_path,
+                    updated_at=updated_at,
+                    run_updated_at=interrupted_run_updated_at,
+                    run_offset=interrupted_run_offset,
+                ),
+            )
+            run_updated_at = max(newest or run_updated_at, run_updated_at)
+
+        else:
+            run_offset = 0
+            run_updated_at = None
+
+        newest = await self._scan(
+            offset=run_offset,
+            stop_at=updated_at,
+            get_checkpoint=lambda newest, offset: PullRequestCheckpoint(
+                repo_path=self.repo_path,
+                updated_at=updated_at,
+                run_updated_at=run_updated_at or newest,
+                run_offset=offset,
+            ),
+        )
+        await helper_db.async_save_pull_requests(
+            pull_requests=[],
+            checkpoint=PullRequestCheckpoint(
+                repo_path=self.repo_path,
+                updated_at=max(
+                    (
+                        value
+                        for value in (run_updated_at, newest, updated_at)
+                        if value is not None
+                    ),
+                    default=None,
+                ),
+            ),
+        )
+
+
+async def harvest_pull_requests(
+    repo_paths: list[str],
+    client: Github | GithubTokenPool | None,
+    concurrency: int,
+    on_progress: Callable[[HarvestProgress], Awaitable[None]],
+) -> HarvestProgress:
+    """Harvests the pull requests of concurrency repos at a time.
+
+    A repo that fails keeps its checkpoint, so the next harvest resumes it.
+    on_progress is awaited after every page and every repo.
+    """
+    span_name: str = f"{SPAN_KEY}-harvest_pull_requests"
+    with tracer.start_as_current_span(span_name) as span:
+        progress: HarvestProgress = HarvestProgress(
+            total=len(repo_paths),
+        )
+        semaphore: asyncio.Semaphore = asyncio.Semaphore(concurrency)
+
+        async def on_page(
+            pull_request_count: int,
+        ) -> None:
+            progress.pull_requests += pull_request_count
+            await on_progress(progress)
+
+        async def harvest(
+            repo_path: str,
+        ) -> None:
+            async with semaphore:
+                repo: Repository | None = await async_fetch_repo(
+                    repo_path=repo_path,
+                    client=client,
+                )
+                if repo is None:
+                    progress.failed += 1
+                    span.add_event(
+                        name="repo-not_found",
+                        attributes={
+                            "repo_path": repo_path,
+                        },
+                    )
+
+                else:
+                    try:
+                        await _RepoHarvest(
+                            repo=repo,
+                            client=client,
+                            on_page=on_page,
+                        ).run()
+                        progress.harvested += 1
+
+                    except GithubException as e:
+                        span.record_exception(e)
+                        progress.failed += 1
+
+            await on_progress(progress)
+
+        await asyncio.gather(*(harvest(repo_path) for repo_path in repo_paths))
+        span.add_event(
+            name="harvest_pull_requests-completed",
+            attributes={
+                "progress": str(progress),
+            },
+        )
+        return progress
@@ -0,0 +1,302 @@
+from __future__ import annotations
+
+import asyncio
+import datetime
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any, Callable
+
+import httpx
+from github.GithubException import GithubException
+from sqlalchemy.exc import SQLAlchemyError
+
+from hackathon import helper_db, helper_github
+from hackathon.models.project import Project
+from hackathon.otel import tracer
+
+from .helper_chroma import chroma_add_projects
+from .helper_github import async_fetch_repositories
+from .helper_perplexity import get_cached_description, perplexity_get_repo
+
+if TYPE_CHECKING:
+    import chromadb.api.client
+    from github import Github
+    from opentelemetry.trace import Span
+
+    from hackathon import helper_perplexity
+    from hackathon.helper_github import GithubTokenPool
+    from hackathon.helper_utils import TokenBucket
+
+SPAN_KEY: str = "refresh"
+REFRESHED_FIELDS: tuple[str, ...] = (
+    "stars",
+    "language",
+    "website",
+    "description",
+)
+
+
+@dataclass
+class RefreshPolicy:
+    hot_stars: int
+    hot_interval: datetime.timedelta
+    cold_interval: datetime.timedelta
+    batch_size: int
+
+
+@dataclass
+class RefreshBudget:
+    """Caps the requests per second the refresh may spend on each API."""
+
+    github: TokenBucket
+    perplexity: TokenBucket
+
+
+@dataclass
+class RefreshResult:
+    refreshed: int = 0
+    changed: int = 0
+    reembedded: int = 0
+    missing: int = 0
+    failed: int = 0
+
+    def __str__(
+        self: RefreshResult,
+    ) -> str:
+        return (
+            f"{self.refreshed} refreshed, {self.changed} changed, "
+            f"{self.reembedded} re-embedded, {self.missing} missing, "
+            f"{self.failed} failed"
+        )
+
+
+def get_project_changes(
+    project: Project,
+    fetched_project: Project,
+) -> dict[str, Any]:
+    return {
+        field: getattr(fetched_project, field)
+        for field in REFRESHED_FIELDS
+        if getattr(fetched_project, field) != getattr(project, field)
+    }
+
+
+async def get_refreshed_description(
+    project: Project,
+    fetched_project: Project,
+    client: helper_perplexity.Client | None,
+    budget: RefreshBudget,
+) -> str:
+    """The description the project would get if it were imported today.
+
+    With Perplexity, that is the cached Perplexity description, so the API is
+    only called again once the cache entry expired, and the current
+    description is kept when the call fails. Without it, it is the GitHub one.
+    """
+    if client is None:
+        return fetched_project.description
+
+    description: str | None = await asyncio.to_thread(
+        get_cached_description,
+        project.repo_url,
+    )
+    if description is not None:
+        return description
+
+    await budget.perplexity.acquire()
+    try:
+        description = await perplexity_get_repo(
+            repo_url=project.repo_url,
+            client=client,
+        )
+
+    except (TimeoutError, httpx.HTTPError):
+        return project.description
+
+    return project.description if description is None else description
+
+
+async def save_project_changes_per_row(
+    changes: dict[int, dict[str, Any]],
+    refreshed_at: datetime.datetime,
+    span: Span,
+) -> tuple[int, set[int]]:
+    """Saves the changes in one commit, or row by row when that fails.
+
+    A row whose changes cannot be written still gets its refreshed_at, so it
+    waits for its next refresh interval instead of failing the next batch
+    again.
+
+    Returns:
+        tuple[int, set[int]]: The number of projects with changed columns,
+            and the ids of the projects whose changes were not written.
+    """
+    try:
+        return (
+            await helper_db.async_save_project_changes(
+                changes=changes,
+                refreshed_at=refreshed_at,
+            ),
+            set(),
+        )
+
+    except SQLAlchemyError as e:
+        span.record_exception(e)
+
+    changed_count: int = 0
+    failed_project_ids: set[int] = set()
+    for project_id, project_changes in changes.items():
+        try:
+            changed_count += await helper_db.async_save_project_changes(
+                changes={
+                    project_id: project_changes,
+                },
+                refreshed_at=refreshed_at,
+            )
+            continue
+
+        except SQLAlchemyError as e:
+            span.record_exception(
+                exception=e,
+                attributes={
+                    "project_id": project_id,
+                },
+            )
+            failed_project_ids.add(project_id)
+
+        if not project_changes:
+            continue
+
+        try:
+            await helper_db.async_save_project_changes(
+                changes={
+                    project_id: {},
+                },
+                refreshed_at=refreshed_at,
+            )
+
+        except SQLAlchemyError as e:
+            span.record_exception(e)
+
+    return changed_count, failed_project_ids
+
+
+async def refresh_projects(  # trunk-ignore(ruff/PLR0913)
+    policy: RefreshPolicy,
+    budget: RefreshBudget,
+    github_client: Github | GithubTokenPool,
+    perplexity_client: helper_perplexity.Client | None,
+    chroma_client: chromadb.api.client.Client | None,
+    on_changed: Callable[[str, dict[str, Any]], None],
+) -> RefreshResult:
+    """Refreshes the batch of projects that is most overdue.
+
+    The whole batch is fetched with one GraphQL request and only the columns
+    that changed are written back, together with refreshed_at, in one commit.
+    Only projects whose description changed are embedded again. on_changed
+    is called with the repo path and the changes of every changed project.
+
+    Failures are isolated so the loop keeps moving. When the GraphQL request
+    fails for another reason than the rate limit, the batch is stamped as
+    refreshed without changes. When the
+    commit fails, the rows are written one by one, see
+    save_project_changes_per_row.
+    """
+    span_name: str = f"{SPAN_KEY}-refresh_projects"
+    with tracer.start_as_current_span(span_name) as span:
+        now: datetime.datetime = datetime.datetime.now(datetime.timezone.utc)
+        projects: list[Project] = (
+            await helper_db.async_fetch_projects_due_for_refresh(
+                now=now,
+                hot_stars=policy.hot_stars,
+                hot_interval=policy.hot_interval,
+                cold_interval=policy.cold_interval,
+                limit=policy.batch_size,
+            )
+        )
+        result: RefreshResult = RefreshResult()
+        if not projects:
+            return result
+
+        await budget.github.acquire()
+        repositories: dict[str, dict[str, Any] | None] | None = None
+        try:
+            repositories = await async_fetch_repositories(
+                repo_paths=[str(project.repo_path) for project in projects],
+                client=github_client,
+            )
+
+        except GithubException as e:
+            span.record_exception(e)
+            if helper_github.is_rate_limited(e):
+                raise
+
+        changes: dict[int, dict[str, Any]] = {}
+        reembedded_projects: list[Project] = []
+        for project in projects:
+            project_changes: dict[str, Any] = {}
+            if repositories is None:
+                result.failed += 1
+                changes[project.id] = project_changes  # trunk-ignore(pyright/reportArgumentType)
+                continue
+
+            repository: dict[str, Any] | None = repositories.get(str(project.repo_path))
+            if repository is None:
+                result.missing += 1
+
+            else:
+                fetched_project: Project = Project.from_graphql(
+                    repository=repository,
+                )
+                fetched_project.description = await get_refreshed_description(
+                    project=project,
+                    fetched_project=fetched_project,
+                    client=perplexity_client,
+                    budget=budget,
+                )
+                project_changes = get_project_changes(
+                    project=project,
+                    fetched_project=fetched_project,
+                )
+
+            changes[project.id] = project_changes  # trunk-ignore(pyright/reportArgumentType)
+            if not project_changes:
+                continue
+
+            for field, value in project_changes.items():
+                setattr(project, field, value)
+
+        result.refreshed = len(changes)
+        failed_project_ids: set[int]
+        result.changed, failed_project_ids = await save_project_changes_per_row(
+            changes=changes,
+            refreshed_at=now,
+            span=span,
+        )
+        result.failed += len(failed_project_ids)
+        for project in projects:
+            if project.id in failed_project_ids:
+                continue
+
+            if project_changes := changes.get(project.id):  # trunk-ignore(pyright/reportArgumentType)
+                on_changed(str(project.repo_path), project_changes)
+                if "description" in project_changes:
+                    reembedded_projects.append(project)
+
+        if chroma_client is not None and reembedded_projects:
+            try:
+                result.reembedded = await asyncio.to_thread(
+                    chroma_add_projects,
+                    reembedded_projects,
+                    chroma_client,
+                )
+
+            except Exception as e:  # trunk-ignore(ruff/BLE001)
+                span.record_exception(e)
+
+        span.add_event(
+            name="refresh_projects-completed",
+            attributes={
+                "result": str(result),
+            },
+        )
+        return result
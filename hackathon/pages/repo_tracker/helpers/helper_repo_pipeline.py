@@ -0,0 +1,150 @@
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import time
+from typing import TYPE_CHECKING, Any, Iterator
+
+from github.GithubException import GithubException
+
+from hackathon.models.project import Project
+from hackathon.otel import tracer
+
+from .helper_chroma import chroma_add_project
+from .helper_github import async_fetch_repo, async_fetch_repositories
+from .helper_perplexity import perplexity_get_repo
+
+if TYPE_CHECKING:
+    import chromadb.api.client
+    from github import Github
+    from github.Repository import Repository
+    from opentelemetry.trace import Span
+
+    from hackathon import helper_perplexity
+    from hackathon.helper_github import GithubTokenPool
+
+SPAN_KEY: str = "repo_pipeline"
+
+
+@contextlib.contextmanager
+def pipeline_stage(
+    stage: str,
+    repo_path: str,
+) -> Iterator[Span]:
+    """Wraps one stage of the repo pipeline in its own span with its duration."""
+    with tracer.start_as_current_span(f"{SPAN_KEY}-{stage}") as span:
+        start: float = time.perf_counter()
+        try:
+            yield span
+
+        finally:
+            span.add_event(
+                name=f"{stage}-completed",
+                attributes={
+                    "repo_path": repo_path,
+                    "duration_ms": (time.perf_counter() - start) * 1000,
+                },
+            )
+
+
+async def fetch_project(
+    repo_path: str,
+    client: Github | GithubTokenPool | None,
+) -> Project | None:
+    with pipeline_stage(
+        stage="fetch",
+        repo_path=repo_path,
+    ):
+        repo: Repository | None = await async_fetch_repo(
+            repo_path=repo_path,
+            client=client,
+        )
+        if repo is None:
+            return None
+
+        return Project.from_repo(
+            repo=repo,
+        )
+
+
+async def fetch_projects(
+    repo_paths: list[str],
+    client: Github | GithubTokenPool | None,
+) -> dict[str, Project | None]:
+    """fetch_project for many repos, with one GraphQL request per batch of repos.
+
+    Falls back to one REST request per repo when GraphQL is not available,
+    e.g. for a client without a token.
+    """
+    span_name: str = f"{SPAN_KEY}-fetch_projects"
+    with tracer.start_as_current_span(span_name) as span:
+        try:
+            repositories: dict[str, dict[str, Any] | None] = (
+                await async_fetch_repositories(
+                    repo_paths=repo_paths,
+                    client=client,
+                )
+            )
+
+        except GithubException as e:
+            span.record_exception(e)
+            projects: list[Project | None] = await asyncio.gather(
+                *(
+                    fetch_project(
+                        repo_path=repo_path,
+                        client=client,
+                    )
+                    for repo_path in repo_paths
+                ),
+            )
+            return dict(zip(repo_paths, projects))
+
+        span.add_event(
+            name="fetch_projects-completed",
+            attributes={
+                "repo_count": len(repo_paths),
+                "repo_count-found": sum(
+                    repository is not None for repository in repositories.values()
+                ),
+            },
+        )
+        return {
+            repo_path: None
+            if repository is None
+            else Project.from_graphql(
+                repository=repository,
+            )
+            for repo_path, repository in repositories.items()
+        }
+
+
+async def describe_project(
+    project: Project,
+    client: helper_perplexity.Client | None,
+) -> str | None:
+    with pipeline_stage(
+        stage="describe",
+        repo_path=str(project.repo_path),
+    ):
+        return await perplexity_get_repo(
+            repo_url=project.repo_url,
+            client=client,
+        )
+
+
+async def index_project(
+    project: Project,
+    client: chromadb.api.ClientAPI | None,
+) -> None:
+    with pipeline_stage(
+        stage="index",
+        repo_path=str(project.repo_path),
+    ):
+        if client is None:
+            return
+
+        await asyncio.to_thread(
+            chroma_add_project,
+            project,
+            client,
+        )
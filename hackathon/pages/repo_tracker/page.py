@@ -2,13 +2,20 @@
 from __future__ import annotations
 
 import reflex as rx
-from reflex_ag_grid import ag_grid
+from reflex_ag_grid import Datasource, ag_grid
 
 from hackathon.models.project import Project
 from hackathon.pages.repo_tracker.constants import (
+    AG_GRID_CACHE_BLOCK_SIZE,
     AG_GRID_ID,
+    AG_GRID_MAX_BLOCKS_IN_CACHE,
+    AG_GRID_SERVER_SIDE_ROW_MODEL,
     AG_GRID_THEME,
+    BULK_IMPORT_FILE_DIRECTORY,
     DEFAULT_DISTANCE_THRESHOLD_FOR_VECTOR_SEARCH,
+    PROJECT_LOAD_PAGE_SIZE,
+    PROJECT_ROWS_ROUTE,
+    REPO_BULK_IMPORT_INPUT_ID,
     REPO_FILTER_INPUT_ID,
     REPO_SEARCH_INPUT_ID,
     REPO_SIMILARITY_THRESHOLD_MAX,
@@ -17,10 +24,45 @@ from hackathon.pages.repo_tracker.constants import (
 )
 from hackathon.pages.repo_tracker.state import State
 from hackathon.pages.repo_tracker.state_grid_filter import FilterGridState
+from hackathon.pages.repo_tracker.state_repo import RepoState
 
 AG_GRID_COLUMN_DEFINITIONS = Project.get_ag_grid_column_definitions()
 
 
+def project_grid() -> rx.Component:
+    if AG_GRID_SERVER_SIDE_ROW_MODEL:
+        return ag_grid(
+            id=AG_GRID_ID,
+            column_defs=AG_GRID_COLUMN_DEFINITIONS,
+            row_model_type="infinite",
+            datasource=Datasource(
+                endpoint_uri=PROJECT_ROWS_ROUTE,
+            ),
+            cache_block_size=AG_GRID_CACHE_BLOCK_SIZE,
+            max_blocks_in_cache=AG_GRID_MAX_BLOCKS_IN_CACHE,
+            on_selection_changed=FilterGridState.event_selected_ag_grid_row,
+            theme=AG_GRID_THEME,
+            width="100%",
+            height="60vh",
+        )
+
+    return ag_grid(
+        id=AG_GRID_ID,
+        column_defs=AG_GRID_COLUMN_DEFINITIONS,
+        row_data=FilterGridState.display_data,
+        pagination=True,
+        pagination_page_size=100,
+        pagination_page_size_selector=[
+            50,
+            100,
+        ],
+        on_selection_changed=FilterGridState.event_selected_ag_grid_row,
+        theme=AG_GRID_THEME,
+        width="100%",
+        height="60vh",
+    )
+
+
 def index() -> rx.Component:
     return rx.vstack(
         rx.hstack(
@@ -83,25 +125,44 @@ def index() -> rx.Component:
                     resize="horizontal",
                 ),
             ),
+            rx.vstack(
+                rx.text_area(
+                    id=REPO_BULK_IMPORT_INPUT_ID,
+                    value=RepoState.bulk_import_sources,
+                    placeholder=(
+                        "Repo urls, org:<name> or topic:<name>"
+                        if BULK_IMPORT_FILE_DIRECTORY is None
+                        else "Repo urls, org:<name>, topic:<name> or file:<name>"
+                    ),
+                    on_change=RepoState.bulk_import_sources_setter,
+                    width="100%",
+                    min_width="300px",
+                    min_height="100px",
+                    resize="vertical",
+                ),
+                rx.button(
+                    "Bulk import repos",
+                    on_click=RepoState.event_bulk_import_repos,
+                ),
+                rx.text(RepoState.bulk_import_progress),
+                rx.button(
+                    "Harvest pull requests",
+                    on_click=RepoState.event_harvest_pull_requests,
+                ),
+                rx.text(RepoState.pull_request_harvest_progress),
+            ),
             rx.spacer(),
-            rx.fragment(FilterGridState.repo_card_stats),
-            rx.fragment(FilterGridState.repo_card_description),
+            rx.fragment(FilterGridState.ui_repo_card_stats),
+            rx.fragment(FilterGridState.ui_repo_card_description),
             width="100%",
         ),
-        ag_grid(
-            id=AG_GRID_ID,
-            column_defs=AG_GRID_COLUMN_DEFINITIONS,
-            row_data=FilterGridState.display_data,
-            pagination=True,
-            pagination_page_size=100,
-            pagination_page_size_selector=[
-                50,
-                100,
-            ],
-            on_selection_changed=FilterGridState.event_selected_ag_grid_row,
-            theme=AG_GRID_THEME,
-            width="100%",
-            height="60vh",
+        project_grid(),
+        rx.cond(
+            PROJECT_LOAD_PAGE_SIZE is not None,
+            rx.button(
+                "Load more repos",
+                on_click=RepoState.event_load_next_project_page,
+            ),
         ),
         width="80%",
         margin="0 auto",
@@ -0,0 +1,143 @@
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import datetime
+from typing import TYPE_CHECKING, Any, AsyncIterator
+
+from hackathon import helper_github
+from hackathon.app_state import (
+    AppState,
+    ClientType,
+    clients_lifespan,
+    project_registry,
+)
+from hackathon.helper_utils import TokenBucket
+from hackathon.otel import tracer
+
+from .constants import (
+    REFRESH_BATCH_SIZE,
+    REFRESH_COLD_INTERVAL_SECONDS,
+    REFRESH_ENABLED,
+    REFRESH_GITHUB_QPS,
+    REFRESH_HOT_INTERVAL_SECONDS,
+    REFRESH_HOT_STARS,
+    REFRESH_IDLE_SECONDS,
+    REFRESH_PERPLEXITY_QPS,
+)
+from .helpers.helper_refresh import (
+    RefreshBudget,
+    RefreshPolicy,
+    RefreshResult,
+    refresh_projects,
+)
+
+if TYPE_CHECKING:
+    from hackathon.models.project import Project
+
+SPAN_KEY: str = "refresh"
+
+REFRESH_POLICY: RefreshPolicy = RefreshPolicy(
+    hot_stars=REFRESH_HOT_STARS,
+    hot_interval=datetime.timedelta(seconds=REFRESH_HOT_INTERVAL_SECONDS),
+    cold_interval=datetime.timedelta(seconds=REFRESH_COLD_INTERVAL_SECONDS),
+    batch_size=REFRESH_BATCH_SIZE,
+)
+
+
+def apply_project_changes(
+    repo_path: str,
+    changes: dict[str, Any],
+) -> None:
+    """Mirrors refreshed columns onto the project loaded in the registry."""
+    project: Project | None = project_registry.find(
+        repo_path=repo_path,
+    )
+    if project is None:
+        return
+
+    for field, value in changes.items():
+        setattr(project, field, value)
+
+    project_registry.reindex(project)
+
+
+async def run_refresh_loop(
+    policy: RefreshPolicy,
+    budget: RefreshBudget,
+) -> None:
+    """Refreshes projects batch after batch, and idles once none are due.
+
+    The refresh fetches through the GraphQL API, which needs a token, so
+    without an authenticated GitHub client the loop does not run at all.
+    """
+    github_client = AppState.get_client(
+        client_type=ClientType.GITHUB,
+    )
+    if not helper_github.is_authenticated(github_client):
+        with tracer.start_as_current_span(f"{SPAN_KEY}-run_refresh_loop") as span:
+            span.add_event(
+                name="run_refresh_loop-skipped",
+                attributes={
+                    "reason": "no authenticated github client",
+                },
+            )
+        return
+
+    while True:
+        result: RefreshResult = RefreshResult()
+        with tracer.start_as_current_span(f"{SPAN_KEY}-run_refresh_loop") as span:
+            try:
+                result = await refresh_projects(
+                    policy=policy,
+                    budget=budget,
+                    github_client=github_client,
+                    perplexity_client=AppState.get_client(
+                        client_type=ClientType.PERPLEXITY,
+                    ),
+                    chroma_client=AppState.get_client(
+                        client_type=ClientType.CHROMA,
+                    ),
+                    on_changed=apply_project_changes,
+                )
+
+            except Exception as e:  # trunk-ignore(ruff/BLE001)
+                span.record_exception(e)
+
+        if result.refreshed < policy.batch_size:
+            await asyncio.sleep(REFRESH_IDLE_SECONDS)
+
+
+@contextlib.asynccontextmanager
+async def refresh_lifespan() -> AsyncIterator[None]:
+    """Keeps project stats fresh in the background while the app is up.
+
+    The refresh loop runs inside clients_lifespan, so it is cancelled before
+    the clients it uses are closed. Reflex keeps lifespan tasks in a set, so
+    registering both would leave their teardown order undefined.
+    """
+    async with clients_lifespan():
+        if not REFRESH_ENABLED:
+            yield
+            return
+
+        task: asyncio.Task = asyncio.create_task(
+            run_refresh_loop(
+                policy=REFRESH_POLICY,
+                budget=RefreshBudget(
+                    github=TokenBucket(
+                        rate=REFRESH_GITHUB_QPS,
+                    ),
+                    perplexity=TokenBucket(
+                        rate=REFRESH_PERPLEXITY_QPS,
+                    ),
+                ),
+            ),
+        )
+        try:
+            yield
+
+        finally:
+            task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await task
@@ -6,10 +6,14 @@ from typing import TYPE_CHECKING, AsyncGenerator, Generator
 import chromadb
 import chromadb.api
 import reflex as rx
-from sqlalchemy import select
 
-from hackathon import helper_chroma, helper_github, helper_perplexity
-from hackathon.app_state import AppState
+from hackathon import helper_chroma, helper_github
+from hackathon.app_state import (
+    AppState,
+    ClientType,
+    project_registry,
+    submit_project,
+)
 from hackathon.models.project import Project
 from hackathon.otel import tracer
 from hackathon.tokens import TOKENS
@@ -24,13 +28,17 @@ from .constants import (
     NUMBER_OF_RESULTS_TO_DISPLAY_FOR_VECTOR_SEARCH,
     NUMBER_OF_WORDS_TO_DISPLAY_FOR_REPO_DESCRIPTION,
 )
-from .helpers.helper_chroma import chroma_add_project, chroma_get_projects
-from .helpers.helper_perplexity import perplexity_get_repo
+from .helpers.helper_chroma import chroma_get_projects
+from .helpers.helper_repo_pipeline import (
+    describe_project,
+    fetch_project,
+    index_project,
+    pipeline_stage,
+)
 
 if TYPE_CHECKING:
     import chromadb.api.client
     import github
-    from sqlalchemy.orm import Session
 
 CHROMA_CLIENT: chromadb.api.ClientAPI | None = helper_chroma.set_up_client_from_tokens(
     tokens=TOKENS,
@@ -38,11 +46,6 @@ CHROMA_CLIENT: chromadb.api.ClientAPI | None = helper_chroma.set_up_client_from_
 GITHUB_CLIENT: github.Github | None = helper_github.set_up_client_from_tokens(
     tokens=TOKENS,
 )
-PERPLEXITY_CLIENT: helper_perplexity.Client | None = (
-    helper_perplexity.set_up_client_from_tokens(
-        tokens=TOKENS,
-    )
-)
 
 
 class State(rx.State):
@@ -70,20 +73,11 @@ class State(rx.State):
 
     @staticmethod
     def _find_project_index_using_repo_path(
-        projects: list[Project],
         repo_path: str | None,
     ) -> int | None:
-        if repo_path is None:
-            return None
-
-        first_index = next(
-            (i for i in range(len(projects)) if projects[i].repo_path == repo_path),
-            None,
+        return project_registry.find_index(
+            repo_path=repo_path,
         )
-        if first_index is None:
-            return None
-
-        return first_index
 
     @rx.var(cache=True)
     def has_selected_data(
@@ -95,20 +89,22 @@ class State(rx.State):
     def display_data(
         self,
     ) -> list[dict]:
-        return [AppState.projects[i].to_ag_grid_dict() for i in self.display_data_indices]
+        return [
+            project.to_ag_grid_dict()
+            for i in self.display_data_indices
+            if (project := project_registry[i]) is not None
+        ]
 
     @rx.var
     def repo_card_stats(
         self,
     ) -> rx.Component:
-        project_index: int | None = State._find_project_index_using_repo_path(
-            projects=AppState.projects,
+        project: Project | None = project_registry.find(
             repo_path=self.ag_grid_selection_repo_path,
         )
-        if project_index is None:
+        if project is None:
             return rx.fragment(repo_card_skeleton())
 
-        project: Project = AppState.projects[project_index]
         return rx.fragment(
             repo_card_stats_component(
                 repo_path=project.repo_path,
@@ -123,16 +119,14 @@ class State(rx.State):
     def repo_card_description(
         self,
     ) -> rx.Component:
-        project_index: int | None = State._find_project_index_using_repo_path(
-            projects=AppState.projects,
+        project: Project | None = project_registry.find(
             repo_path=self.ag_grid_selection_repo_path,
         )
-        if project_index is None:
+        if project is None:
             return rx.fragment(
                 repo_card_skeleton(),
             )
 
-        project: Project = AppState.projects[project_index]
         description: str = str(project.description)
         if first_n_words_from_description := " ".join(
             project.description.split()[
@@ -234,29 +228,7 @@ class State(rx.State):
     ) -> None:
         span_name: str = "event_add_project_to_display_data"
         with tracer.start_as_current_span(span_name) as span:
-
-            def add_project() -> int:
-                span.add_event(
-                    name="project-add_project-started",
-                    attributes={
-                        "project_repo_path": str(project.repo_path),
-                    },
-                )
-                AppState.projects.append(project)
-                project_index = self._find_project_index_using_repo_path(
-                    projects=AppState.projects,
-                    repo_path=project.repo_path,
-                )
-                if project_index is None:
-                    error_msg: str = (
-                        f"Project should be non null and found in projects: {project.repo_path}"
-                    )
-                    raise AssertionError(error_msg)
-
-                return project_index
-
             project_index: int | None = self._find_project_index_using_repo_path(
-                projects=AppState.projects,
                 repo_path=project.repo_path,
             )
             span.add_event(
@@ -273,7 +245,7 @@ class State(rx.State):
                         "project_repo_path": str(project.repo_path),
                     },
                 )
-                project_index = add_project()
+                project_index = project_registry.append(project)
                 span.add_event(
                     name="project-add_project-completed",
                     attributes={
@@ -308,140 +280,42 @@ class State(rx.State):
                     },
                 )
 
-    def _save_projects_to_db(
-        self,
-        projects: list[Project],
-    ) -> Generator[None, None, None]:
-        def filter_projects_to_save(
-            db: Session,
-            projects: list[Project],
-        ) -> list[Project]:
-            span_name: str = "event_get_new_projects"
-            with tracer.start_as_current_span(span_name) as span:
-                span.add_event(
-                    name="get_new_projects-started",
-                    attributes={
-                        "project_count-to_commit": len(projects),
-                    },
-                )
-                existing_repo_paths: set[str] = {
-                    str(path[0])
-                    for path in db.query( # trunk-ignore(pyright/reportCallIssue)
-                        Project.repo_path, # trunk-ignore(pyright/reportArgumentType)
-                    ).all()
-                }
-                span.add_event(
-                    name="get_new_projects-existing_repo_paths",
-                    attributes={
-                        "existing_repo_paths": str(existing_repo_paths),
-                        "existing_repo_path_count": len(existing_repo_paths),
-                        "existing_repo_path_type": str(type(existing_repo_paths)),
-                    },
-                )
-                new_projects: list[Project] = [
-                    project
-                    for project in projects
-                    if str(project.repo_path) not in existing_repo_paths
-                ]
-                span.add_event(
-                    name="get_new_projects-completed",
-                    attributes={
-                        "project_count-to_save": len(new_projects),
-                    },
-                )
-                return new_projects
-
-        span_name: str = "event_save_projects_to_db"
-        with tracer.start_as_current_span(span_name) as span, rx.session() as session:
-            if not projects:
-                span.add_event(
-                    name="db-projects-no_projects_to_save",
-                )
-                yield
-                return
-
-            projects_to_save: list[Project] = filter_projects_to_save(
-                db=session,
-                projects=projects,
-            )
-            span.add_event(
-                name="db-projects-projects_to_save",
-                attributes={
-                    "project_count": len(projects_to_save),
-                },
-            )
-            if len(projects_to_save) == 0:
-                span.add_event(
-                    name="db-projects-no_new_projects_to_save",
-                )
-                if projects:
-                    first_repo, *_ = projects
-                    span.add_event(
-                        name="db-projects-repo_already_saved",
-                        attributes={
-                            "repo_path": str(first_repo.repo_path),
-                        },
-                    )
-
-                yield
-                return
-
-            session.bulk_save_objects(projects_to_save)
-            session.commit()
-            span.add_event(
-                name="db-projects-added_to_db",
-                attributes={
-                    "project_count": len(projects_to_save),
-                },
-            )
-            yield
-
     def save_project(
         self,
         project: Project,
-    ) -> Generator[None, None, None]:
-        span_name: str = "event_save_project"
-        with tracer.start_as_current_span(span_name) as span:
-            AppState.projects_to_commit.append(project)
-            span.add_event(
-                name="projects_to_commit-added_project",
-                attributes={
-                    "project_repo_path": str(project.repo_path),
-                },
-            )
-            yield from self._save_projects_to_db(
-                projects=AppState.projects_to_commit,
-            )
-
-            span.add_event(
-                name="projects_to_commit-saved_to_db",
-            )
-            AppState.projects_to_commit.clear()
-            span.add_event(
-                name="projects_to_commit-cleared",
-            )
+    ) -> Generator[rx.Component | None, None, None]:
+        """Queues the project for the next write batch, see submit_project."""
+        yield submit_project(
+            project=project,
+            span_name="event_save_project",
+        )
 
     @rx.background
     async def event_github_repo_getter(
         self,
     ) -> AsyncGenerator[rx.Component | None, None]:
+        """Fetches, describes, saves and indexes one repo.
+
+        Only the short state mutations between the network stages hold the
+        state lock.
+        """
         span_name: str = "event_fetch_repo_and_submit"
-        async with self:
-            span = tracer.start_span(span_name)
+        with tracer.start_as_current_span(span_name) as span:
+            async with self:
+                repo_path: str = self.repo_path_search
+                self.clear_repo_path_search()
+
             repo_path_search: str = helper_github.extract_repo_path_from_url(
-                url=self.repo_path_search,
+                url=repo_path,
             )
-            client_github: github.Github = helper_github.check_client(
-                client=GITHUB_CLIENT,
-            )
-            repo: github.Repository | None = helper_github.fetch_repo(
+            project: Project | None = await fetch_project(
                 repo_path=repo_path_search,
-                client=client_github,
+                client=helper_github.check_client(
+                    client=GITHUB_CLIENT,
+                ),
             )
-            if repo is None:
+            if project is None:
                 span_event_name: str = "repo-not_found"
-                repo_path: str = self.repo_path_search
-                self.clear_repo_path_search()
                 span.add_event(
                     name=span_event_name,
                     attributes={
@@ -453,16 +327,6 @@ class State(rx.State):
                 )
                 return
 
-            span.add_event(
-                name="repo-found",
-                attributes={
-                    "repo_path": str(repo.full_name),
-                    "repo_description": str(repo.description),
-                },
-            )
-            project: Project = Project.from_repo(
-                repo=repo,
-            )
             span.add_event(
                 name="project-created_from_repo",
                 attributes={
@@ -474,28 +338,33 @@ class State(rx.State):
                     "project_created_at": str(project.created_at),
                 },
             )
-            self.add_project_to_display_data(project)
-            self.clear_repo_path_search()
-            yield
+            async with self:
+                self.add_project_to_display_data(project)
 
-            perplexity_description: str | None = await perplexity_get_repo(
-                repo_url=project.repo_url,
-                client=PERPLEXITY_CLIENT,
+            perplexity_description: str | None = await describe_project(
+                project=project,
+                client=AppState.get_client(
+                    client_type=ClientType.PERPLEXITY,
+                ),
             )
             if perplexity_description is not None:
-                project.set_description(
-                    description=perplexity_description,
-                )
-                yield
+                async with self:
+                    project.set_description(
+                        description=perplexity_description,
+                    )
+                    project_registry.reindex(project)
 
-            for _ in self.save_project(project):
-                yield
+            with pipeline_stage(
+                stage="save",
+                repo_path=str(project.repo_path),
+            ):
+                for event in self.save_project(project):
+                    yield event
 
-            chroma_add_project(
+            await index_project(
                 project=project,
                 client=CHROMA_CLIENT,
             )
-            yield
 
     def event_filter_grid_with_vector_search(
         self,
@@ -528,32 +397,9 @@ class State(rx.State):
                 index
                 for index in (
                     self._find_project_index_using_repo_path(
-                        projects=AppState.projects,
                         repo_path=repo_path,
                     )
                     for repo_path in project_repo_paths
                 )
                 if index is not None
             ]
-
-    def event_on_page_load(
-        self,
-    ) -> None:
-        span_name: str = "event_on_page_load"
-        with tracer.start_as_current_span(span_name) as span:
-            with rx.session() as session:
-                AppState.projects = (
-                    session.exec(  # trunk-ignore(pyright/reportCallIssue)
-                        statement=select(Project), # trunk-ignore(pyright/reportArgumentType)
-                    )
-                    .scalars()
-                    .all()
-                )
-
-            span.add_event(
-                name="projects-loaded",
-                attributes={
-                    "project_count": len(AppState.projects),
-                },
-            )
-            self.display_data_indices = list(range(len(AppState.projects)))
@@ -5,7 +5,7 @@ from typing import Generator
 
 import reflex as rx
 
-from hackathon.app_state import AppState
+from hackathon.app_state import project_registry
 from hackathon.models import Project  # trunk-ignore(ruff/TCH001)
 from hackathon.otel import tracer
 from hackathon.states.ag_grid_state import AgGridState
@@ -24,20 +24,11 @@ class GridState(AgGridState):
 
     @staticmethod
     def find_project_index_using_repo_path(
-        projects: list[Project],
         repo_path: str | None,
     ) -> int | None:
-        if repo_path is None:
-            return None
-
-        first_index = next(
-            (i for i in range(len(projects)) if projects[i].repo_path == repo_path),
-            None,
+        return project_registry.find_index(
+            repo_path=repo_path,
         )
-        if first_index is None:
-            return None
-
-        return first_index
 
     @rx.var(
         cache=True,
@@ -46,7 +37,9 @@ class GridState(AgGridState):
         self,
     ) -> list[dict]:
         return [
-            AppState.projects[i].to_ag_grid_dict() for i in self.display_data_indices
+            project.to_ag_grid_dict()
+            for i in self.display_data_indices
+            if (project := project_registry[i]) is not None
         ]
 
     @rx.var
@@ -81,7 +74,6 @@ class GridState(AgGridState):
             if rows and (repo_path := rows[0].get("repo_path")):
                 self.ag_grid_selection_index = (
                     GridState.find_project_index_using_repo_path(
-                        projects=AppState.projects,
                         repo_path=repo_path,
                     )
                 )
@@ -104,30 +96,9 @@ class GridState(AgGridState):
         span_name: str = "add_project_to_display"
         with tracer.start_as_current_span(span_name) as span:
 
-            def append_project() -> int:
-                span.add_event(
-                    name="add_project-started",
-                    attributes={
-                        "project_repo_path": str(project.repo_path),
-                    },
-                )
-                AppState.projects.append(project)
-                project_index = GridState.find_project_index_using_repo_path(
-                    projects=AppState.projects,
-                    repo_path=project.repo_path,
-                )
-                if project_index is None:
-                    error_msg: str = (
-                        f"Project should be non null and found in projects: {project.repo_path}"
-                    )
-                    raise AssertionError(error_msg)
-
-                return project_index
-
             def get_or_append_new_project() -> int:
                 project_index: int | None = (
                     GridState.find_project_index_using_repo_path(
-                        projects=AppState.projects,
                         repo_path=project.repo_path,
                     )
                 )
@@ -147,25 +118,14 @@ class GridState(AgGridState):
                         "project_repo_path": str(project.repo_path),
                     },
                 )
-                project_index = append_project()
+                project_index = project_registry.append(project)
                 span.add_event(
                     name="add_project-completed",
                     attributes={
                         "project_repo_path": str(project.repo_path),
+                        "project_index": str(project_index),
                     },
                 )
-                project_index = GridState.find_project_index_using_repo_path(
-                    projects=AppState.projects,
-                    repo_path=project.repo_path,
-                )
-                if project_index is None:
-                    error_msg: str = "Project index should be non-null after append"
-                    exception: AssertionError = AssertionError(error_msg)
-                    span.record_exception(
-                        exception=exception,
-                    )
-                    raise exception
-
                 return project_index
 
             project_index: int = get_or_append_new_project()
@@ -204,14 +164,12 @@ class GridState(AgGridState):
     def ui_repo_card_stats(
         self,
     ) -> rx.Component:
-        project_index: int | None = GridState.find_project_index_using_repo_path(
-            projects=AppState.projects,
+        project: Project | None = project_registry.find(
             repo_path=self.ag_grid_selection_repo_path,
         )
-        if project_index is None:
+        if project is None:
             return rx.fragment(repo_card_skeleton())
 
-        project: Project = AppState.projects[project_index]
         return rx.fragment(
             repo_card_stats_component(
                 repo_path=project.repo_path,
@@ -226,16 +184,14 @@ class GridState(AgGridState):
     def ui_repo_card_description(
         self,
     ) -> rx.Component:
-        project_index: int | None = GridState.find_project_index_using_repo_path(
-            projects=AppState.projects,
+        project: Project | None = project_registry.find(
             repo_path=self.ag_grid_selection_repo_path,
         )
-        if project_index is None:
+        if project is None:
             return rx.fragment(
                 repo_card_skeleton(),
             )
 
-        project: Project = AppState.projects[project_index]
         description: str = str(project.description)
         if first_n_words_from_description := " ".join(
             project.description.split()[
@@ -1,11 +1,12 @@
 # trunk-ignore-all(ruff/ANN10,ruff/ANN101,ruff/RUF012,trunk/ignore-does-nothing)
 from __future__ import annotations
 
-from typing import TYPE_CHECKING, Generator
+import asyncio
+from typing import TYPE_CHECKING, AsyncGenerator, Generator
 
-import reflex as rx
-
-from hackathon.app_state import AppState, ClientType
+from hackathon import helper_db, helper_search
+from hackathon.app_state import AppState, ClientType, project_registry
+from hackathon.models.project import Project  # trunk-ignore(ruff/TCH001)
 from hackathon.otel import tracer
 from hackathon.pages.repo_tracker.state_grid import GridState
 
@@ -18,9 +19,10 @@ from .constants import (
 )
 from .helpers.helper_chroma import chroma_get_projects
 
+SPAN_KEY: str = "filter_grid_state"
+
 
-class FilterGridState(rx.State):
-    default_span_name: str = "filter_grid_state"
+class FilterGridState(GridState):
     vector_search_distance_threshold: int = DEFAULT_DISTANCE_THRESHOLD_FOR_VECTOR_SEARCH
     vector_search_filter_text_current: str = ""
     vector_search_filter_text_most_recent: str = ""
@@ -30,7 +32,7 @@ class FilterGridState(rx.State):
         self,
         repo_path: str,
     ) -> Generator[None, None, None]:
-        span_name: str = f"{self.default_span_name}-repo_path_setter"
+        span_name: str = f"{SPAN_KEY}-repo_path_setter"
         with tracer.start_as_current_span(span_name) as span:
             self.repo_path = repo_path
             yield
@@ -45,7 +47,7 @@ class FilterGridState(rx.State):
     def repo_path_reseter(
         self,
     ) -> Generator[None, None, None]:
-        span_name: str = f"{self.default_span_name}-repo_path_reseter"
+        span_name: str = f"{SPAN_KEY}-repo_path_reseter"
         with tracer.start_as_current_span(span_name) as span:
             self.repo_path = ""
             yield
@@ -59,7 +61,7 @@ class FilterGridState(rx.State):
         value: list[int | float],
     ) -> Generator[None, None, None]:
         span_name: str = (
-            f"{self.default_span_name}-vector_search_distance_threshold_setter"
+            f"{SPAN_KEY}-vector_search_distance_threshold_setter"
         )
         with tracer.start_as_current_span(span_name) as span:
             vector_search_distance_threshold: int | float = value[0]
@@ -73,22 +75,22 @@ class FilterGridState(rx.State):
                 },
             )
 
-    def vector_search_distance_threshold_commiter(
+    async def vector_search_distance_threshold_commiter(
         self,
         value: list[int],
-    ) -> Generator[None, None, None]:
+    ) -> AsyncGenerator[None, None]:
         del value
         span_name: str = (
-            f"{self.default_span_name}-vector_search_distance_threshold_commiter"
+            f"{SPAN_KEY}-vector_search_distance_threshold_commiter"
         )
         with tracer.start_as_current_span(span_name) as span:
             vector_search_distance_threshold: int = (
                 self.vector_search_distance_threshold
             )
-            self._filter_grid_with_vector_search_distance_threshold(
+            async for _ in self._filter_grid_with_vector_search_distance_threshold(
                 vector_search_distance_threshold=vector_search_distance_threshold,
-            )
-            yield
+            ):
+                yield
 
             span.add_event(
                 name="vector_search_distance_threshold-committed",
@@ -101,7 +103,7 @@ class FilterGridState(rx.State):
         self,
         vector_search_filter_text_current: str,
     ) -> Generator[None, None, None]:
-        span_name: str = f"{self.default_span_name}-vector_search_filter_text_setter"
+        span_name: str = f"{SPAN_KEY}-vector_search_filter_text_setter"
         with tracer.start_as_current_span(span_name) as span:
             self.vector_search_filter_text_current = vector_search_filter_text_current
             yield
@@ -121,13 +123,13 @@ class FilterGridState(rx.State):
                 vector_search_filter_text_current
             )
 
-    def _event_filter_grid(
+    async def _event_filter_grid(
         self,
         vector_search_distance_threshold: int | None,
         vector_search_filter_text_current: str | None,
         vector_search_filter_text_most_recent: str | None,
-    ) -> Generator[None, None, None]:
-        span_name: str = f"{self.default_span_name}-event-filter_grid"
+    ) -> AsyncGenerator[None, None]:
+        span_name: str = f"{SPAN_KEY}-event-filter_grid"
         with tracer.start_as_current_span(span_name) as span:
             span.add_event(
                 name="filter_grid-queued",
@@ -144,7 +146,7 @@ class FilterGridState(rx.State):
                 },
             )
 
-            def filter_with_vector_search_distance_threshold(
+            async def filter_with_vector_search_distance_threshold(
                 vector_search_distance_threshold: int,
                 vector_search_filter_text_most_recent: str | None,
             ) -> list[int]:
@@ -166,24 +168,31 @@ class FilterGridState(rx.State):
                         "vector_search_filter_text_most_recent": vector_search_filter_text_most_recent,
                     },
                 )
-                distance_threshold: float = (
-                    FilterGridState.vector_search_distance_threshold / 100
-                )
+                distance_threshold: float = vector_search_distance_threshold / 100
                 chroma_client: chromadb.api.ClientAPI = ( # trunk-ignore(pyright/reportAssignmentType)
                     AppState.get_client(
                         client_type=ClientType.CHROMA,
                     )
                 )
-                chroma_get_projects(
+                repo_paths: list[str] = await asyncio.to_thread(
+                    chroma_get_projects,
                     repo_filter_vector_search_text=vector_search_filter_text_most_recent,
                     n_results=NUMBER_OF_RESULTS_TO_DISPLAY_FOR_VECTOR_SEARCH,
                     client=chroma_client,
                     distance_threshold=distance_threshold,
                 )
-                return []  # TODO(elvis): filter with chroma
-                # https://elvis.ai
+                return [
+                    index
+                    for index in (
+                        GridState.find_project_index_using_repo_path(
+                            repo_path=repo_path,
+                        )
+                        for repo_path in repo_paths
+                    )
+                    if index is not None
+                ]
 
-            def filter_with_vector_search_filter_text(
+            async def filter_with_vector_search_filter_text(
                 vector_search_filter_text_current: str,
                 # TODO(elvis): add a wrapper for this function that the component can call since it passes in a value
                 # https://elvis.ai
@@ -194,13 +203,58 @@ class FilterGridState(rx.State):
                         "vector_search_filter_text": vector_search_filter_text_current,
                     },
                 )
-                repo_paths: list[str] = []  # TODO(elvis): Use chroma
-                # https://elvis.ai
+                # Postgres answers from the GIN index on search_vector and
+                # also finds projects that are not paged into the registry
+                # yet, so they are added to it. On other databases only the
+                # BM25 ranking over the registry is left.
+                database_projects: list[Project] = (
+                    await helper_db.async_search_projects_by_keywords(
+                        query=vector_search_filter_text_current,
+                        limit=NUMBER_OF_RESULTS_TO_DISPLAY_FOR_VECTOR_SEARCH,
+                    )
+                )
+                project_registry.extend(database_projects)
+                database_repo_paths: list[str] = [
+                    str(project.repo_path) for project in database_projects
+                ]
+                registry_repo_paths: list[str] = project_registry.search(
+                    query=vector_search_filter_text_current,
+                    limit=NUMBER_OF_RESULTS_TO_DISPLAY_FOR_VECTOR_SEARCH,
+                )
+                chroma_client: chromadb.api.ClientAPI | None = AppState.get_client(
+                    client_type=ClientType.CHROMA,
+                )
+                vector_repo_paths: list[str] = (
+                    []
+                    if chroma_client is None
+                    else await asyncio.to_thread(
+                        chroma_get_projects,
+                        repo_filter_vector_search_text=vector_search_filter_text_current,
+                        n_results=NUMBER_OF_RESULTS_TO_DISPLAY_FOR_VECTOR_SEARCH,
+                        client=chroma_client,
+                        distance_threshold=self.vector_search_distance_threshold / 100,
+                    )
+                )
+                repo_paths: list[str] = helper_search.reciprocal_rank_fusion(
+                    rankings=[
+                        database_repo_paths,
+                        registry_repo_paths,
+                        vector_repo_paths,
+                    ],
+                )[:NUMBER_OF_RESULTS_TO_DISPLAY_FOR_VECTOR_SEARCH]
+                span.add_event(
+                    name="filter_grid-filtering-vector_search_filter_text-fused",
+                    attributes={
+                        "repo_path_count-database": len(database_repo_paths),
+                        "repo_path_count-registry": len(registry_repo_paths),
+                        "repo_path_count-vector": len(vector_repo_paths),
+                        "repo_path_count-fused": len(repo_paths),
+                    },
+                )
                 return [
                     index
                     for index in (
                         GridState.find_project_index_using_repo_path(
-                            projects=AppState.projects,
                             repo_path=repo_path,
                         )
                         for repo_path in repo_paths
@@ -208,76 +262,76 @@ class FilterGridState(rx.State):
                     if index is not None
                 ]
 
-        display_data_indices: list[int] | None = None
-        match vector_search_distance_threshold, vector_search_filter_text_current:
-            case None, None:
-                span.add_event(
-                    name="filter_grid-aborted",
-                )
+            display_data_indices: list[int] | None = None
+            match vector_search_distance_threshold, vector_search_filter_text_current:
+                case None, None:
+                    span.add_event(
+                        name="filter_grid-aborted",
+                    )
 
-            case _, None:
-                display_data_indices = filter_with_vector_search_distance_threshold(
-                    vector_search_distance_threshold=vector_search_distance_threshold,
-                    vector_search_filter_text_most_recent=vector_search_filter_text_most_recent,
-                )
+                case _, None:
+                    display_data_indices = await filter_with_vector_search_distance_threshold(
+                        vector_search_distance_threshold=vector_search_distance_threshold,
+                        vector_search_filter_text_most_recent=vector_search_filter_text_most_recent,
+                    )
 
-            case None, _:
-                display_data_indices = filter_with_vector_search_filter_text(
-                    vector_search_filter_text_current=vector_search_filter_text_current,
-                )
+                case None, _:
+                    display_data_indices = await filter_with_vector_search_filter_text(
+                        vector_search_filter_text_current=vector_search_filter_text_current,
+                    )
 
-            case _, _:
-                span.add_event(
-                    name="filter_grid-aborted",
-                )
-                error_msg: str = (
-                    "Cannot filter with both distance threshold and repo paths"
-                )
-                exception: AssertionError = AssertionError(error_msg)
-                span.record_exception(
-                    exception=exception,
+                case _, _:
+                    span.add_event(
+                        name="filter_grid-aborted",
+                    )
+                    error_msg: str = (
+                        "Cannot filter with both distance threshold and repo paths"
+                    )
+                    exception: AssertionError = AssertionError(error_msg)
+                    span.record_exception(
+                        exception=exception,
+                    )
+                    raise exception
+
+            if display_data_indices is not None:
+                self.display_data_indices_setter(
+                    display_data_indices=display_data_indices,
                 )
-                raise exception
 
-        GridState.display_data_indices_setter(  # trunk-ignore(pyright/reportCallIssue)
-            display_data_indices=display_data_indices,
-        )
-        yield
-
-        span.add_event(
-            name="filter_grid-finished",
-            attributes={
-                "display_data_indices-length": (
-                    len(display_data_indices)
-                    if display_data_indices is not None
-                    else "None"
-                ),
-            },
-        )
-        return
+            yield
 
-    def _filter_grid_with_vector_search_distance_threshold(
+            span.add_event(
+                name="filter_grid-finished",
+                attributes={
+                    "display_data_indices-length": (
+                        len(display_data_indices)
+                        if display_data_indices is not None
+                        else "None"
+                    ),
+                },
+            )
+
+    async def _filter_grid_with_vector_search_distance_threshold(
         self,
         vector_search_distance_threshold: int,
-    ) -> Generator[None, None, None]:
+    ) -> AsyncGenerator[None, None]:
         span_name: str = (
-            f"{self.default_span_name}-event_filter_grid_with_vector_search_distance_threshold"
+            f"{SPAN_KEY}-event_filter_grid_with_vector_search_distance_threshold"
         )
         with tracer.start_as_current_span(span_name):
-            self._event_filter_grid(
+            async for _ in self._event_filter_grid(
                 vector_search_distance_threshold=vector_search_distance_threshold,
                 vector_search_filter_text_current=None,
                 vector_search_filter_text_most_recent=self.vector_search_filter_text_most_recent,
-            )
-            yield
-            return
+            ):
+                yield
 
-    def _filter_grid_with_vector_search_filter_text(
+    async def _filter_grid_with_vector_search_filter_text(
         self,
         vector_search_filter_text_current: str,
-    ) -> Generator[None, None, None]:
+    ) -> AsyncGenerator[None, None]:
         span_name: str = (
-            f"{self.default_span_name}-filter_grid_with_vector_search_filter_text"
+            f"{SPAN_KEY}-filter_grid_with_vector_search_filter_text"
         )
         with tracer.start_as_current_span(span_name) as span:
             vector_search_filter_text_most_recent: str = (
@@ -294,32 +348,32 @@ class FilterGridState(rx.State):
                 )
                 return
 
-            self._event_filter_grid(
+            async for _ in self._event_filter_grid(
                 vector_search_filter_text_current=vector_search_filter_text_current,
                 vector_search_filter_text_most_recent=vector_search_filter_text_most_recent,
                 vector_search_distance_threshold=None,
-            )
-            yield
+            ):
+                yield
 
-            self.vector_search_filter_text_setter(
+            for _ in self.vector_search_filter_text_setter(
                 vector_search_filter_text_current=vector_search_filter_text_current,
-            )
-            return
+            ):
+                yield
 
-    def event_filter_grid_with_vector_search_filter_text(
+    async def event_filter_grid_with_vector_search_filter_text(
         self,
-    ) -> Generator[None, None, None]:
+    ) -> AsyncGenerator[None, None]:
         span_name: str = (
-            f"{self.default_span_name}-event_filter_grid_with_vector_search_filter_text"
+            f"{SPAN_KEY}-event_filter_grid_with_vector_search_filter_text"
         )
         with tracer.start_as_current_span(span_name) as span:
             vector_search_filter_text_current: str = (
                 self.vector_search_filter_text_current
             )
-            self._filter_grid_with_vector_search_filter_text(
+            async for _ in self._filter_grid_with_vector_search_filter_text(
                 vector_search_filter_text_current=vector_search_filter_text_current,
-            )
-            yield
+            ):
+                yield
 
             span.add_event(
                 name=span_name,
@@ -1,129 +1,235 @@
 # trunk-ignore-all(ruff/ANN10,ruff/ANN101,ruff/RUF012,trunk/ignore-does-nothing)
 from __future__ import annotations
 
+from pathlib import Path
 from typing import TYPE_CHECKING, AsyncGenerator
 
 import reflex as rx
-from sqlalchemy import select
 
-from hackathon import helper_github, helper_perplexity
-from hackathon.app_state import AppState, ClientType
+from hackathon import helper_db, helper_github
+from hackathon.app_state import AppState, ClientType, project_registry
 from hackathon.models.project import Project
 from hackathon.otel import tracer
+from hackathon.pages.repo_tracker.state_grid import GridState
 
-from .helpers.helper_chroma import chroma_add_project
-from .helpers.helper_perplexity import perplexity_get_repo
+from .constants import (
+    BULK_IMPORT_BATCH_SIZE,
+    BULK_IMPORT_FILE_DIRECTORY,
+    BULK_IMPORT_GITHUB_CONCURRENCY,
+    BULK_IMPORT_PERPLEXITY_CONCURRENCY,
+    BULK_IMPORT_SOURCE_LIMIT,
+    PROJECT_LOAD_PAGE_SIZE,
+    PULL_REQUEST_HARVEST_CONCURRENCY,
+)
+from .helpers.helper_bulk_import import (
+    BulkImportLimits,
+    BulkImportProgress,
+    bulk_import_repos,
+    parse_sources,
+    resolve_repo_paths,
+)
+from .helpers.helper_pull_requests import (
+    HarvestProgress,
+    harvest_pull_requests,
+)
 
 if TYPE_CHECKING:
-    import chromadb.api.client
     import github
 
 
 class RepoState(rx.State):
     default_span_name: str = "repo_state"
+    bulk_import_sources: str = ""
+    bulk_import_progress: str = ""
+    pull_request_harvest_progress: str = ""
+
+    def bulk_import_sources_setter(
+        self,
+        bulk_import_sources: str,
+    ) -> None:
+        self.bulk_import_sources = bulk_import_sources
 
     @rx.background
-    async def event_fetch_repo_from_github(
+    async def event_bulk_import_repos(
         self,
     ) -> AsyncGenerator[rx.Component | None, None]:
-        span_name: str = f"{self.default_span_name}-event_fetch_repo_from_github"
-        async with self:
-            span = tracer.start_span(span_name)
-            repo_path_search: str = helper_github.extract_repo_path_from_url(
-                url=self.repo_path,
-            )
-            client_github: github.Github = AppState.get_client( # trunk-ignore(pyright/reportAssignmentType)
-                client_type=ClientType.GITHUB,
-            )
-            repo: github.Repository | None = helper_github.fetch_repo(
-                repo_path=repo_path_search,
-                client=client_github,
-            )
-            if repo is None:
-                span_event_name: str = "repo-not_found"
-                repo_path: str = self.repo_path
-                self.repo_path_reseter()
-                span.add_event(
-                    name=span_event_name,
-                    attributes={
-                        "repo_path": repo_path,
-                    },
+        span_name: str = f"{self.default_span_name}-event_bulk_import_repos"
+        with tracer.start_as_current_span(span_name) as span:
+            async with self:
+                sources: list[str] = parse_sources(
+                    text=self.bulk_import_sources,
                 )
-                yield rx.toast.error(
-                    message=span_event_name,
+                self.bulk_import_sources = ""
+                self.bulk_import_progress = "Resolving repos"
+
+            if not sources:
+                span.add_event(
+                    name="bulk_import-no_sources",
                 )
                 return
 
-            span.add_event(
-                name="repo-found",
-                attributes={
-                    "repo_path": str(repo.full_name),
-                    "repo_description": str(repo.description),
-                },
+            client_github: github.Github | helper_github.GithubTokenPool = (
+                AppState.get_client(
+                    client_type=ClientType.GITHUB,
+                )
             )
-            project: Project = Project.from_repo(
-                repo=repo,
+            repo_paths: list[str] = await helper_github.github_executor.run_with_client(
+                client_github,
+                resolve_repo_paths,
+                sources=sources,
+                source_limit=BULK_IMPORT_SOURCE_LIMIT,
+                import_directory=(
+                    None
+                    if BULK_IMPORT_FILE_DIRECTORY is None
+                    else Path(BULK_IMPORT_FILE_DIRECTORY)
+                ),
             )
             span.add_event(
-                name="project-created_from_repo",
+                name="bulk_import-repo_paths_resolved",
                 attributes={
-                    "project_repo_path": str(project.repo_path),
-                    "project_stars": str(project.stars),
-                    "project_language": str(project.language),
-                    "project_website": str(project.website),
-                    "project_description": str(project.description),
-                    "project_created_at": str(project.created_at),
+                    "repo_path_count": len(repo_paths),
                 },
             )
-            self.add_project_to_display_data(project)
-            self.repo_path_reseter()
-            yield
 
-            perplexity_client: helper_perplexity.Client = AppState.get_client( # trunk-ignore(pyright/reportAssignmentType)
-                client_type=ClientType.PERPLEXITY,
+            async def on_progress(
+                progress: BulkImportProgress,
+                projects: list[Project],
+            ) -> None:
+                async with self:
+                    self.bulk_import_progress = str(progress)
+                    if not projects:
+                        return
+
+                    # Only the new projects are appended, like a single repo
+                    # fetch does, so the filter the grid shows is kept.
+                    grid_state: GridState = await self.get_state(GridState)
+                    displayed_indices: set[int] = set(grid_state.display_data_indices)
+                    grid_state.display_data_indices_setter(
+                        display_data_indices=[
+                            *grid_state.display_data_indices,
+                            *(
+                                project_index
+                                for project_index in dict.fromkeys(
+                                    project_registry.extend(projects),
+                                )
+                                if project_index not in displayed_indices
+                            ),
+                        ],
+                    )
+
+            progress: BulkImportProgress = await bulk_import_repos(
+                repo_paths=repo_paths,
+                github_client=client_github,
+                perplexity_client=AppState.get_client(
+                    client_type=ClientType.PERPLEXITY,
+                ),
+                chroma_client=AppState.get_client(
+                    client_type=ClientType.CHROMA,
+                ),
+                limits=BulkImportLimits(
+                    batch_size=BULK_IMPORT_BATCH_SIZE,
+                    github_concurrency=BULK_IMPORT_GITHUB_CONCURRENCY,
+                    perplexity_concurrency=BULK_IMPORT_PERPLEXITY_CONCURRENCY,
+                    source_limit=BULK_IMPORT_SOURCE_LIMIT,
+                ),
+                on_progress=on_progress,
             )
-            perplexity_description: str | None = await perplexity_get_repo(
-                repo_url=project.repo_url,
-                client=perplexity_client,
+            yield rx.toast.info(
+                message=f"Bulk import finished: {progress}",
             )
-            if perplexity_description is not None:
-                project.set_description(
-                    description=perplexity_description,
-                )
-                yield
 
-            for _ in self.save_project(project):
-                yield
+    @rx.background
+    async def event_harvest_pull_requests(
+        self,
+    ) -> AsyncGenerator[rx.Component | None, None]:
+        """Harvests the pull requests of every loaded project into the database."""
+        span_name: str = f"{self.default_span_name}-event_harvest_pull_requests"
+        with tracer.start_as_current_span(span_name):
+            async with self:
+                self.pull_request_harvest_progress = "Harvesting pull requests"
 
-            chroma_client: chromadb.api.ClientAPI = AppState.get_client( # trunk-ignore(pyright/reportAssignmentType)
-                client_type=ClientType.CHROMA,
+            async def on_progress(
+                progress: HarvestProgress,
+            ) -> None:
+                async with self:
+                    self.pull_request_harvest_progress = str(progress)
+
+            progress: HarvestProgress = await harvest_pull_requests(
+                repo_paths=[
+                    str(project.repo_path) for project in project_registry.projects
+                ],
+                client=AppState.get_client(
+                    client_type=ClientType.GITHUB,
+                ),
+                concurrency=PULL_REQUEST_HARVEST_CONCURRENCY,
+                on_progress=on_progress,
             )
-            chroma_add_project(
-                project=project,
-                client=chroma_client,
+            yield rx.toast.info(
+                message=f"Pull request harvest finished: {progress}",
             )
-            yield
 
-    def event_on_page_load(
+    async def _load_projects_after_watermark(
         self,
-    ) -> None:
-        span_name: str = f"{self.default_span_name}-event_on_page_load"
+    ) -> int:
+        """Returns the number of projects that were not in the registry yet."""
+        span_name: str = f"{self.default_span_name}-load_projects_after_watermark"
         with tracer.start_as_current_span(span_name) as span:
-            with rx.session() as session:
-                AppState.projects = (
-                    session.exec(  # trunk-ignore(pyright/reportCallIssue)
-                        statement=select(  # trunk-ignore(pyright/reportArgumentType)
-                            Project,
-                        ),
-                    )
-                    .scalars()
-                    .all()
-                )
-
+            watermark: int | None = project_registry.watermark
+            project_count: int = len(project_registry)
+            project_registry.extend(
+                await helper_db.async_fetch_projects(
+                    after_id=watermark,
+                    limit=PROJECT_LOAD_PAGE_SIZE,
+                ),
+            )
+            project_count_loaded: int = len(project_registry) - project_count
             span.add_event(
                 name="projects-loaded",
                 attributes={
-                    "project_count": len(AppState.projects),
+                    "watermark-before": str(watermark),
+                    "watermark-after": str(project_registry.watermark),
+                    "project_count-loaded": project_count_loaded,
+                    "project_count": len(project_registry),
                 },
             )
-            self.display_data_indices = list(range(len(AppState.projects)))
+            return project_count_loaded
+
+    async def _display_all_projects(
+        self,
+    ) -> None:
+        """The grid data lives in GridState, so the indices are set there."""
+        grid_state: GridState = await self.get_state(GridState)
+        grid_state.display_data_indices_setter(
+            display_data_indices=project_registry.indices,
+        )
+
+    async def event_on_page_load(
+        self,
+    ) -> None:
+        span_name: str = f"{self.default_span_name}-event_on_page_load"
+        with tracer.start_as_current_span(span_name) as span:
+            if PROJECT_LOAD_PAGE_SIZE is not None and len(project_registry) > 0:
+                span.add_event(
+                    name="projects-already_paged",
+                    attributes={
+                        "project_count": len(project_registry),
+                    },
+                )
+
+            else:
+                await self._load_projects_after_watermark()
+
+            await self._display_all_projects()
+
+    async def event_load_next_project_page(
+        self,
+    ) -> None:
+        span_name: str = f"{self.default_span_name}-event_load_next_project_page"
+        with tracer.start_as_current_span(span_name) as span:
+            if not await self._load_projects_after_watermark():
+                span.add_event(
+                    name="projects-no_next_page",
+                )
+                return
+
+            await self._display_all_projects()
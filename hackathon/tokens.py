@@ -10,9 +10,13 @@ TOKENS: dict[str, str | None] = {
     "GITHUB_REPO": "reflex",
     "GITHUB_CLIENT_ID": os.getenv("GITHUB_CLIENT_ID"),
     "GITHUB_CLIENT_SECRET": os.getenv("GITHUB_CLIENT_SECRET"),
+    "GITHUB_TOKENS": os.getenv("GITHUB_TOKENS"),
     "OTEL_PROVIDER_TOKEN_NAME": os.getenv("OTEL_PROVIDER_TOKEN_NAME"),
     "OTEL_APP_NAME": os.getenv("OTEL_APP_NAME"),
     "PERPLEXITY_API_KEY": os.getenv("PERPLEXITY_API_KEY"),
+    "VECTOR_STORE_BACKEND": os.getenv("VECTOR_STORE_BACKEND"),
+    "VECTOR_STORE_PATH": os.getenv("VECTOR_STORE_PATH"),
+    "VECTOR_STORE_NPROBE": os.getenv("VECTOR_STORE_NPROBE"),
 }
 if TOKENS["OTEL_PROVIDER_TOKEN_NAME"] is not None:
     TOKENS.update(
@@ -0,0 +1,30 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+import pytest
+import reflex.model  # trunk-ignore(ruff/F401): has to load before sqlmodel
+from sqlmodel import Session, SQLModel, create_engine
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+
+    from sqlalchemy.engine import Engine
+
+
+@pytest.fixture
+def engine() -> Iterator[Engine]:
+    """A fresh in memory SQLite database with every table created."""
+    engine: Engine = create_engine("sqlite://")
+    SQLModel.metadata.create_all(engine)
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture
+def session(
+    engine: Engine,
+) -> Iterator[Session]:
+    with Session(engine) as session:
+        yield session
+
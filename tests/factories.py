@@ -0,0 +1,24 @@
+from __future__ import annotations
+
+import datetime
+
+from hackathon.models.project import Project
+
+
+def make_project(
+    repo_path: str,
+    stars: int = 0,
+    language: str = "",
+    description: str = "",
+    refreshed_at: datetime.datetime | None = None,
+) -> Project:
+    return Project(
+        repo_path=repo_path,
+        stars=stars,
+        language=language,
+        created_at=datetime.datetime(2024, 1, 1),
+        website="",
+        repo_url=f"https://github.com/{repo_path}",
+        description=description,
+        refreshed_at=refreshed_at,
+    )
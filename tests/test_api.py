@@ -0,0 +1,70 @@
+from __future__ import annotations
+
+from http import HTTPStatus
+
+import pytest
+import reflex as rx
+from fastapi import HTTPException
+from sqlmodel import Session
+
+from hackathon.helper_db import helper_ag_grid
+from hackathon.pages.repo_tracker import api
+from hackathon.pages.repo_tracker.constants import AG_GRID_CACHE_BLOCK_SIZE
+
+from .factories import make_project
+
+
+@pytest.fixture(autouse=True)
+def api_session(
+    session: Session,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setattr(rx, "session", lambda: session)
+    helper_ag_grid._row_cursors.clear()
+
+
+def test_blocks_are_clamped_to_the_cache_block_size(
+    session: Session,
+) -> None:
+    session.add_all(
+        [
+            make_project(repo_path=f"owner/repo-{index}")
+            for index in range(AG_GRID_CACHE_BLOCK_SIZE + 1)
+        ],
+    )
+    session.commit()
+    assert len(
+        api.get_project_rows(
+            start=0,
+            end=AG_GRID_CACHE_BLOCK_SIZE * 10,
+        ),
+    ) == AG_GRID_CACHE_BLOCK_SIZE
+
+
+@pytest.mark.parametrize(
+    ("start", "end", "sort_model", "filter_model"),
+    [
+        (0, 10, "[{", None),
+        (0, 10, None, "not json"),
+        (0, 10, '[{"colId": "id; DROP TABLE project", "sort": "asc"}]', None),
+        (0, 10, '{"colId": "stars"}', None),
+        (0, 10, None, '{"stars": {"filterType": "number", "type": "regex"}}'),
+        (-1, 10, None, None),
+        (10, 0, None, None),
+    ],
+)
+def test_malformed_requests_are_answered_with_a_400(
+    start: int,
+    end: int,
+    sort_model: str | None,
+    filter_model: str | None,
+) -> None:
+    with pytest.raises(HTTPException) as exc_info:
+        api.get_project_rows(
+            start=start,
+            end=end,
+            sort_model=sort_model,
+            filter_model=filter_model,
+        )
+
+    assert exc_info.value.status_code == HTTPStatus.BAD_REQUEST
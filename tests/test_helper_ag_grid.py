@@ -0,0 +1,273 @@
+from __future__ import annotations
+
+import datetime
+from typing import TYPE_CHECKING, Any
+
+import pytest
+
+from hackathon.helper_db import fetch_project_rows, helper_ag_grid
+
+from .factories import make_project
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+
+    from sqlmodel import Session
+
+    from hackathon.models.project import Project
+
+BLOCK_SIZE: int = 4
+LANGUAGES: tuple[str, ...] = ("Python", "Rust", "")
+
+
+@pytest.fixture(autouse=True)
+def clear_row_cursors() -> Iterator[None]:
+    """The cursors are module state keyed by the query, not by the database."""
+    helper_ag_grid._row_cursors.clear()
+    yield
+    helper_ag_grid._row_cursors.clear()
+
+
+@pytest.fixture(autouse=True)
+def sortable_refreshed_at(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """Every grid column is NOT NULL, so the nullable refreshed_at stands in."""
+    monkeypatch.setattr(
+        helper_ag_grid,
+        "AG_GRID_FIELDS",
+        (*helper_ag_grid.AG_GRID_FIELDS, "refreshed_at"),
+    )
+
+
+@pytest.fixture
+def projects(
+    session: Session,
+) -> list[Project]:
+    """Projects with many ties on stars and language and NULL refreshed_at."""
+    projects: list[Project] = [
+        make_project(
+            repo_path=f"owner/repo-{index:02}",
+            stars=index % 3,
+            language=LANGUAGES[index % len(LANGUAGES)],
+            refreshed_at=None
+            if index % 4 == 0
+            else datetime.datetime(2024, 1, 1 + index % 5),
+        )
+        for index in range(23)
+    ]
+    session.add_all(projects)
+    session.commit()
+    for project in projects:
+        session.refresh(project)
+
+    return projects
+
+
+def expected_ids(
+    projects: list[Project],
+    sort_model: list[dict[str, str]],
+) -> list[int]:
+    """The ids in sort_model order, NULLs last in both directions, ties by id."""
+    ordered: list[Project] = sorted(projects, key=lambda project: project.id)
+    for sort in reversed(sort_model):
+        field: str = sort["colId"]
+        ordered = sorted(
+            [project for project in ordered if getattr(project, field) is not None],
+            key=lambda project, field=field: getattr(project, field),
+            reverse=sort["sort"] == "desc",
+        ) + [project for project in ordered if getattr(project, field) is None]
+
+    return [project.id for project in ordered]
+
+
+def fetch_in_blocks(
+    session: Session,
+    sort_model: list[dict[str, str]],
+    filter_model: dict[str, dict[str, Any]] | None = None,
+) -> list[int]:
+    ids: list[int] = []
+    start: int = 0
+    while block := fetch_project_rows(
+        session=session,
+        start=start,
+        end=start + BLOCK_SIZE,
+        sort_model=sort_model,
+        filter_model=filter_model,
+    ):
+        ids.extend(project.id for project in block)
+        start += BLOCK_SIZE
+
+    return ids
+
+
+@pytest.mark.parametrize(
+    "sort_model",
+    [
+        [],
+        [{"colId": "stars", "sort": "desc"}],
+        [{"colId": "language", "sort": "asc"}, {"colId": "stars", "sort": "desc"}],
+        [{"colId": "refreshed_at", "sort": "asc"}],
+        [{"colId": "refreshed_at", "sort": "desc"}, {"colId": "stars", "sort": "asc"}],
+        [{"colId": "stars", "sort": "asc"}, {"colId": "refreshed_at", "sort": "desc"}],
+    ],
+)
+def test_keyset_blocks_match_the_full_order(
+    session: Session,
+    projects: list[Project],
+    sort_model: list[dict[str, str]],
+) -> None:
+    assert fetch_in_blocks(
+        session=session,
+        sort_model=sort_model,
+    ) == expected_ids(
+        projects=projects,
+        sort_model=sort_model,
+    )
+
+
+def test_blocks_after_the_first_use_the_keyset_cursor(
+    session: Session,
+    projects: list[Project],
+) -> None:
+    sort_model: list[dict[str, str]] = [{"colId": "refreshed_at", "sort": "asc"}]
+    fetch_in_blocks(
+        session=session,
+        sort_model=sort_model,
+    )
+    cursor_starts: list[int] = sorted(
+        start
+        for query_cursors in helper_ag_grid._row_cursors.values()
+        for start in query_cursors
+    )
+    assert cursor_starts == list(range(BLOCK_SIZE, len(projects) + 1, BLOCK_SIZE)) + [
+        len(projects),
+    ]
+
+
+def test_scrolling_one_query_does_not_evict_the_cursors_of_another(
+    session: Session,
+    projects: list[Project],
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setattr(helper_ag_grid, "MAX_ROW_CURSORS_PER_QUERY", 2)
+    monkeypatch.setattr(helper_ag_grid, "MAX_ROW_CURSOR_QUERIES", 2)
+    stars_sort_model: list[dict[str, str]] = [{"colId": "stars", "sort": "desc"}]
+    fetch_in_blocks(
+        session=session,
+        sort_model=stars_sort_model,
+    )
+    stars_cursors: dict[int, tuple[Any, ...]] = dict(
+        next(iter(helper_ag_grid._row_cursors.values())),
+    )
+    fetch_in_blocks(
+        session=session,
+        sort_model=[{"colId": "language", "sort": "asc"}],
+    )
+    assert [
+        len(query_cursors) for query_cursors in helper_ag_grid._row_cursors.values()
+    ] == [2, 2]
+    assert dict(next(iter(helper_ag_grid._row_cursors.values()))) == stars_cursors
+
+    fetch_in_blocks(
+        session=session,
+        sort_model=[{"colId": "refreshed_at", "sort": "asc"}],
+    )
+    assert len(helper_ag_grid._row_cursors) == 2
+    assert fetch_in_blocks(
+        session=session,
+        sort_model=stars_sort_model,
+    ) == expected_ids(
+        projects=projects,
+        sort_model=stars_sort_model,
+    )
+
+
+def test_out_of_order_block_falls_back_to_an_offset(
+    session: Session,
+    projects: list[Project],
+) -> None:
+    sort_model: list[dict[str, str]] = [{"colId": "stars", "sort": "desc"}]
+    block: list[Project] = fetch_project_rows(
+        session=session,
+        start=8,
+        end=12,
+        sort_model=sort_model,
+        filter_model=None,
+    )
+    assert [project.id for project in block] == expected_ids(
+        projects=projects,
+        sort_model=sort_model,
+    )[8:12]
+
+
+def test_filtered_blocks_match_the_filtered_order(
+    session: Session,
+    projects: list[Project],
+) -> None:
+    sort_model: list[dict[str, str]] = [{"colId": "refreshed_at", "sort": "desc"}]
+    filter_model: dict[str, dict[str, Any]] = {
+        "stars": {
+            "filterType": "number",
+            "type": "greaterThan",
+            "filter": 0,
+        },
+    }
+    assert fetch_in_blocks(
+        session=session,
+        sort_model=sort_model,
+        filter_model=filter_model,
+    ) == expected_ids(
+        projects=[project for project in projects if project.stars > 0],
+        sort_model=sort_model,
+    )
+
+
+def test_like_wildcards_in_filter_text_match_literally(
+    session: Session,
+) -> None:
+    session.add_all(
+        [
+            make_project(repo_path="owner/100%-done"),
+            make_project(repo_path="owner/100-done"),
+            make_project(repo_path="owner/snake_case"),
+            make_project(repo_path="owner/snakexcase"),
+        ],
+    )
+    session.commit()
+
+    def repo_paths_containing(
+        text: str,
+    ) -> list[str]:
+        return [
+            project.repo_path
+            for project in fetch_project_rows(
+                session=session,
+                start=0,
+                end=10,
+                sort_model=None,
+                filter_model={
+                    "repo_path": {
+                        "filterType": "text",
+                        "type": "contains",
+                        "filter": text,
+                    },
+                },
+            )
+        ]
+
+    assert repo_paths_containing("0%") == ["owner/100%-done"]
+    assert repo_paths_containing("e_c") == ["owner/snake_case"]
+
+
+def test_unknown_sort_column_is_rejected(
+    session: Session,
+) -> None:
+    with pytest.raises(ValueError, match="unknown ag grid column"):
+        fetch_project_rows(
+            session=session,
+            start=0,
+            end=BLOCK_SIZE,
+            sort_model=[{"colId": "id; DROP TABLE project", "sort": "asc"}],
+            filter_model=None,
+        )
@@ -0,0 +1,99 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+import pytest
+
+from hackathon.pages.repo_tracker.helpers import helper_bulk_import
+from hackathon.pages.repo_tracker.helpers.helper_bulk_import import (
+    parse_sources,
+    resolve_repo_paths,
+)
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+
+def test_parse_sources_splits_on_whitespace_and_commas() -> None:
+    assert parse_sources(
+        text=" owner/a,owner/b\n\torg:acme ,, topic:llm\n",
+    ) == ["owner/a", "owner/b", "org:acme", "topic:llm"]
+
+
+def test_urls_and_repo_paths_resolve_once_in_order() -> None:
+    assert resolve_repo_paths(
+        sources=[
+            "https://github.com/owner/a",
+            "owner/b",
+            "owner/a",
+            "https://github.com/owner/b",
+        ],
+        client=None,
+        source_limit=None,
+        import_directory=None,
+    ) == ["owner/a", "owner/b"]
+
+
+def test_org_and_topic_sources_are_expanded(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setattr(
+        helper_bulk_import,
+        "fetch_repo_paths_for_org",
+        lambda org, client, limit: [f"{org}/one", f"{org}/two"][:limit],
+    )
+    monkeypatch.setattr(
+        helper_bulk_import,
+        "fetch_repo_paths_for_topic",
+        lambda topic, client, limit: [f"{topic}-owner/repo", "acme/one"][:limit],
+    )
+    assert resolve_repo_paths(
+        sources=["org:acme", "topic:llm"],
+        client=None,
+        source_limit=2,
+        import_directory=None,
+    ) == ["acme/one", "acme/two", "llm-owner/repo"]
+
+
+def test_file_sources_are_read_once_even_when_they_reference_each_other(
+    tmp_path: Path,
+) -> None:
+    (tmp_path / "a.txt").write_text("owner/a file:b.txt")
+    (tmp_path / "b.txt").write_text("owner/b,file:a.txt\nfile:b.txt")
+    assert resolve_repo_paths(
+        sources=["file:a.txt", "owner/c"],
+        client=None,
+        source_limit=None,
+        import_directory=tmp_path,
+    ) == ["owner/a", "owner/b", "owner/c"]
+
+
+def test_file_sources_outside_the_import_directory_are_skipped(
+    tmp_path: Path,
+) -> None:
+    import_directory: Path = tmp_path / "imports"
+    import_directory.mkdir()
+    (tmp_path / "secret.txt").write_text("owner/secret")
+    (import_directory / "repos.txt").write_text("owner/a")
+    assert resolve_repo_paths(
+        sources=[
+            "file:../secret.txt",
+            f"file:{tmp_path / 'secret.txt'}",
+            "file:repos.txt",
+        ],
+        client=None,
+        source_limit=None,
+        import_directory=import_directory,
+    ) == ["owner/a"]
+
+
+def test_file_sources_are_disabled_without_an_import_directory(
+    tmp_path: Path,
+) -> None:
+    (tmp_path / "repos.txt").write_text("owner/a")
+    assert resolve_repo_paths(
+        sources=[f"file:{tmp_path / 'repos.txt'}", "owner/b"],
+        client=None,
+        source_limit=None,
+        import_directory=None,
+    ) == ["owner/b"]
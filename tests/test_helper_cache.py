@@ -0,0 +1,157 @@
+from __future__ import annotations
+
+from types import SimpleNamespace
+from typing import TYPE_CHECKING
+
+import pytest
+
+from hackathon.helper_cache import CacheStats, SqliteCache
+from hackathon.helper_cache import helper_cache as helper_cache_module
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+    from pathlib import Path
+
+
+class FakeClock:
+    def __init__(
+        self: FakeClock,
+    ) -> None:
+        self.now: float = 1_000.0
+
+    def __call__(
+        self: FakeClock,
+    ) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(
+    monkeypatch: pytest.MonkeyPatch,
+) -> FakeClock:
+    clock: FakeClock = FakeClock()
+    monkeypatch.setattr(helper_cache_module, "time", SimpleNamespace(time=clock))
+    return clock
+
+
+@pytest.fixture
+def cache_path(
+    tmp_path: Path,
+) -> Path:
+    return tmp_path / "cache" / "cache.sqlite3"
+
+
+@pytest.fixture
+def cache(
+    cache_path: Path,
+) -> Iterator[SqliteCache]:
+    cache: SqliteCache = SqliteCache(
+        path=cache_path,
+        namespace="test",
+        ttl_seconds=60.0,
+        max_entries=2,
+    )
+    yield cache
+    cache.close()
+
+
+def test_entries_expire_after_the_ttl(
+    cache: SqliteCache,
+    clock: FakeClock,
+) -> None:
+    cache.set("key", "value")
+    clock.now += 60.0
+    assert cache.get("key") == "value"
+
+    clock.now += 0.5
+    assert cache.get("key") is None
+    assert cache.stats == CacheStats(hits=1, misses=1)
+
+
+def test_entries_without_a_ttl_do_not_expire(
+    cache_path: Path,
+    clock: FakeClock,
+) -> None:
+    cache: SqliteCache = SqliteCache(
+        path=cache_path,
+        namespace="test",
+        ttl_seconds=None,
+        max_entries=2,
+    )
+    cache.set("key", "value")
+    clock.now += 365 * 24 * 60 * 60.0
+    assert cache.get("key") == "value"
+    cache.close()
+
+
+def test_least_recently_accessed_entries_are_evicted(
+    cache: SqliteCache,
+    clock: FakeClock,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setattr(helper_cache_module, "EVICTION_INTERVAL", 1)
+    cache.set("a", "1")
+    clock.now += 1.0
+    cache.set("b", "2")
+    clock.now += 1.0
+    assert cache.get("a") == "1"
+
+    clock.now += 1.0
+    cache.set("c", "3")
+    assert cache.get("b") is None
+    assert cache.get("a") == "1"
+    assert cache.get("c") == "3"
+
+
+def test_eviction_only_runs_every_eviction_interval_writes(
+    cache: SqliteCache,
+    clock: FakeClock,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setattr(helper_cache_module, "EVICTION_INTERVAL", 4)
+    for key in "abc":
+        clock.now += 1.0
+        cache.set(key, key)
+
+    assert [cache.get(key) for key in "abc"] == ["a", "b", "c"]
+
+    clock.now += 1.0
+    cache.set("d", "d")
+    assert [cache.get(key) for key in "abcd"] == [None, None, "c", "d"]
+
+
+def test_namespaces_share_the_file_but_not_the_entries(
+    cache: SqliteCache,
+    cache_path: Path,
+    clock: FakeClock,
+) -> None:
+    other: SqliteCache = SqliteCache(
+        path=cache_path,
+        namespace="other",
+        ttl_seconds=None,
+        max_entries=2,
+    )
+    cache.set("key", "value")
+    assert other.get("key") is None
+
+    other.set("key", "other value")
+    assert cache.get("key") == "value"
+    assert other.get("key") == "other value"
+    other.close()
+
+
+def test_entries_persist_across_connections(
+    cache: SqliteCache,
+    cache_path: Path,
+    clock: FakeClock,
+) -> None:
+    cache.set("key", "value")
+    cache.close()
+    reopened: SqliteCache = SqliteCache(
+        path=cache_path,
+        namespace="test",
+        ttl_seconds=60.0,
+        max_entries=2,
+    )
+    assert reopened.get("key") == "value"
+    reopened.close()
@@ -0,0 +1,212 @@
+from __future__ import annotations
+
+import json
+import threading
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import TYPE_CHECKING, Any, ClassVar
+
+import pytest
+from github import Github
+from github.GithubException import UnknownObjectException
+
+from hackathon.helper_cache import SqliteCache
+from hackathon.helper_github import get_repo_conditionally, get_requester
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+    from pathlib import Path
+
+ETAG: str = '"v1"'
+LAST_MODIFIED: str = "Mon, 01 Jan 2024 00:00:00 GMT"
+RATE_LIMIT: int = 5_000
+
+
+class FakeGithubHandler(BaseHTTPRequestHandler):
+    """Serves /repos/owner/repo with an ETag, and 304 when it is sent back."""
+
+    repo: ClassVar[dict[str, Any]] = {
+        "id": 1,
+        "name": "repo",
+        "full_name": "owner/repo",
+        "stargazers_count": 42,
+    }
+    requests: ClassVar[list[dict[str, str]]] = []
+    remaining: ClassVar[int] = RATE_LIMIT
+
+    def do_GET(  # trunk-ignore(ruff/N802)
+        self: FakeGithubHandler,
+    ) -> None:
+        FakeGithubHandler.requests.append(dict(self.headers))
+        if self.path.lower() != "/repos/owner/repo":
+            self._respond(HTTPStatus.NOT_FOUND, {"message": "Not Found"})
+            return
+
+        if self.headers.get("If-None-Match") == ETAG:
+            self._respond(HTTPStatus.NOT_MODIFIED, None)
+            return
+
+        FakeGithubHandler.remaining -= 1
+        self._respond(HTTPStatus.OK, FakeGithubHandler.repo)
+
+    def _respond(
+        self: FakeGithubHandler,
+        status: HTTPStatus,
+        payload: dict[str, Any] | None,
+    ) -> None:
+        body: bytes = b"" if payload is None else json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("ETag", ETAG)
+        self.send_header("Last-Modified", LAST_MODIFIED)
+        self.send_header("X-RateLimit-Limit", str(RATE_LIMIT))
+        self.send_header("X-RateLimit-Remaining", str(FakeGithubHandler.remaining))
+        self.send_header("X-RateLimit-Reset", "1700000000")
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(
+        self: FakeGithubHandler,
+        format: str,  # trunk-ignore(ruff/A002)
+        *args: object,
+    ) -> None:
+        return
+
+
+@pytest.fixture
+def client() -> Iterator[Github]:
+    FakeGithubHandler.requests = []
+    FakeGithubHandler.remaining = RATE_LIMIT
+    server: ThreadingHTTPServer = ThreadingHTTPServer(
+        ("127.0.0.1", 0),
+        FakeGithubHandler,
+    )
+    thread: threading.Thread = threading.Thread(
+        target=server.serve_forever,
+        kwargs={
+            "poll_interval": 0.01,
+        },
+        daemon=True,
+    )
+    thread.start()
+    yield Github(
+        base_url=f"http://127.0.0.1:{server.server_address[1]}",
+        retry=None,
+    )
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def cache(
+    tmp_path: Path,
+) -> Iterator[SqliteCache]:
+    cache: SqliteCache = SqliteCache(
+        path=tmp_path / "cache.sqlite3",
+        namespace="github-repos",
+        ttl_seconds=None,
+        max_entries=10,
+    )
+    yield cache
+    cache.close()
+
+
+def test_the_first_fetch_stores_the_validators(
+    client: Github,
+    cache: SqliteCache,
+) -> None:
+    repo = get_repo_conditionally(
+        repo_path="owner/repo",
+        client=client,
+        cache=cache,
+    )
+    assert repo.full_name == "owner/repo"
+    assert "If-None-Match" not in FakeGithubHandler.requests[0]
+    stored: dict[str, Any] = json.loads(cache.get("owner/repo") or "{}")
+    assert stored["etag"] == ETAG
+    assert stored["last_modified"] == LAST_MODIFIED
+
+
+def test_the_second_fetch_revalidates_and_serves_the_304_from_the_cache(
+    client: Github,
+    cache: SqliteCache,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    get_repo_conditionally(
+        repo_path="owner/repo",
+        client=client,
+        cache=cache,
+    )
+    monkeypatch.setitem(FakeGithubHandler.repo, "stargazers_count", 43)
+    repo = get_repo_conditionally(
+        repo_path="Owner/Repo",
+        client=client,
+        cache=cache,
+    )
+    assert FakeGithubHandler.requests[1]["If-None-Match"] == ETAG
+    assert FakeGithubHandler.requests[1]["If-Modified-Since"] == LAST_MODIFIED
+    assert repo.full_name == "owner/repo"
+    assert repo.stargazers_count == 42
+
+
+def test_a_200_replaces_the_cached_payload(
+    client: Github,
+    cache: SqliteCache,
+) -> None:
+    get_repo_conditionally(
+        repo_path="owner/repo",
+        client=client,
+        cache=cache,
+    )
+    cache.set(
+        key="owner/repo",
+        value=json.dumps(
+            {
+                "etag": '"stale"',
+                "last_modified": None,
+                "data": {"full_name": "owner/repo", "stargazers_count": 1},
+            },
+        ),
+    )
+    repo = get_repo_conditionally(
+        repo_path="owner/repo",
+        client=client,
+        cache=cache,
+    )
+    assert repo.stargazers_count == 42
+    assert json.loads(cache.get("owner/repo") or "{}")["etag"] == ETAG
+
+
+def test_rate_limit_headers_reach_the_requester(
+    client: Github,
+    cache: SqliteCache,
+) -> None:
+    get_repo_conditionally(
+        repo_path="owner/repo",
+        client=client,
+        cache=cache,
+    )
+    assert get_requester(client).rate_limiting == (RATE_LIMIT - 1, RATE_LIMIT)
+
+    get_repo_conditionally(
+        repo_path="owner/repo",
+        client=client,
+        cache=cache,
+    )
+    assert client.rate_limiting == (RATE_LIMIT - 1, RATE_LIMIT)
+    assert get_requester(client).rate_limiting_resettime == 1700000000
+
+
+def test_errors_are_raised_and_not_cached(
+    client: Github,
+    cache: SqliteCache,
+) -> None:
+    with pytest.raises(UnknownObjectException):
+        get_repo_conditionally(
+            repo_path="owner/missing",
+            client=client,
+            cache=cache,
+        )
+
+    assert cache.get("owner/missing") is None
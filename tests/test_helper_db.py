@@ -0,0 +1,95 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+from sqlmodel import Session, func, select
+
+from hackathon.helper_db import save_projects
+from hackathon.models.project import Project
+
+from .factories import make_project
+
+if TYPE_CHECKING:
+    from sqlalchemy.engine import Engine
+
+
+def count_projects(
+    session: Session,
+) -> int:
+    return session.exec(select(func.count()).select_from(Project)).one()
+
+
+def test_new_projects_are_saved_with_their_ids(
+    session: Session,
+) -> None:
+    projects: list[Project] = [
+        make_project(repo_path="owner/a"),
+        make_project(repo_path="owner/b"),
+    ]
+    saved_projects: list[Project] = save_projects(
+        session=session,
+        projects=projects,
+    )
+    assert saved_projects == projects
+    assert all(project.id is not None for project in saved_projects)
+    assert count_projects(session) == 2
+
+
+def test_projects_already_in_the_table_are_skipped(
+    session: Session,
+) -> None:
+    save_projects(
+        session=session,
+        projects=[make_project(repo_path="owner/a", stars=1)],
+    )
+    saved_projects: list[Project] = save_projects(
+        session=session,
+        projects=[
+            make_project(repo_path="owner/a", stars=2),
+            make_project(repo_path="owner/b"),
+        ],
+    )
+    assert [project.repo_path for project in saved_projects] == ["owner/b"]
+    assert count_projects(session) == 2
+    assert session.exec(
+        select(Project.stars).where(Project.repo_path == "owner/a"),
+    ).one() == 1
+
+
+def test_duplicates_within_a_batch_are_saved_once(
+    session: Session,
+) -> None:
+    saved_projects: list[Project] = save_projects(
+        session=session,
+        projects=[
+            make_project(repo_path="owner/a"),
+            make_project(repo_path="owner/a"),
+        ],
+    )
+    assert len(saved_projects) == 1
+    assert count_projects(session) == 1
+
+
+def test_a_repo_saved_by_another_session_is_skipped(
+    engine: Engine,
+) -> None:
+    with Session(engine) as first, Session(engine) as second:
+        save_projects(
+            session=first,
+            projects=[make_project(repo_path="owner/a")],
+        )
+        assert save_projects(
+            session=second,
+            projects=[make_project(repo_path="owner/a")],
+        ) == []
+        assert count_projects(second) == 1
+
+
+def test_an_empty_batch_does_not_touch_the_table(
+    session: Session,
+) -> None:
+    assert save_projects(
+        session=session,
+        projects=[],
+    ) == []
+    assert count_projects(session) == 0
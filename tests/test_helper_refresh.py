@@ -0,0 +1,285 @@
+from __future__ import annotations
+
+import asyncio
+import datetime
+from typing import TYPE_CHECKING, Any
+
+import pytest
+from github.GithubException import GithubException, RateLimitExceededException
+from sqlalchemy import text
+from sqlmodel import Session, select
+
+from hackathon import helper_db
+from hackathon.helper_utils import TokenBucket
+from hackathon.models.project import Project
+from hackathon.pages.repo_tracker.helpers import helper_refresh
+from hackathon.pages.repo_tracker.helpers.helper_refresh import (
+    RefreshBudget,
+    RefreshPolicy,
+    RefreshResult,
+    refresh_projects,
+)
+
+from .factories import make_project
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+POLICY: RefreshPolicy = RefreshPolicy(
+    hot_stars=1_000,
+    hot_interval=datetime.timedelta(hours=1),
+    cold_interval=datetime.timedelta(days=1),
+    batch_size=10,
+)
+
+
+def make_repository(
+    repo_path: str,
+    stars: int = 0,
+    language: str | None = None,
+    description: str | None = None,
+) -> dict[str, Any]:
+    return {
+        "nameWithOwner": repo_path,
+        "stargazerCount": stars,
+        "primaryLanguage": None if language is None else {"name": language},
+        "createdAt": "2024-01-01T00:00:00",
+        "homepageUrl": None,
+        "url": f"https://github.com/{repo_path}",
+        "description": description,
+    }
+
+
+@pytest.fixture
+def stub_db(
+    session: Session,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """Runs the async DB layer on the SQLite session of the test.
+
+    Like async_session, every call ends with its projects detached and a
+    failed call rolled back.
+    """
+
+    async def fetch_projects_due_for_refresh(
+        **kwargs: Any,
+    ) -> list[Project]:
+        projects: list[Project] = helper_db.fetch_projects_due_for_refresh(
+            session=session,
+            **kwargs,
+        )
+        session.expunge_all()
+        return projects
+
+    async def save_project_changes(
+        **kwargs: Any,
+    ) -> int:
+        try:
+            return helper_db.save_project_changes(
+                session=session,
+                **kwargs,
+            )
+
+        except Exception:
+            session.rollback()
+            raise
+
+    monkeypatch.setattr(
+        helper_db,
+        "async_fetch_projects_due_for_refresh",
+        fetch_projects_due_for_refresh,
+    )
+    monkeypatch.setattr(
+        helper_db,
+        "async_save_project_changes",
+        save_project_changes,
+    )
+
+
+def stub_repositories(
+    monkeypatch: pytest.MonkeyPatch,
+    repositories: dict[str, dict[str, Any] | None] | Exception,
+) -> list[list[str]]:
+    requests: list[list[str]] = []
+
+    async def async_fetch_repositories(
+        repo_paths: list[str],
+        client: object,
+    ) -> dict[str, dict[str, Any] | None]:
+        requests.append(repo_paths)
+        if isinstance(repositories, Exception):
+            raise repositories
+
+        return repositories
+
+    monkeypatch.setattr(
+        helper_refresh,
+        "async_fetch_repositories",
+        async_fetch_repositories,
+    )
+    return requests
+
+
+def add_projects(
+    session: Session,
+    *projects: Project,
+) -> None:
+    session.add_all(projects)
+    session.commit()
+
+
+def get_project(
+    session: Session,
+    repo_path: str,
+) -> Project:
+    session.expire_all()
+    return session.exec(
+        select(Project).where(Project.repo_path == repo_path),
+    ).one()
+
+
+def refresh(
+    on_changed: Callable[[str, dict[str, Any]], None] | None = None,
+) -> RefreshResult:
+    async def run() -> RefreshResult:
+        return await refresh_projects(
+            policy=POLICY,
+            budget=RefreshBudget(
+                github=TokenBucket(rate=1_000.0),
+                perplexity=TokenBucket(rate=1_000.0),
+            ),
+            github_client=None,  # trunk-ignore(pyright/reportArgumentType)
+            perplexity_client=None,
+            chroma_client=None,
+            on_changed=on_changed or (lambda repo_path, changes: None),
+        )
+
+    return asyncio.run(run())
+
+
+@pytest.mark.usefixtures("stub_db")
+def test_only_changed_columns_are_written_and_every_row_is_stamped(
+    session: Session,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    add_projects(
+        session,
+        make_project(repo_path="owner/a", stars=1, language="Python"),
+        make_project(repo_path="owner/b", stars=2, language="Rust"),
+    )
+    requests: list[list[str]] = stub_repositories(
+        monkeypatch,
+        {
+            "owner/a": make_repository("owner/a", stars=5, language="Python"),
+            "owner/b": make_repository("owner/b", stars=2, language="Rust"),
+        },
+    )
+    changed: list[tuple[str, dict[str, Any]]] = []
+    result: RefreshResult = refresh(
+        on_changed=lambda repo_path, changes: changed.append((repo_path, changes)),
+    )
+    assert sorted(requests[0]) == ["owner/a", "owner/b"]
+    assert (result.refreshed, result.changed, result.missing, result.failed) == (2, 1, 0, 0)
+    assert changed == [("owner/a", {"stars": 5})]
+    assert get_project(session, "owner/a").stars == 5
+    assert all(
+        get_project(session, repo_path).refreshed_at is not None
+        for repo_path in ("owner/a", "owner/b")
+    )
+
+
+@pytest.mark.usefixtures("stub_db")
+def test_missing_repos_are_counted_and_stamped_without_changes(
+    session: Session,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    add_projects(
+        session,
+        make_project(repo_path="owner/gone", stars=3),
+    )
+    stub_repositories(
+        monkeypatch,
+        {
+            "owner/gone": None,
+        },
+    )
+    result: RefreshResult = refresh()
+    assert (result.refreshed, result.changed, result.missing) == (1, 0, 1)
+    project: Project = get_project(session, "owner/gone")
+    assert project.stars == 3
+    assert project.refreshed_at is not None
+
+
+@pytest.mark.usefixtures("stub_db")
+def test_a_failed_graphql_request_stamps_the_batch_as_failed(
+    session: Session,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    add_projects(
+        session,
+        make_project(repo_path="owner/a", stars=1),
+        make_project(repo_path="owner/b", stars=2),
+    )
+    stub_repositories(
+        monkeypatch,
+        GithubException(502, {"message": "Bad Gateway"}),
+    )
+    result: RefreshResult = refresh()
+    assert (result.refreshed, result.changed, result.failed) == (2, 0, 2)
+    assert get_project(session, "owner/a").refreshed_at is not None
+    assert refresh() == RefreshResult()
+
+
+@pytest.mark.usefixtures("stub_db")
+def test_a_rate_limited_graphql_request_is_raised_without_stamping(
+    session: Session,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    add_projects(
+        session,
+        make_project(repo_path="owner/a"),
+    )
+    stub_repositories(
+        monkeypatch,
+        RateLimitExceededException(403, {"message": "rate limit"}),
+    )
+    with pytest.raises(RateLimitExceededException):
+        refresh()
+
+    assert get_project(session, "owner/a").refreshed_at is None
+
+
+@pytest.mark.usefixtures("stub_db")
+def test_a_failed_commit_falls_back_to_saving_row_by_row(
+    session: Session,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    add_projects(
+        session,
+        make_project(repo_path="owner/good", stars=1),
+        make_project(repo_path="owner/bad", stars=1),
+    )
+    session.execute(
+        text(
+            "CREATE TRIGGER reject_negative_stars BEFORE UPDATE ON project "
+            "WHEN NEW.stars < 0 BEGIN SELECT RAISE(ABORT, 'negative stars'); END",
+        ),
+    )
+    session.commit()
+    stub_repositories(
+        monkeypatch,
+        {
+            "owner/good": make_repository("owner/good", stars=2),
+            "owner/bad": make_repository("owner/bad", stars=-1),
+        },
+    )
+    changed: list[str] = []
+    result: RefreshResult = refresh(
+        on_changed=lambda repo_path, changes: changed.append(repo_path),
+    )
+    assert (result.refreshed, result.changed, result.failed) == (2, 1, 1)
+    assert changed == ["owner/good"]
+    assert get_project(session, "owner/good").stars == 2
+    bad_project: Project = get_project(session, "owner/bad")
+    assert bad_project.stars == 1
+    assert bad_project.refreshed_at is not None
@@ -0,0 +1,105 @@
+from __future__ import annotations
+
+import pytest
+
+from hackathon.helper_search import Bm25Index, reciprocal_rank_fusion, tokenize
+
+
+@pytest.fixture
+def index() -> Bm25Index:
+    index: Bm25Index = Bm25Index()
+    index.add("owner/vector-db", "Rust vector database for embeddings")
+    index.add("owner/web", "Python web framework for apps")
+    index.add("owner/notebook", "Python notebook for data apps")
+    index.add("owner/python-vector", "Python vector search vector index")
+    return index
+
+
+def ranked_ids(
+    index: Bm25Index,
+    query: str,
+    limit: int = 10,
+) -> list[str]:
+    return [
+        document_id
+        for document_id, _ in index.search(
+            query=query,
+            limit=limit,
+        )
+    ]
+
+
+def test_tokenize_lowercases_and_splits_on_punctuation() -> None:
+    assert tokenize("Owner/Repo-Name, v2!") == ["owner", "repo", "name", "v2"]
+    assert tokenize(None) == []
+
+
+def test_only_documents_with_a_query_term_match(
+    index: Bm25Index,
+) -> None:
+    assert set(ranked_ids(index, "rust")) == {"owner/vector-db"}
+    assert ranked_ids(index, "golang") == []
+
+
+def test_rare_terms_outweigh_common_ones(
+    index: Bm25Index,
+) -> None:
+    assert ranked_ids(index, "python embeddings")[0] == "owner/vector-db"
+
+
+def test_repeated_terms_rank_higher(
+    index: Bm25Index,
+) -> None:
+    assert ranked_ids(index, "vector")[0] == "owner/python-vector"
+
+
+def test_scores_are_descending_and_limited(
+    index: Bm25Index,
+) -> None:
+    results: list[tuple[str, float]] = index.search(
+        query="python apps",
+        limit=2,
+    )
+    assert len(results) == 2
+    assert results[0][1] >= results[1][1] > 0
+
+
+def test_adding_an_id_again_replaces_its_text(
+    index: Bm25Index,
+) -> None:
+    index.add("owner/web", "Go web server")
+    assert "owner/web" not in ranked_ids(index, "framework")
+    assert ranked_ids(index, "go") == ["owner/web"]
+    assert len(index) == 4
+
+
+def test_removed_and_cleared_documents_stop_matching(
+    index: Bm25Index,
+) -> None:
+    index.remove("owner/vector-db")
+    index.remove("owner/unknown")
+    assert ranked_ids(index, "rust") == []
+    assert len(index) == 3
+
+    index.clear()
+    assert ranked_ids(index, "python") == []
+    assert len(index) == 0
+
+
+def test_reciprocal_rank_fusion_prefers_ids_ranked_by_both_lists() -> None:
+    assert reciprocal_rank_fusion(
+        [
+            ["keyword-only", "both", "keyword-tail"],
+            ["vector-only", "both"],
+        ],
+    ) == ["both", "keyword-only", "vector-only", "keyword-tail"]
+
+
+def test_reciprocal_rank_fusion_k_flattens_the_rank_curve() -> None:
+    rankings: list[list[str]] = [
+        ["top", "a", "b", "everywhere"],
+        ["top", "c", "d", "everywhere"],
+        ["e", "f", "g", "everywhere"],
+    ]
+    assert reciprocal_rank_fusion(rankings, k=1)[0] == "top"
+    assert reciprocal_rank_fusion(rankings, k=60)[0] == "everywhere"
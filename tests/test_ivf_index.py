@@ -0,0 +1,134 @@
+from __future__ import annotations
+
+import numpy as np
+import pytest
+
+from hackathon.helper_chroma import IvfIndex
+from hackathon.helper_chroma.ivf_index import squared_l2_distances
+
+ROW_COUNT: int = 4_000
+DIMENSIONS: int = 32
+CLUSTER_COUNT: int = 40
+QUERY_COUNT: int = 50
+TOP_K: int = 10
+
+
+@pytest.fixture(scope="module")
+def embeddings() -> np.ndarray:
+    """Rows around random cluster centres, like embeddings of related repos."""
+    rng: np.random.Generator = np.random.default_rng(7)
+    centres: np.ndarray = rng.normal(size=(CLUSTER_COUNT, DIMENSIONS))
+    return (
+        centres[rng.integers(CLUSTER_COUNT, size=ROW_COUNT)]
+        + rng.normal(scale=0.3, size=(ROW_COUNT, DIMENSIONS))
+    ).astype(np.float32)
+
+
+@pytest.fixture(scope="module")
+def queries(
+    embeddings: np.ndarray,
+) -> np.ndarray:
+    rng: np.random.Generator = np.random.default_rng(11)
+    return embeddings[rng.choice(ROW_COUNT, size=QUERY_COUNT, replace=False)] + (
+        rng.normal(scale=0.1, size=(QUERY_COUNT, DIMENSIONS)).astype(np.float32)
+    )
+
+
+@pytest.fixture(scope="module")
+def index(
+    embeddings: np.ndarray,
+) -> IvfIndex:
+    index: IvfIndex = IvfIndex()
+    index.train(embeddings)
+    return index
+
+
+def nearest_rows(
+    query_vector: np.ndarray,
+    embeddings: np.ndarray,
+    rows: np.ndarray,
+) -> set[int]:
+    distances: np.ndarray = squared_l2_distances(
+        query_vectors=query_vector[None, :],
+        embeddings=embeddings[rows],
+    )[0]
+    return set(rows[np.argsort(distances, kind="stable")[:TOP_K]].tolist())
+
+
+def recall(
+    index: IvfIndex,
+    embeddings: np.ndarray,
+    queries: np.ndarray,
+    nprobe: int | None,
+) -> float:
+    all_rows: np.ndarray = np.arange(len(embeddings))
+    found: int = 0
+    for query_vector in queries:
+        exact: set[int] = nearest_rows(query_vector, embeddings, all_rows)
+        approximate: set[int] = nearest_rows(
+            query_vector,
+            embeddings,
+            index.candidates(
+                query_vector=query_vector,
+                nprobe=nprobe,
+            ),
+        )
+        found += len(exact & approximate)
+
+    return found / (len(queries) * TOP_K)
+
+
+def test_training_files_every_row_once(
+    index: IvfIndex,
+) -> None:
+    assert index.is_trained
+    assert index.trained_count == ROW_COUNT
+    assert sorted(
+        row
+        for list_id in range(len(index._lists))
+        for row in index._get_list_rows(list_id)
+    ) == list(range(ROW_COUNT))
+
+
+def test_default_nprobe_recall_is_close_to_brute_force(
+    index: IvfIndex,
+    embeddings: np.ndarray,
+    queries: np.ndarray,
+) -> None:
+    assert recall(index, embeddings, queries, nprobe=None) >= 0.95
+
+
+def test_probing_every_list_matches_brute_force(
+    index: IvfIndex,
+    embeddings: np.ndarray,
+    queries: np.ndarray,
+) -> None:
+    assert recall(index, embeddings, queries, nprobe=len(index._lists)) == 1.0
+
+
+def test_probing_fewer_lists_scans_fewer_rows(
+    index: IvfIndex,
+    queries: np.ndarray,
+) -> None:
+    assert len(index.candidates(queries[0], nprobe=1)) < len(
+        index.candidates(queries[0], nprobe=None),
+    ) < ROW_COUNT
+
+
+def test_re_embedded_rows_move_to_their_new_list(
+    embeddings: np.ndarray,
+) -> None:
+    index: IvfIndex = IvfIndex(nprobe=1)
+    index.train(embeddings)
+    moved_vector: np.ndarray = embeddings[1] + 100.0
+    index.add(
+        rows=np.array([0]),
+        vectors=moved_vector[None, :],
+    )
+    assert 0 in index.candidates(moved_vector).tolist()
+    assert sum(0 in rows for rows in index._lists) == 1
+
+
+def test_untrained_index_cannot_be_searched() -> None:
+    with pytest.raises(ValueError, match="trained"):
+        IvfIndex().candidates(np.zeros(DIMENSIONS, dtype=np.float32))
@@ -0,0 +1,243 @@
+from __future__ import annotations
+
+import queue
+import threading
+from typing import TYPE_CHECKING
+
+import pytest
+from sqlalchemy.exc import OperationalError
+
+from hackathon.helper_db import WriteBehindQueue
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Iterator
+    from concurrent.futures import Future
+
+TIMEOUT_SECONDS: float = 5.0
+
+
+class RecordingFlush:
+    """Records every batch, and fails the batches that contain a bad item."""
+
+    def __init__(
+        self: RecordingFlush,
+        bad_items: frozenset[int] = frozenset(),
+        transient_failures: int = 0,
+    ) -> None:
+        self.batches: list[list[int]] = []
+        self.bad_items: frozenset[int] = bad_items
+        self.transient_failures: int = transient_failures
+        self.lock: threading.Lock = threading.Lock()
+
+    def __call__(
+        self: RecordingFlush,
+        items: list[int],
+    ) -> None:
+        with self.lock:
+            if self.transient_failures:
+                self.transient_failures -= 1
+                error_msg: str = "connection reset"
+                raise OperationalError(error_msg, {}, Exception(error_msg))
+
+            if self.bad_items.intersection(items):
+                error_msg = f"bad item in {items}"
+                raise ValueError(error_msg)
+
+            self.batches.append(list(items))
+
+    @property
+    def items(
+        self: RecordingFlush,
+    ) -> list[int]:
+        return [item for batch in self.batches for item in batch]
+
+
+@pytest.fixture
+def make_queue() -> Iterator[Callable[..., WriteBehindQueue[int]]]:
+    queues: list[WriteBehindQueue] = []
+
+    def make_queue(
+        flush: RecordingFlush,
+        **kwargs: object,
+    ) -> WriteBehindQueue[int]:
+        write_queue: WriteBehindQueue[int] = WriteBehindQueue(
+            flush=flush,
+            name="test",
+            retry_backoff_seconds=0.0,
+            **kwargs,
+        )
+        queues.append(write_queue)
+        return write_queue
+
+    yield make_queue
+    for write_queue in queues:
+        write_queue.close(TIMEOUT_SECONDS)
+
+
+def test_close_flushes_everything_submitted_before_it(
+    make_queue: Callable,
+) -> None:
+    flush: RecordingFlush = RecordingFlush()
+    write_queue: WriteBehindQueue[int] = make_queue(
+        flush,
+        max_batch_size=10,
+        max_delay_seconds=60.0,
+    )
+    futures: list[Future[None]] = [write_queue.submit(item) for item in range(25)]
+    write_queue.close(TIMEOUT_SECONDS)
+    assert flush.items == list(range(25))
+    assert all(future.done() and future.exception() is None for future in futures)
+
+
+def test_batches_are_flushed_at_max_batch_size(
+    make_queue: Callable,
+) -> None:
+    flush: RecordingFlush = RecordingFlush()
+    write_queue: WriteBehindQueue[int] = make_queue(
+        flush,
+        max_batch_size=3,
+        max_delay_seconds=60.0,
+    )
+    futures: list[Future[None]] = [write_queue.submit(item) for item in range(6)]
+    futures[-1].result(TIMEOUT_SECONDS)
+    assert flush.batches == [[0, 1, 2], [3, 4, 5]]
+
+
+def test_a_partial_batch_is_flushed_after_max_delay(
+    make_queue: Callable,
+) -> None:
+    flush: RecordingFlush = RecordingFlush()
+    write_queue: WriteBehindQueue[int] = make_queue(
+        flush,
+        max_batch_size=100,
+        max_delay_seconds=0.05,
+    )
+    write_queue.submit(1).result(TIMEOUT_SECONDS)
+    assert flush.batches == [[1]]
+
+
+def test_a_bad_item_does_not_fail_its_neighbours(
+    make_queue: Callable,
+) -> None:
+    flush: RecordingFlush = RecordingFlush(
+        bad_items=frozenset({2}),
+    )
+    write_queue: WriteBehindQueue[int] = make_queue(
+        flush,
+        max_batch_size=5,
+        max_delay_seconds=60.0,
+    )
+    futures: list[Future[None]] = [write_queue.submit(item) for item in range(5)]
+    write_queue.close(TIMEOUT_SECONDS)
+    assert flush.items == [0, 1, 3, 4]
+    assert isinstance(futures[2].exception(), ValueError)
+    assert [future.exception() for future in futures[:2] + futures[3:]] == [None] * 4
+
+
+def test_transient_errors_are_retried(
+    make_queue: Callable,
+) -> None:
+    flush: RecordingFlush = RecordingFlush(
+        transient_failures=2,
+    )
+    write_queue: WriteBehindQueue[int] = make_queue(
+        flush,
+        max_retries=2,
+    )
+    write_queue.submit(1).result(TIMEOUT_SECONDS)
+    assert flush.batches == [[1]]
+
+
+def test_transient_errors_fail_the_batch_once_retries_run_out(
+    make_queue: Callable,
+) -> None:
+    flush: RecordingFlush = RecordingFlush(
+        transient_failures=3,
+    )
+    write_queue: WriteBehindQueue[int] = make_queue(
+        flush,
+        max_retries=2,
+    )
+    with pytest.raises(OperationalError):
+        write_queue.submit(1).result(TIMEOUT_SECONDS)
+
+    assert flush.batches == []
+
+
+def test_a_full_queue_raises_instead_of_blocking(
+    make_queue: Callable,
+) -> None:
+    release: threading.Event = threading.Event()
+    flushing: threading.Event = threading.Event()
+
+    def blocking_flush(
+        items: list[int],
+    ) -> None:
+        flushing.set()
+        release.wait(TIMEOUT_SECONDS)
+
+    write_queue: WriteBehindQueue[int] = make_queue(
+        blocking_flush,
+        max_batch_size=1,
+        max_pending=1,
+    )
+    write_queue.submit(1)
+    assert flushing.wait(TIMEOUT_SECONDS)
+    write_queue.submit(2)
+    with pytest.raises(queue.Full):
+        write_queue.submit(
+            item=3,
+            block=False,
+        )
+
+    with pytest.raises(queue.Full):
+        write_queue.submit(
+            item=3,
+            timeout=0.01,
+        )
+
+    release.set()
+
+
+def test_submit_after_close_raises_until_restarted(
+    make_queue: Callable,
+) -> None:
+    flush: RecordingFlush = RecordingFlush()
+    write_queue: WriteBehindQueue[int] = make_queue(flush)
+    write_queue.submit(1)
+    write_queue.close(TIMEOUT_SECONDS)
+    with pytest.raises(RuntimeError, match="closed"):
+        write_queue.submit(2)
+
+    write_queue.start()
+    write_queue.submit(3)
+    write_queue.close(TIMEOUT_SECONDS)
+    assert flush.items == [1, 3]
+
+
+def test_submits_racing_close_are_either_flushed_or_rejected(
+    make_queue: Callable,
+) -> None:
+    flush: RecordingFlush = RecordingFlush()
+    write_queue: WriteBehindQueue[int] = make_queue(
+        flush,
+        max_delay_seconds=0.01,
+    )
+    accepted: list[Future[None]] = []
+    rejected: list[int] = []
+
+    def submit_all() -> None:
+        for item in range(200):
+            try:
+                accepted.append(write_queue.submit(item))
+
+            except RuntimeError:
+                rejected.append(item)
+
+    submitter: threading.Thread = threading.Thread(target=submit_all)
+    submitter.start()
+    write_queue.close(TIMEOUT_SECONDS)
+    submitter.join(TIMEOUT_SECONDS)
+    assert len(accepted) + len(rejected) == 200
+    assert len(flush.items) == len(accepted)
+    assert all(future.done() for future in accepted)